@@ -16,6 +16,9 @@ modules:
 """
 # isort: skip_file
 from __future__ import annotations
+import importlib
+import sys
+import types
 from functools import partial
 from toolz import compose
 from gdsfactory.component_layout import Group
@@ -30,41 +33,16 @@ from gdsfactory.cell import cell
 from gdsfactory.cell import declarative_cell
 from gdsfactory.cell import cell_without_validator
 from gdsfactory.cell import clear_cache
-from gdsfactory.show import show
-from gdsfactory.read.import_gds import import_gds
 from gdsfactory.cross_section import CrossSection, Section, xsection
 from gdsfactory.component_layout import Label
 from gdsfactory.polygon import Polygon
-from gdsfactory.difftest import difftest, diff
 
 from gdsfactory import decorators
 from gdsfactory import cross_section
-from gdsfactory import labels
-from gdsfactory import asserts
-from gdsfactory import components
-from gdsfactory import routing
 from gdsfactory import typings
 from gdsfactory import path
 from gdsfactory import snap
-from gdsfactory import read
-from gdsfactory import add_termination
-from gdsfactory import functions
-from gdsfactory import geometry
-from gdsfactory import add_ports
-from gdsfactory import write_cells
-from gdsfactory import add_pins
-from gdsfactory import technology
-from gdsfactory import fill
-
-from gdsfactory.add_tapers import add_tapers
-from gdsfactory.add_padding import (
-    add_padding,
-    add_padding_container,
-    get_padding_points,
-)
-from gdsfactory.fill import fill_rectangle
-from gdsfactory.pack import pack
-from gdsfactory.grid import grid, grid_with_text
+
 from gdsfactory.pdk import (
     Pdk,
     get_component,
@@ -77,7 +55,71 @@ from gdsfactory.pdk import (
 from gdsfactory.get_factories import get_cells
 from gdsfactory.cross_section import get_cross_section_factories
 
-c = components
+# imported on first access to keep `import gdsfactory` fast
+# {name: (module, attribute)}, where attribute None is the module itself
+_lazy_attributes: dict[str, tuple[str, str | None]] = {
+    "c": ("gdsfactory.components", None),
+    "components": ("gdsfactory.components", None),
+    "routing": ("gdsfactory.routing", None),
+    "geometry": ("gdsfactory.geometry", None),
+    "read": ("gdsfactory.read", None),
+    "export": ("gdsfactory.export", None),
+    "labels": ("gdsfactory.labels", None),
+    "asserts": ("gdsfactory.asserts", None),
+    "add_termination": ("gdsfactory.add_termination", None),
+    "functions": ("gdsfactory.functions", None),
+    "add_ports": ("gdsfactory.add_ports", None),
+    "write_cells": ("gdsfactory.write_cells", None),
+    "add_pins": ("gdsfactory.add_pins", None),
+    "technology": ("gdsfactory.technology", None),
+    "fill": ("gdsfactory.fill", None),
+    "show": ("gdsfactory.show", "show"),
+    "import_gds": ("gdsfactory.read.import_gds", "import_gds"),
+    "difftest": ("gdsfactory.difftest", "difftest"),
+    "diff": ("gdsfactory.difftest", "diff"),
+    "add_tapers": ("gdsfactory.add_tapers", "add_tapers"),
+    "add_padding": ("gdsfactory.add_padding", "add_padding"),
+    "add_padding_container": ("gdsfactory.add_padding", "add_padding_container"),
+    "get_padding_points": ("gdsfactory.add_padding", "get_padding_points"),
+    "fill_rectangle": ("gdsfactory.fill", "fill_rectangle"),
+    "pack": ("gdsfactory.pack", "pack"),
+    "build_parallel": ("gdsfactory.build_parallel", "build_parallel"),
+    "sweep": ("gdsfactory.sweep", "sweep"),
+    "grid": ("gdsfactory.grid", "grid"),
+    "grid_with_text": ("gdsfactory.grid", "grid_with_text"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _lazy_attributes[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_lazy_attributes))
+
+
+class _Module(types.ModuleType):
+    def __setattr__(self, name: str, value) -> None:
+        # importing gdsfactory.pack binds the module to gdsfactory.pack,
+        # keep the function with the same name instead
+        module_name, attribute = _lazy_attributes.get(name, (None, None))
+        if (
+            attribute is not None
+            and isinstance(value, types.ModuleType)
+            and value.__name__ == module_name
+        ):
+            value = getattr(value, attribute)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Module
 
 
 __all__ = (
@@ -98,6 +140,7 @@ __all__ = (
     "add_tapers",
     "add_termination",
     "asserts",
+    "build_parallel",
     "c",
     "call_if_func",
     "cell",
@@ -136,6 +179,7 @@ __all__ = (
     "routing",
     "show",
     "snap",
+    "sweep",
     "typings",
     "technology",
     "write_cells",
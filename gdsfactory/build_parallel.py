@@ -0,0 +1,196 @@
+"""Build independent components in parallel processes.
+
+Each worker process is forked from the current one, so it has the same active
+PDK and CACHE. Workers write each new component and its hierarchy to a
+temporary directory (GDS + JSON metadata, as the persistent cell cache does) and
+the parent process reads them back into the CACHE.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import traceback
+import warnings
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any
+
+import orjson
+
+from gdsfactory.cell_cache import DiskCache
+from gdsfactory.component import Component
+from gdsfactory.serialization import clean_value_json
+from gdsfactory.typings import ComponentSpec
+
+
+def _get_processes(processes: int | None, name: str) -> int:
+    """Returns the number of worker processes, 1 without the fork start method.
+
+    Args:
+        processes: requested number of processes. None for the number of CPUs.
+        name: of the calling function, for the warning.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        warnings.warn(
+            f"{name} needs the fork start method, building in this process",
+            stacklevel=3,
+        )
+        processes = 1
+    return processes
+
+
+def _build_and_store(
+    build: Callable[[Any], tuple[Component | None, Any]],
+    dirpath: str,
+    on_store_error: Callable[[Any, str], Any] | None,
+    item: Any,
+) -> tuple[str | None, Any]:
+    """Builds a component in a worker and stores it in dirpath.
+
+    Returns its name (None if it was not built or stored) and the other build result.
+    """
+    component, result = build(item)
+    if component is None:
+        return None, result
+    try:
+        DiskCache(dirpath=dirpath, max_size=sys.maxsize).set(component.name, component)
+    except Exception:
+        if on_store_error is None:
+            raise
+        return None, on_store_error(result, traceback.format_exc())
+    return component.name, result
+
+
+def _build_in_processes(
+    build: Callable[[Any], tuple[Component | None, Any]],
+    items: list[Any],
+    processes: int,
+    chunksize: int = 1,
+    on_store_error: Callable[[Any, str], Any] | None = None,
+) -> list[tuple[Component | None, Any]]:
+    """Returns build(item) for each item, built in a pool of forked processes.
+
+    The built components and their hierarchy are read back into the CACHE.
+
+    Args:
+        build: module level function returning a component (or None) and any
+            other picklable result.
+        items: passed to build, one at a time.
+        processes: number of worker processes.
+        chunksize: number of items sent to a worker at a time.
+        on_store_error: module level function returning the result of an item
+            whose component could not be stored or read back, from the build result
+            and the error traceback. None raises the error (or returns no
+            component if it could not be read back).
+    """
+    from gdsfactory.cell import CACHE
+
+    context = multiprocessing.get_context("fork")
+    results = []
+    with tempfile.TemporaryDirectory() as dirpath, ProcessPoolExecutor(
+        max_workers=min(processes, len(items)), mp_context=context
+    ) as executor:
+        disk_cache = DiskCache(dirpath=dirpath, max_size=sys.maxsize)
+        for name, result in executor.map(
+            partial(_build_and_store, build, dirpath, on_store_error),
+            items,
+            chunksize=chunksize,
+        ):
+            component = None
+            if name is not None:
+                component = CACHE.get(name)
+                if component is None:
+                    component = disk_cache.get(name, components=CACHE)
+                if component is None:
+                    if on_store_error is not None:
+                        result = on_store_error(
+                            result, f"could not read {name!r} back from {dirpath}"
+                        )
+                else:
+                    CACHE[name] = component
+            results.append((component, result))
+    return results
+
+
+def _build(spec: ComponentSpec) -> tuple[Component, None]:
+    """Builds a component in a worker."""
+    from gdsfactory.pdk import get_component
+
+    return get_component(spec), None
+
+
+def _get_spec_key(spec: ComponentSpec) -> bytes:
+    return orjson.dumps(clean_value_json(spec), option=orjson.OPT_SORT_KEYS)
+
+
+def build_parallel(
+    specs: Iterable[ComponentSpec],
+    processes: int | None = None,
+    chunksize: int = 1,
+) -> list[Component]:
+    """Returns the components for specs, built in a pool of processes.
+
+    The components and their @cell subcomponents are added to the CACHE, so
+    that building them again (for example inside gf.pack or gf.grid) is a cache hit.
+
+    Needs the fork start method (Linux, macOS) to share the active PDK with
+    the workers. Otherwise builds the components in this process.
+
+    Args:
+        specs: component specs, as used by gf.get_component (name, dict, function).
+        processes: number of worker processes. Defaults to the number of CPUs.
+        chunksize: number of specs sent to a worker at a time.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        specs = [dict(component="mzi", settings=dict(delta_length=i)) for i in range(100)]
+        components = gf.build_parallel(specs, processes=8)
+        c = gf.pack(components)[0]
+    """
+    from gdsfactory.pdk import get_component
+
+    specs = list(specs)
+    unique_specs = {}
+    for spec in specs:
+        if not isinstance(spec, Component):
+            unique_specs.setdefault(_get_spec_key(spec), spec)
+
+    processes = _get_processes(processes, "build_parallel")
+
+    components = {}
+    if processes > 1 and len(unique_specs) > 1:
+        results = _build_in_processes(
+            _build, list(unique_specs.values()), processes, chunksize=chunksize
+        )
+        for key, (component, _) in zip(unique_specs, results):
+            components[key] = component
+
+    return [
+        spec
+        if isinstance(spec, Component)
+        else components.get(_get_spec_key(spec)) or get_component(spec)
+        for spec in specs
+    ]
+
+
+if __name__ == "__main__":
+    import time
+
+    import gdsfactory as gf
+
+    specs = [
+        dict(component="spiral_inner_io_fiber_single", settings=dict(length=1000 + i))
+        for i in range(64)
+    ]
+    t0 = time.time()
+    components = build_parallel(specs)
+    print(f"{time.time() - t0:.2f}s")
+    c = gf.pack(components)[0]
+    c.show()
@@ -4,6 +4,8 @@ from __future__ import annotations
 import functools
 import hashlib
 import inspect
+import time
+import types
 from collections.abc import Callable
 from dataclasses import dataclass
 from functools import wraps
@@ -12,25 +14,85 @@ from typing import Any, TypeVar
 import toolz
 from pydantic import BaseModel, validate_arguments
 
+from gdsfactory.cell_cache import CacheInfo, ComponentCache, DiskCache, get_cache_key
 from gdsfactory.component import Component
 from gdsfactory.name import clean_name, get_name_short
 from gdsfactory.serialization import clean_dict, clean_value_name
 
-CACHE: dict[str, Component] = {}
+CACHE: ComponentCache = ComponentCache()
 
 INFO_VERSION = 2
 
 _F = TypeVar("_F", bound=Callable)
 
+# keyword arguments consumed by the cell decorator
+CELL_OPTIONS = frozenset(
+    {
+        "with_hash",
+        "autoname",
+        "name",
+        "cache",
+        "flatten",
+        "info",
+        "prefix",
+        "max_name_length",
+        "include_module",
+        "persistent_cache",
+        "decorator",
+    }
+)
+# max number of remembered cell names per function for the naming fast path
+MAX_NAMES_PER_FUNCTION = 2**16
+
 
 class CellReturnTypeError(ValueError):
     pass
 
 
-def clear_cache() -> None:
-    """Clears Component CACHE."""
+def get_disk_cache() -> DiskCache:
+    """Returns the persistent cell cache for the active PDK settings."""
+    from gdsfactory.pdk import get_active_pdk
+
+    settings = get_active_pdk().cell_decorator_settings
+    return DiskCache(
+        dirpath=settings.persistent_cache_dir,
+        max_size=settings.persistent_cache_max_size,
+    )
+
+
+def clear_cache(persistent: bool = False) -> None:
+    """Clears Component CACHE and its statistics.
+
+    Args:
+        persistent: also clears the persistent cell cache on disk.
+    """
+    CACHE.clear()
+
+    if persistent:
+        get_disk_cache().clear()
+
+
+def set_cache(cache: ComponentCache) -> None:
+    """Replaces the Component CACHE.
+
+    .. code::
+
+        import gdsfactory as gf
+        from gdsfactory.cell import set_cache
+        from gdsfactory.cell_cache import ComponentCache
+
+        set_cache(ComponentCache(max_size=10000, max_memory=4 * 2**30))
+
+    Args:
+        cache: new cache, for example bounded by size or memory.
+    """
     global CACHE
-    CACHE = {}
+    CACHE = cache
+
+
+def cache_info() -> CacheInfo:
+    """Returns Component CACHE hits, misses, evictions and build times."""
+    return CACHE.info()
 
 
 def print_cache() -> None:
@@ -65,6 +127,47 @@ class Settings(BaseModel):
     child: dict[str, Any] | None = None
 
 
+def _freeze(value: Any) -> Any:
+    """Returns a hashable value that also distinguishes types (3 and 3.0).
+
+    Raises TypeError for values that are not safe to use in the naming fast path.
+    """
+    if isinstance(value, tuple):
+        return tuple, tuple(_freeze(v) for v in value)
+    if type(value) in {str, int, float, bool, type(None)} or isinstance(
+        value, types.FunctionType
+    ):
+        return type(value), value
+    raise TypeError(f"{type(value)} not supported")
+
+
+def _get_names_key(active_pdk, args, kwargs) -> tuple | None:
+    """Returns a key to look up the cell name of a previous call.
+
+    Returns None if the call needs to go through the full naming.
+    """
+    settings = active_pdk.cell_decorator_settings
+    if not settings.cache or not CELL_OPTIONS.isdisjoint(kwargs):
+        return None
+
+    try:
+        return (
+            id(active_pdk),
+            id(active_pdk.default_decorator),
+            settings.with_hash,
+            settings.autoname,
+            settings.name,
+            settings.prefix,
+            settings.max_name_length,
+            settings.include_module,
+            settings.naming_style,
+            _freeze(args),
+            tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())),
+        )
+    except TypeError:
+        return None
+
+
 def cell_without_validator(func: _F) -> _F:
     """Decorator for Component functions.
 
@@ -72,6 +175,16 @@ def cell_without_validator(func: _F) -> _F:
 
     I recommend using @cell instead.
     """
+    sig = inspect.signature(func)
+    default = {
+        p.name: p.default
+        for p in sig.parameters.values()
+        if p.default != inspect._empty
+    }
+    # default args as strings for each include_module setting
+    default_args_lists: dict[bool, list[str]] = {}
+    # cell names from previous calls with hashable arguments
+    names: dict[tuple, str] = {}
 
     @functools.wraps(func)
     def _cell(*args, **kwargs):
@@ -80,6 +193,12 @@ def cell_without_validator(func: _F) -> _F:
         active_pdk = get_active_pdk()
         cell_decorator_settings = active_pdk.cell_decorator_settings
 
+        names_key = _get_names_key(active_pdk, args, kwargs)
+        if names_key is not None:
+            name = names.get(names_key)
+            if name is not None and name in CACHE:
+                return CACHE.get(name)
+
         with_hash = kwargs.pop("with_hash", cell_decorator_settings.with_hash)
         autoname = kwargs.pop("autoname", cell_decorator_settings.autoname)
         name = kwargs.pop("name", cell_decorator_settings.name)
@@ -98,31 +217,28 @@ def cell_without_validator(func: _F) -> _F:
         include_module = kwargs.pop(
             "include_module", cell_decorator_settings.include_module
         )
+        persistent_cache = kwargs.pop(
+            "persistent_cache", cell_decorator_settings.persistent_cache
+        )
 
-        sig = inspect.signature(func)
         args_as_kwargs = dict(zip(sig.parameters.keys(), args))
         args_as_kwargs.update(kwargs)
 
-        default = {
-            p.name: p.default
-            for p in sig.parameters.values()
-            if p.default != inspect._empty
-        }
-
         changed = args_as_kwargs
         full = default.copy()
         full.update(**args_as_kwargs)
 
-        default2 = default.copy()
-        changed2 = changed.copy()
-
         # list of default args as strings
-        default_args_list = [
-            f"{key}={clean_value_name(default2[key])}" for key in sorted(default.keys())
-        ]
+        default_include_module = cell_decorator_settings.include_module
+        if default_include_module not in default_args_lists:
+            default_args_lists[default_include_module] = [
+                f"{key}={clean_value_name(default[key])}" for key in sorted(default)
+            ]
+        default_args_list = default_args_lists[default_include_module]
+
         # list of explicitly passed args as strings
         passed_args_list = [
-            f"{key}={clean_value_name(changed2[key])}" for key in sorted(changed.keys())
+            f"{key}={clean_value_name(changed[key])}" for key in sorted(changed)
         ]
 
         # get only the args which are explicitly passed and different from defaults
@@ -186,9 +302,33 @@ def cell_without_validator(func: _F) -> _F:
                         f"valid arguments are {list(sig.parameters.keys())}"
                     )
 
-        if cache and name in CACHE:
-            # print(f"CACHE LOAD {name} {func.__name__}({named_args_string})")
-            return CACHE[name]
+        if names_key is not None:
+            if len(names) > MAX_NAMES_PER_FUNCTION:
+                names.clear()
+            names[names_key] = name
+
+        if cache:
+            component = CACHE.get(name)
+            if component is not None:
+                # print(f"CACHE LOAD {name} {func.__name__}({named_args_string})")
+                return component
+
+        cache_key = None
+        if cache and persistent_cache:
+            cache_key = get_cache_key(
+                func,
+                name=name,
+                full=full,
+                autoname=autoname,
+                flatten=flatten,
+                info=info,
+                decorator=decorator,
+            )
+            if cache_key is not None:
+                component = get_disk_cache().get(cache_key, components=CACHE)
+                if component is not None:
+                    CACHE[name] = component
+                    return component
         # print(f"BUILD {name} {func.__name__}({named_args_string})")
 
         if not callable(func):
@@ -196,7 +336,9 @@ def cell_without_validator(func: _F) -> _F:
                 f"{func!r} is not callable! @cell decorator is only for functions"
             )
 
+        build_start = time.perf_counter()
         component = func(*args, **kwargs)
+        CACHE.add_build_time(func.__name__, time.perf_counter() - build_start)
 
         # if the component is already in the cache, but under a different alias,
         # make sure we use a copy, so we don't run into mutability errors
@@ -255,6 +397,9 @@ def cell_without_validator(func: _F) -> _F:
 
         component.lock()
         CACHE[name] = component
+
+        if cache_key is not None:
+            get_disk_cache().set(cache_key, component)
         return component
 
     return _cell
@@ -273,6 +418,7 @@ def cell(func: _F) -> _F:
     When decorate your functions with @cell you get:
 
     - cache: avoids creating duplicated Components.
+      `gf.cell.cache_info()` returns the cache statistics.
     - name: names Components uniquely name based on parameters.
     - metadata: adds Component.metadata with default, changed and full Args.
 
@@ -286,6 +432,8 @@ def cell(func: _F) -> _F:
         cache (bool): returns Component from the CACHE if it already exists.
             Avoids having duplicated cells with the same name.
             If False overrides CACHE creates a new Component.
+        persistent_cache (bool): also loads and stores the Component
+            in the persistent cell cache on disk.
         flatten (bool): False by default. True flattens component hierarchy.
         info: updates Component.info dict.
         prefix (str): name_prefix, defaults to function name.
@@ -322,6 +470,9 @@ def cell(func: _F) -> _F:
     return cell_without_validator(validate_arguments(func))
 
 
+cell.cache_info = cache_info
+
+
 def declarative_cell(cls: type[Any]) -> Callable[..., Component]:
     """
     TODO:
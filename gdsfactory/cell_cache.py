@@ -0,0 +1,454 @@
+"""Caches for Components built with the @cell decorator.
+
+ComponentCache is the in-memory CACHE used by the @cell decorator.
+It can be bounded by number of Components and by estimated polygon memory.
+
+DiskCache is an optional persistent cache on disk.
+Each entry stores the cell hierarchy as GDS and the ports, info and settings
+of every cell in a JSON metadata file, under a key derived from the cell
+function source code, module, active PDK name and cleaned arguments.
+
+The cache directory is bounded in size. When it grows beyond `max_size` bytes
+the least recently used entries are removed.
+
+Note that only the source of the decorated function is part of the key.
+If you change a function that the cell calls internally you need to clear the
+persistent cache with `gf.clear_cache(persistent=True)`.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import pathlib
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import gdstk
+import orjson
+
+from gdsfactory.component import Component
+from gdsfactory.component_reference import ComponentReference
+from gdsfactory.config import PATH, __version__, logger
+from gdsfactory.serialization import clean_dict, clean_value_name
+
+
+@functools.lru_cache(maxsize=None)
+def _get_source_code(func: Callable) -> str | None:
+    from gdsfactory.cell import get_source_code
+
+    try:
+        return get_source_code(func)
+    except (OSError, TypeError):
+        return None
+
+
+def get_cache_key(func: Callable, **kwargs: Any) -> str | None:
+    """Returns a content key for a cell function call.
+
+    Returns None if the function source code is not available
+    (for example functions defined in an interactive session).
+
+    Args:
+        func: cell function.
+        kwargs: anything else that changes the returned Component
+            (cell name, full arguments, pdk name, decorator ...).
+    """
+    from gdsfactory.pdk import get_active_pdk
+
+    source = _get_source_code(func)
+    if source is None:
+        return None
+
+    key = "\n".join(
+        [
+            __version__,
+            get_active_pdk().name,
+            func.__module__,
+            func.__qualname__,
+            source,
+            clean_value_name(kwargs),
+        ]
+    )
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def get_memory_size(component: Component) -> int:
+    """Returns an estimate of the memory used by the Component polygons in bytes.
+
+    Only counts the Component's own polygons and paths, not the referenced cells.
+    """
+    cell = component._cell
+    size = sum(16 * polygon.size + 64 for polygon in cell.polygons)
+    size += sum(32 * path.size * path.num_paths + 64 for path in cell.paths)
+    return size
+
+
+@dataclass
+class CacheInfo:
+    """Component CACHE statistics.
+
+    Parameters:
+        hits: number of cell calls returned from the cache.
+        misses: number of cell calls not found in the cache.
+        evictions: number of Components evicted from the cache.
+        size: number of Components in the cache.
+        max_size: maximum number of Components in the cache.
+        memory: estimated polygon memory of the cached Components in bytes.
+        max_memory: maximum estimated polygon memory in bytes.
+        builds: number of builds per cell function name.
+        build_time: total build time in seconds per cell function name.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_size: int | None = None
+    memory: int = 0
+    max_memory: int | None = None
+    builds: dict[str, int] = field(default_factory=dict)
+    build_time: dict[str, float] = field(default_factory=dict)
+
+
+class ComponentCache(MutableMapping):
+    """Least recently used cache of Components by name.
+
+    Evicted Components are still returned while they are alive
+    (for example referenced by a cached parent), so the cache never creates
+    two different Components with the same name.
+
+    Args:
+        max_size: maximum number of Components. None for unbounded.
+        max_memory: maximum estimated polygon memory in bytes. None for unbounded.
+    """
+
+    def __init__(
+        self, max_size: int | None = None, max_memory: int | None = None
+    ) -> None:
+        """Initialize the ComponentCache object."""
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self._data: OrderedDict[str, Component] = OrderedDict()
+        self._memory: dict[str, int] = {}
+        self._evicted: weakref.WeakValueDictionary[
+            str, Component
+        ] = weakref.WeakValueDictionary()
+        self._info = CacheInfo()
+
+    def __getitem__(self, name: str) -> Component:
+        """Returns a Component without updating the statistics."""
+        if name in self._data:
+            return self._data[name]
+        return self._evicted[name]
+
+    def __setitem__(self, name: str, component: Component) -> None:
+        """Adds a Component and evicts the least recently used ones if needed."""
+        if name in self._data:
+            del self[name]
+        self._evicted.pop(name, None)
+        self._data[name] = component
+        self._memory[name] = get_memory_size(component)
+        self._info.memory += self._memory[name]
+        self.evict()
+
+    def __delitem__(self, name: str) -> None:
+        """Removes a Component."""
+        if name in self._data:
+            del self._data[name]
+            self._info.memory -= self._memory.pop(name)
+        else:
+            del self._evicted[name]
+
+    def __contains__(self, name: object) -> bool:
+        """Returns True if the Component is in the cache or still alive."""
+        return name in self._data or name in self._evicted
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the names of the cached Components."""
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        """Returns the number of cached Components."""
+        return len(self._data)
+
+    def values(self):
+        return self._data.values()
+
+    def get(self, name: str, default: Component | None = None) -> Component | None:
+        """Returns a Component and updates the hit and miss statistics."""
+        if name in self._data:
+            self._data.move_to_end(name)
+            self._info.hits += 1
+            return self._data[name]
+
+        component = self._evicted.get(name)
+        if component is None:
+            self._info.misses += 1
+            return default
+
+        # still alive, so it goes back to the cache
+        self._info.hits += 1
+        self[name] = component
+        return component
+
+    def evict(self) -> None:
+        """Evicts the least recently used Components until the cache fits."""
+        while self._data and (
+            (self.max_size is not None and len(self._data) > self.max_size)
+            or (self.max_memory is not None and self._info.memory > self.max_memory)
+        ):
+            name, component = self._data.popitem(last=False)
+            self._info.memory -= self._memory.pop(name)
+            self._evicted[name] = component
+            self._info.evictions += 1
+
+    def add_build_time(self, function_name: str, build_time: float) -> None:
+        """Records the time in seconds to build a Component."""
+        builds = self._info.builds
+        builds[function_name] = builds.get(function_name, 0) + 1
+        times = self._info.build_time
+        times[function_name] = times.get(function_name, 0.0) + build_time
+
+    def clear(self) -> None:
+        """Removes all Components and resets the statistics."""
+        self._data.clear()
+        self._memory.clear()
+        self._evicted.clear()
+        self._info = CacheInfo()
+
+    def info(self) -> CacheInfo:
+        """Returns the cache statistics."""
+        info = self._info
+        return CacheInfo(
+            hits=info.hits,
+            misses=info.misses,
+            evictions=info.evictions,
+            size=len(self._data),
+            max_size=self.max_size,
+            memory=info.memory,
+            max_memory=self.max_memory,
+            builds=dict(info.builds),
+            build_time=dict(info.build_time),
+        )
+
+
+def _port_to_dict(port) -> dict[str, Any]:
+    """Returns the port settings, without rounding center, width and orientation."""
+    d = port.to_dict()
+    d["center"] = [float(x) for x in port.center]
+    d["width"] = float(port.width)
+    if port.orientation is not None:
+        d["orientation"] = float(port.orientation)
+    return d
+
+
+def _component_to_dict(component: Component) -> dict[str, Any]:
+    return {
+        "ports": [_port_to_dict(port) for port in component.ports.values()],
+        "references": [ref.name for ref in component.references],
+        "info": clean_dict(component.info),
+        "settings": clean_dict(dict(component.settings)),
+    }
+
+
+class DiskCache:
+    """Least recently used Component cache stored in a directory.
+
+    Args:
+        dirpath: directory to store the cache entries.
+        max_size: maximum size of the cache directory in bytes.
+    """
+
+    def __init__(
+        self, dirpath: pathlib.Path | str = PATH.cell_cache, max_size: int = 2**30
+    ) -> None:
+        """Initialize the DiskCache object."""
+        self.dirpath = pathlib.Path(dirpath)
+        self.max_size = max_size
+
+    def _paths(self, key: str) -> tuple[pathlib.Path, pathlib.Path]:
+        return self.dirpath / f"{key}.gds", self.dirpath / f"{key}.json"
+
+    def __contains__(self, key: str) -> bool:
+        """Returns True if key is stored in the cache."""
+        return all(path.exists() for path in self._paths(key))
+
+    def get(
+        self, key: str, components: dict[str, Component] | None = None
+    ) -> Component | None:
+        """Returns the Component stored under key or None if it's not cached.
+
+        Args:
+            key: cache key.
+            components: already built Components by name (for example the CACHE).
+                Cells in the stored hierarchy that match any of these are reused
+                and cells from @cell functions that are missing are added to it.
+        """
+        from gdsfactory.cell import Settings
+
+        gdspath, metadata_path = self._paths(key)
+        try:
+            metadata = orjson.loads(metadata_path.read_bytes())
+            library = gdstk.read_gds(gdspath)
+        except (OSError, ValueError, RuntimeError):
+            return None
+
+        components = components if components is not None else {}
+        cell_to_component: dict[str, Component] = {}
+        new_components: list[Component] = []
+
+        for gdstk_cell in library.cells:
+            cell_metadata = metadata["cells"].get(gdstk_cell.name)
+            component = (
+                components[gdstk_cell.name] if gdstk_cell.name in components else None
+            )
+            if (
+                component is not None
+                and component.name == gdstk_cell.name
+                and gdstk_cell.name != metadata["top"]
+            ):
+                cell_to_component[gdstk_cell.name] = component
+                continue
+
+            component = Component()
+            component._cell = gdstk_cell
+            cell_to_component[gdstk_cell.name] = component
+            new_components.append(component)
+
+            if cell_metadata is None:
+                continue
+
+            for port in cell_metadata["ports"]:
+                component.add_port(
+                    name=port["name"],
+                    center=port["center"],
+                    width=port["width"],
+                    orientation=port["orientation"],
+                    layer=tuple(port["layer"]),
+                    port_type=port["port_type"],
+                )
+                component.ports[port["name"]].shear_angle = port["shear_angle"]
+            component.info.update(cell_metadata["info"])
+            settings = cell_metadata["settings"]
+            if "name" in settings:
+                component.settings = Settings(**settings)
+                if gdstk_cell.name != metadata["top"]:
+                    components.setdefault(gdstk_cell.name, component)
+            else:
+                component.settings = settings
+
+        for component in new_components:
+            cell_metadata = metadata["cells"].get(component.name, {})
+            aliases = cell_metadata.get("references", [])
+            if len(aliases) != len(component._cell.references):
+                aliases = [None] * len(component._cell.references)
+
+            for alias, gdstk_ref in zip(aliases, component._cell.references):
+                ref_component = cell_to_component[gdstk_ref.cell.name]
+                gdstk_ref.cell = ref_component._cell
+                ref = ComponentReference(
+                    component=ref_component,
+                    origin=gdstk_ref.origin,
+                    rotation=gdstk_ref.rotation,
+                    magnification=gdstk_ref.magnification,
+                    x_reflection=gdstk_ref.x_reflection,
+                    columns=gdstk_ref.repetition.columns or 1,
+                    rows=gdstk_ref.repetition.rows or 1,
+                    spacing=gdstk_ref.repetition.spacing,
+                    v1=gdstk_ref.repetition.v1,
+                    v2=gdstk_ref.repetition.v2,
+                )
+                component._register_reference(ref, alias=alias)
+                component._references.append(ref)
+                ref._reference = gdstk_ref
+            component.lock()
+
+        # update access time for the LRU eviction
+        os.utime(metadata_path)
+        return cell_to_component[metadata["top"]]
+
+    def set(self, key: str, component: Component) -> None:
+        """Stores a Component under key.
+
+        Args:
+            key: cache key.
+            component: to store.
+        """
+        from gdsfactory.pdk import get_active_pdk
+
+        write_settings = get_active_pdk().gds_write_settings
+        gdspath, metadata_path = self._paths(key)
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+
+        cells = [component] + component.get_dependencies(recursive=True)
+        metadata = {
+            "top": component.name,
+            "cells": {cell.name: _component_to_dict(cell) for cell in cells},
+        }
+        library = gdstk.Library(
+            unit=write_settings.unit, precision=write_settings.precision
+        )
+        library.add(*{cell.name: cell._cell for cell in cells}.values())
+
+        # write to temporary files first so concurrent readers never see
+        # partial entries
+        with tempfile.TemporaryDirectory(dir=self.dirpath) as tmpdir:
+            tmpdir = pathlib.Path(tmpdir)
+            library.write_gds(
+                tmpdir / gdspath.name, max_points=write_settings.max_points
+            )
+            (tmpdir / metadata_path.name).write_bytes(orjson.dumps(metadata))
+            os.replace(tmpdir / gdspath.name, gdspath)
+            os.replace(tmpdir / metadata_path.name, metadata_path)
+
+        self.evict()
+
+    def size(self) -> int:
+        """Returns the size of the cache in bytes."""
+        return sum(path.stat().st_size for path in self.dirpath.glob("*.*"))
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits in max_size."""
+        if not self.dirpath.exists():
+            return
+
+        entries = []
+        total_size = 0
+        for metadata_path in self.dirpath.glob("*.json"):
+            gdspath = metadata_path.with_suffix(".gds")
+            try:
+                size = metadata_path.stat().st_size + gdspath.stat().st_size
+                last_used = metadata_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((last_used, size, metadata_path, gdspath))
+            total_size += size
+
+        for _, size, metadata_path, gdspath in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            metadata_path.unlink(missing_ok=True)
+            gdspath.unlink(missing_ok=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        if self.dirpath.exists():
+            shutil.rmtree(self.dirpath)
+            logger.info(f"Removed cell cache {str(self.dirpath)!r}")
+
+
+if __name__ == "__main__":
+    import gdsfactory as gf
+
+    disk_cache = DiskCache()
+    c = gf.components.mzi()
+    disk_cache.set("mzi", c)
+    c2 = disk_cache.get("mzi")
+    print(c2.name, c2.ports)
@@ -10,13 +10,15 @@ import importlib.util
 import itertools
 import math
 import pathlib
+import shutil
+import tempfile
 import uuid
 import warnings
 from collections import Counter
 from collections.abc import Callable, Iterable, Mapping
 from copy import deepcopy
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal
+from typing import IO, TYPE_CHECKING, Any, Literal
 
 import gdstk
 import numpy as np
@@ -49,6 +51,7 @@ from gdsfactory.port import (
 from gdsfactory.serialization import clean_dict
 
 if TYPE_CHECKING:
+    from gdsfactory.pdk import GdsWriteSettings, OasisWriteSettings
     from gdsfactory.technology import LayerStack, LayerViews
     from gdsfactory.typings import (
         Coordinate,
@@ -133,6 +136,74 @@ def _rnd(arr, precision=1e-4):
     return np.ascontiguousarray(arr.round(ndigits) / precision, dtype=np.int64)
 
 
+def _hash_geometry_hierarchical(
+    component: Component, precision: float, memo: dict[int, tuple[bytes, bool]]
+) -> tuple[bytes, bool]:
+    """Returns the hierarchical geometry hash of a component and if it's locked.
+
+    The cached hash of a locked component is only reused if the hashes of its
+    referenced components did not change, as they may have been unlocked and
+    changed since.
+
+    Args:
+        component: to hash.
+        precision: rounding precision.
+        memo: hashes of the components already visited in this call, keyed by id.
+    """
+    if id(component) in memo:
+        return memo[id(component)]
+
+    is_locked = component._locked
+    child_hashes = []
+    for ref in component.references:
+        child_hash, is_child_locked = _hash_geometry_hierarchical(
+            ref.parent, precision, memo
+        )
+        is_locked = is_locked and is_child_locked
+        child_hashes.append(child_hash)
+
+    cached = component._geometry_hashes.get(precision)
+    if is_locked and cached is not None and cached[1] == child_hashes:
+        memo[id(component)] = cached[0], True
+        return memo[id(component)]
+
+    layer_to_hashes: dict[tuple[int, int], list[bytes]] = {}
+    for polygon in component._cell.get_polygons(depth=0):
+        layer_to_hashes.setdefault((polygon.layer, polygon.datatype), []).append(
+            hashlib.sha1(_rnd(polygon.points, precision)).digest()
+        )
+
+    final_hash = hashlib.sha1()
+    for layer in sorted(layer_to_hashes):
+        final_hash.update(np.array(layer, dtype=np.int64))
+        for polygon_hash in sorted(layer_to_hashes[layer]):
+            final_hash.update(polygon_hash)
+
+    reference_hashes = []
+    for ref, child_hash in zip(component.references, child_hashes):
+        reference = ref._reference
+        transform = (
+            *reference.origin,
+            np.degrees(reference.rotation),
+            reference.magnification,
+            reference.x_reflection,
+        )
+        reference_hash = hashlib.sha1(child_hash)
+        reference_hash.update(_rnd(transform, precision))
+        if reference.repetition.size:
+            reference_hash.update(_rnd(reference.repetition.get_offsets(), precision))
+        reference_hashes.append(reference_hash.digest())
+
+    for reference_hash in sorted(reference_hashes):
+        final_hash.update(reference_hash)
+
+    digest = final_hash.digest()
+    if is_locked:
+        component._geometry_hashes[precision] = digest, child_hashes
+    memo[id(component)] = digest, is_locked
+    return memo[id(component)]
+
+
 class Component(_GeometryHelper):
     """A Component is an empty canvas where you add polygons, references and ports \
             (to connect to other components).
@@ -187,6 +258,9 @@ class Component(_GeometryHelper):
 
         self.settings: dict[str, Any] = {}
         self._locked = False
+        self._port_arrays = None
+        self._netlists = {}
+        self._geometry_hashes = {}
         self._get_child_name = False
         self._reference_names_counter = Counter()
         self._reference_names_used = set()
@@ -269,6 +343,7 @@ class Component(_GeometryHelper):
         as_array: bool = True,
         as_shapely: bool = False,
         as_shapely_merged: bool = False,
+        as_packed: bool = False,
     ) -> list[Polygon] | dict[tuple[int, int], list[Polygon]]:
         """Return a list of polygons in this cell.
 
@@ -288,6 +363,8 @@ class Component(_GeometryHelper):
                 polygon objects have more information (especially when by_spec=False) and are faster to retrieve.
             as_shapely: returns shapely polygons.
             as_shapely_merged: returns a shapely polygonize.
+            as_packed: returns PackedPolygons (or a dict of PackedPolygons if
+                `by_spec` is True) with the vertices in one contiguous array.
 
         Returns
             out: list of array-like[N][2] or dictionary
@@ -307,6 +384,7 @@ class Component(_GeometryHelper):
             as_array=as_array,
             as_shapely=as_shapely,
             as_shapely_merged=as_shapely_merged,
+            as_packed=as_packed,
         )
 
     def get_dependencies(self, recursive: bool = False) -> list[Component]:
@@ -348,6 +426,9 @@ class Component(_GeometryHelper):
     def unlock(self) -> None:
         """Only do this if you know what you are doing."""
         self._locked = False
+        self._port_arrays = None
+        self._netlists = {}
+        self._geometry_hashes = {}
 
     def lock(self) -> None:
         """Makes sure components can't add new elements or move existing ones.
@@ -1759,7 +1840,7 @@ class Component(_GeometryHelper):
 
     def _write_library(
         self,
-        gdspath: PathType | None = None,
+        gdspath: PathType | IO[bytes] | None = None,
         gdsdir: PathType | None = None,
         timestamp: datetime.datetime | None = _timestamp2019,
         logging: bool = True,
@@ -1772,7 +1853,8 @@ class Component(_GeometryHelper):
         """Write component to GDS or OASIS and returns gdspath.
 
         Args:
-            gdspath: GDS file path to write to.
+            gdspath: GDS file path or binary file object (file, pipe) to write to.
+                Returns None for file objects.
             gdsdir: directory for the GDS file. Defaults to /tmp/randomFile/gdsfactory.
             timestamp: Defaults to 2019-10-25 for consistent hash.
                 If None uses current time.
@@ -1795,6 +1877,7 @@ class Component(_GeometryHelper):
                     None: do not try to resolve (at your own risk!)
                 flatten_invalid_refs: flattens component references which have invalid transformations.
                 max_points: Maximal number of vertices per polygon. Polygons with more vertices that this are automatically fractured.
+                streaming: writes cells one at a time, dependencies first, without building a library.
 
             Oasis settings:
                 compression_level: Level of compression for cells (between 0 and 9).
@@ -1815,6 +1898,24 @@ class Component(_GeometryHelper):
                 stacklevel=3,
             )
 
+        if hasattr(gdspath, "write"):
+            if with_metadata or with_netlist:
+                raise ValueError(
+                    "with_metadata and with_netlist need a gdspath, not a file object"
+                )
+            # gdstk writes to paths, so write to a temporary file and copy it
+            with tempfile.TemporaryDirectory() as dirpath:
+                filepath = self._write_library(
+                    gdsdir=dirpath,
+                    timestamp=timestamp,
+                    logging=False,
+                    with_oasis=with_oasis,
+                    **kwargs,
+                )
+                with open(filepath, "rb") as f:
+                    shutil.copyfileobj(f, gdspath)
+            return None
+
         default_settings = get_active_pdk().gds_write_settings
         default_oasis_settings = get_active_pdk().oasis_settings
 
@@ -1851,60 +1952,22 @@ class Component(_GeometryHelper):
         gdsdir = gdspath.parent
         gdsdir.mkdir(exist_ok=True, parents=True)
 
-        cells = top_cell.get_dependencies(recursive=True)
-        cell_names = [cell.name for cell in list(cells)]
-        cell_names_unique = set(cell_names)
-
-        if len(cell_names) != len(set(cell_names)):
-            for cell_name in cell_names_unique:
-                cell_names.remove(cell_name)
-
-            if write_settings.on_duplicate_cell == "error":
-                raise ValueError(
-                    f"Duplicated cell names in {top_cell.name!r}: {cell_names!r}"
-                )
-            elif write_settings.on_duplicate_cell in {"warn", "overwrite"}:
-                if write_settings.on_duplicate_cell == "warn":
-                    warnings.warn(
-                        f"Duplicated cell names in {top_cell.name!r}:  {cell_names}",
-                        stacklevel=3,
-                    )
-                cells_dict = {cell.name: cell._cell for cell in cells}
-                cells = cells_dict.values()
-            elif write_settings.on_duplicate_cell is not None:
-                raise ValueError(
-                    f"on_duplicate_cell: {write_settings.on_duplicate_cell!r} not in (None, warn, error, overwrite)"
-                )
-
-        all_cells = [top_cell._cell] + sorted(cells, key=lambda cc: cc.name)
-
-        no_name_cells = [
-            cell.name for cell in all_cells if cell.name.startswith("Unnamed")
-        ]
-
-        if no_name_cells:
-            warnings.warn(
-                f"Component {top_cell.name!r} contains {len(no_name_cells)} Unnamed cells",
-                stacklevel=3,
+        if write_settings.streaming and not with_oasis:
+            _write_gds_streaming(
+                top_cell=top_cell,
+                gdspath=gdspath,
+                write_settings=write_settings,
+                timestamp=timestamp,
             )
-
-        # for cell in all_cells:
-        #     print(cell.name, type(cell))
-
-        lib = gdstk.Library(
-            name=write_settings.lib_name,
-            unit=write_settings.unit,
-            precision=write_settings.precision,
-        )
-        lib.add(top_cell._cell)
-        lib.add(*top_cell._cell.dependencies(True))
-
-        if with_oasis:
-            lib.write_oas(gdspath, **oasis_settings.dict())
         else:
-            lib.write_gds(
-                gdspath, timestamp=timestamp, max_points=write_settings.max_points
+            _write_library(
+                top_cell=top_cell,
+                gdspath=gdspath,
+                write_settings=write_settings,
+                oasis_settings=oasis_settings if with_oasis else None,
+                timestamp=timestamp,
             )
+
         if logging:
             logger.info(f"Wrote to {str(gdspath)!r}")
         if with_metadata:
@@ -2215,7 +2278,7 @@ class Component(_GeometryHelper):
         self._bb_valid = False
         return self
 
-    def hash_geometry(self, precision: float = 1e-4) -> str:
+    def hash_geometry(self, precision: float = 1e-4, hierarchical: bool = False) -> str:
         """Returns an SHA1 hash of the geometry in the Component.
 
         For each layer, each polygon is individually hashed and then the polygon hashes
@@ -2226,8 +2289,16 @@ class Component(_GeometryHelper):
             precision: Rounding precision for the the objects in the Component.
                 For instance, a precision of 1e-2 will round a point at
                 (0.124, 1.748) to (0.12, 1.75).
+            hierarchical: hashes the polygons of each cell once and combines them
+                with the hashes of the referenced cells and the reference
+                transformations, without flattening. Hashes of locked Components
+                are cached. The same flat geometry hashes differently when it has
+                a different hierarchy.
 
         """
+        if hierarchical:
+            return _hash_geometry_hierarchical(self, precision, memo={})[0].hex()
+
         polygons_by_spec = self.get_polygons(by_spec=True, as_array=False)
         layers = np.array(list(polygons_by_spec.keys()))
         sorted_layers = layers[np.lexsort((layers[:, 0], layers[:, 1]))]
@@ -2366,6 +2437,10 @@ class Component(_GeometryHelper):
         layers: Layers = ((1, 0),),
         values: tuple[float, ...] | None = None,
         pad_width: int = 1,
+        antialias: int = 1,
+        tile_size: int = 1024,
+        processes: int = 1,
+        filepath: PathType | None = None,
     ) -> np.ndarray:
         """Returns a pixelated numpy array from Component polygons.
 
@@ -2375,6 +2450,12 @@ class Component(_GeometryHelper):
             layers: to convert. Order matters (latter overwrite former).
             values: associated to each layer (defaults to 1).
             pad_width: padding pixels around the image.
+            antialias: number of samples along x and y in each pixel. If more than 1,
+                each pixel gets the fraction of its area covered by each layer.
+            tile_size: number of pixels along x and y rasterized at once.
+            processes: number of processes rasterizing tiles in parallel.
+            filepath: optional `.npy` file to write the array to, as a memory-mapped
+                array instead of keeping it in memory.
 
         """
         from gdsfactory.export.to_np import to_np
@@ -2385,6 +2466,10 @@ class Component(_GeometryHelper):
             layers=layers,
             values=values,
             pad_width=pad_width,
+            antialias=antialias,
+            tile_size=tile_size,
+            processes=processes,
+            filepath=filepath,
         )
 
     def write_stl(
@@ -2760,6 +2845,163 @@ def flatten_invalid_refs_recursive(
     return component
 
 
+def _write_library(
+    top_cell: Component,
+    gdspath: Path,
+    write_settings: GdsWriteSettings,
+    oasis_settings: OasisWriteSettings | None = None,
+    timestamp: datetime.datetime | None = None,
+) -> None:
+    """Writes a component and its dependencies to GDS or OASIS from a gdstk.Library.
+
+    Args:
+        top_cell: to write.
+        gdspath: file path to write to.
+        write_settings: GDS settings.
+        oasis_settings: writes OASIS with these settings, None writes GDS.
+        timestamp: for GDS.
+    """
+    cells = top_cell.get_dependencies(recursive=True)
+    cell_names = [cell.name for cell in list(cells)]
+    cell_names_unique = set(cell_names)
+
+    if len(cell_names) != len(set(cell_names)):
+        for cell_name in cell_names_unique:
+            cell_names.remove(cell_name)
+
+        if write_settings.on_duplicate_cell == "error":
+            raise ValueError(
+                f"Duplicated cell names in {top_cell.name!r}: {cell_names!r}"
+            )
+        elif write_settings.on_duplicate_cell in {"warn", "overwrite"}:
+            if write_settings.on_duplicate_cell == "warn":
+                warnings.warn(
+                    f"Duplicated cell names in {top_cell.name!r}:  {cell_names}",
+                    stacklevel=4,
+                )
+            cells_dict = {cell.name: cell._cell for cell in cells}
+            cells = cells_dict.values()
+        elif write_settings.on_duplicate_cell is not None:
+            raise ValueError(
+                f"on_duplicate_cell: {write_settings.on_duplicate_cell!r} not in (None, warn, error, overwrite)"
+            )
+
+    all_cells = [top_cell._cell] + sorted(cells, key=lambda cc: cc.name)
+
+    no_name_cells = [cell.name for cell in all_cells if cell.name.startswith("Unnamed")]
+
+    if no_name_cells:
+        warnings.warn(
+            f"Component {top_cell.name!r} contains {len(no_name_cells)} Unnamed cells",
+            stacklevel=4,
+        )
+
+    lib = gdstk.Library(
+        name=write_settings.lib_name,
+        unit=write_settings.unit,
+        precision=write_settings.precision,
+    )
+    lib.add(top_cell._cell)
+    lib.add(*top_cell._cell.dependencies(True))
+
+    if oasis_settings:
+        lib.write_oas(gdspath, **oasis_settings.dict())
+    else:
+        lib.write_gds(
+            gdspath, timestamp=timestamp, max_points=write_settings.max_points
+        )
+
+
+def _write_gds_streaming(
+    top_cell: Component,
+    gdspath: Path,
+    write_settings: GdsWriteSettings,
+    timestamp: datetime.datetime | None = None,
+) -> None:
+    """Writes a component and its dependencies to GDS one cell at a time.
+
+    Walks the hierarchy once and writes each cell as soon as the cells it
+    references are written, without building a gdstk.Library.
+
+    Args:
+        top_cell: to write.
+        gdspath: file path to write to.
+        write_settings: GDS settings.
+        timestamp: for GDS.
+    """
+    on_duplicate_cell = write_settings.on_duplicate_cell
+    if on_duplicate_cell not in {None, "warn", "error", "overwrite"}:
+        raise ValueError(
+            f"on_duplicate_cell: {on_duplicate_cell!r} not in (None, warn, error, overwrite)"
+        )
+
+    writer = gdstk.GdsWriter(
+        gdspath,
+        name=write_settings.lib_name,
+        unit=write_settings.unit,
+        precision=write_settings.precision,
+        max_points=write_settings.max_points,
+        timestamp=timestamp,
+    )
+    cell_names = set()
+    duplicated_cell_names = []
+    no_name_cells = []
+
+    def _get_dependencies(cell: gdstk.Cell | gdstk.RawCell) -> Iterable:
+        if isinstance(cell, gdstk.RawCell):
+            return iter(cell.dependencies(False))
+        # unlike Cell.dependencies, keeps the cells with duplicated names
+        return iter(
+            dict.fromkeys(
+                ref.cell for ref in cell.references if not isinstance(ref.cell, str)
+            )
+        )
+
+    # walk the gdstk cells, which include the cells referenced without a
+    # ComponentReference, as _write_library does
+    visited = {id(top_cell._cell)}
+    stack = [(top_cell._cell, _get_dependencies(top_cell._cell))]
+    try:
+        while stack:
+            cell, dependencies = stack[-1]
+            for dependency in dependencies:
+                if id(dependency) not in visited:
+                    visited.add(id(dependency))
+                    stack.append((dependency, _get_dependencies(dependency)))
+                    break
+            else:
+                # all the dependencies of the cell are written
+                stack.pop()
+                if cell.name in cell_names:
+                    duplicated_cell_names.append(cell.name)
+                    if on_duplicate_cell == "error":
+                        raise ValueError(
+                            f"Duplicated cell names in {top_cell.name!r}: {[cell.name]!r}"
+                        )
+                    elif on_duplicate_cell in {"warn", "overwrite"}:
+                        continue
+                cell_names.add(cell.name)
+                if cell.name.startswith("Unnamed"):
+                    no_name_cells.append(cell.name)
+                writer.write(cell)
+    except Exception:
+        writer.close()
+        gdspath.unlink()
+        raise
+    writer.close()
+
+    if duplicated_cell_names and on_duplicate_cell == "warn":
+        warnings.warn(
+            f"Duplicated cell names in {top_cell.name!r}:  {duplicated_cell_names}",
+            stacklevel=4,
+        )
+    if no_name_cells:
+        warnings.warn(
+            f"Component {top_cell.name!r} contains {len(no_name_cells)} Unnamed cells",
+            stacklevel=4,
+        )
+
+
 def _check_uncached_components(component, mode):
     valid_modes = ["warn", "error", "ignore"]
 
@@ -4,8 +4,11 @@ Adapted from PHIDL https://github.com/amccaugh/phidl/ by Adam McCaughan
 """
 from __future__ import annotations
 
+import dataclasses
 import numbers
 from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import shapely as sp
@@ -20,6 +23,83 @@ class Label(_Label):
         return f"Label(text={self.text!r}, origin={self.origin}, layer=({self.layer}, {self.texttype}))"
 
 
+@dataclasses.dataclass
+class PackedPolygons:
+    """Polygons stored in contiguous numpy arrays.
+
+    Parameters:
+        points: (N, 2) vertices of all the polygons.
+        offsets: (P + 1,) index in points where each polygon starts.
+            The last offset is N, so polygon i is points[offsets[i]:offsets[i + 1]].
+    """
+
+    points: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def from_polygons(cls, polygons: list[Polygon]) -> PackedPolygons:
+        offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+        np.cumsum([polygon.size for polygon in polygons], out=offsets[1:])
+        points = (
+            np.concatenate([polygon.points for polygon in polygons])
+            if polygons
+            else np.empty((0, 2))
+        )
+        return cls(points=points, offsets=offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Yields the (n, 2) vertices of each polygon as views into points."""
+        for start, stop in zip(self.offsets[:-1], self.offsets[1:]):
+            yield self.points[start:stop]
+
+
+def union_polygons(
+    polygons: list[sp.Polygon], max_workers: int | None = None
+) -> sp.Polygon | sp.MultiPolygon:
+    """Returns the union of shapely polygons.
+
+    Polygons are grouped into clusters of intersecting polygons with a
+    spatial index. Each cluster is merged with a bulk unary union, and
+    clusters with a single polygon are not merged at all, which makes sparse
+    layers such as fill patterns fast to merge.
+
+    Args:
+        polygons: shapely polygons.
+        max_workers: number of threads to merge clusters in parallel.
+            Defaults to merging them in this thread.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    polygons = np.asarray(polygons, dtype=object)
+    n = len(polygons)
+    if n == 0:
+        return sp.Polygon()
+
+    i, j = sp.STRtree(polygons).query(polygons, predicate="intersects")
+    graph = coo_matrix((np.ones(len(i), dtype=np.int8), (i, j)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    order = np.argsort(labels, kind="stable")
+    clusters = np.split(polygons[order], np.cumsum(np.bincount(labels))[:-1])
+
+    if max_workers and max_workers > 1:
+        # shapely releases the GIL so clusters are merged in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            merged = list(executor.map(_union_cluster, clusters))
+    else:
+        merged = [_union_cluster(cluster) for cluster in clusters]
+
+    parts = sp.get_parts(merged)
+    return parts[0] if len(parts) == 1 else sp.multipolygons(parts)
+
+
+def _union_cluster(polygons: np.ndarray) -> sp.Polygon | sp.MultiPolygon:
+    return polygons[0] if len(polygons) == 1 else sp.union_all(polygons)
+
+
 def get_polygons(
     instance,
     by_spec: bool | tuple[int, int] = False,
@@ -28,6 +108,7 @@ def get_polygons(
     as_array: bool = True,
     as_shapely: bool = False,
     as_shapely_merged: bool = False,
+    as_packed: bool = False,
 ) -> list[Polygon] | dict[tuple[int, int], list[Polygon]]:
     """Return a list of polygons in this cell.
 
@@ -46,6 +127,11 @@ def get_polygons(
         as_array: when as_array=false, return the Polygon objects instead.
             polygon objects have more information (especially when by_spec=False) and are faster to retrieve.
         as_shapely: returns shapely polygons.
+        as_shapely_merged: returns the union of the shapely polygons
+            (a dict of them by layer if `by_spec` is True).
+            Use union_polygons to merge large layers with multiple threads.
+        as_packed: returns PackedPolygons (or a dict of PackedPolygons if
+            `by_spec` is True) with the vertices in one contiguous array.
 
     Returns
         out: list of array-like[N][2] or dictionary
@@ -60,26 +146,20 @@ def get_polygons(
     import gdsfactory as gf
 
     if hasattr(instance, "_cell"):
-        layers = instance.get_layers()
         gdstk_instance = instance._cell
-
     else:
-        layers = instance.parent.get_layers()
         gdstk_instance = instance._reference
 
     if not by_spec:
         polygons = gdstk_instance.get_polygons(depth=depth, include_paths=include_paths)
 
     elif by_spec is True:
-        polygons = {
-            layer: gdstk_instance.get_polygons(
-                depth=depth,
-                layer=layer[0],
-                datatype=layer[1],
-                include_paths=include_paths,
-            )
-            for layer in layers
-        }
+        # one pass over the hierarchy for all the layers
+        polygons = defaultdict(list)
+        for polygon in gdstk_instance.get_polygons(
+            depth=depth, include_paths=include_paths
+        ):
+            polygons[(polygon.layer, polygon.datatype)].append(polygon)
 
     else:
         by_spec = gf.get_layer(by_spec)
@@ -90,25 +170,38 @@ def get_polygons(
             include_paths=include_paths,
         )
 
-    if not as_array:
+    if as_packed:
+        if by_spec is True:
+            return {
+                layer: PackedPolygons.from_polygons(polygons_list)
+                for layer, polygons_list in polygons.items()
+            }
+        return PackedPolygons.from_polygons(polygons)
+
+    elif not as_array:
         return polygons
     elif as_shapely_merged:
-        polygons = [sp.Polygon(polygon.points) for polygon in polygons]
-        p = sp.Polygon()
-        for polygon in polygons:
-            p = p | polygon
-        return p
+        if by_spec is True:
+            return {
+                layer: union_polygons(
+                    [sp.Polygon(polygon.points) for polygon in polygons_list]
+                )
+                for layer, polygons_list in polygons.items()
+            }
+        return union_polygons([sp.Polygon(polygon.points) for polygon in polygons])
 
     elif as_shapely:
         return [sp.Polygon(polygon.points) for polygon in polygons]
 
     elif by_spec is not True:
         return [polygon.points for polygon in polygons]
-    layer_to_polygons = defaultdict(list)
-    for layer, polygons_list in polygons.items():
-        for polygon in polygons_list:
-            layer_to_polygons[layer].append(polygon.points)
-    return layer_to_polygons
+    return defaultdict(
+        list,
+        {
+            layer: [polygon.points for polygon in polygons_list]
+            for layer, polygons_list in polygons.items()
+        },
+    )
 
 
 def _parse_layer(layer):
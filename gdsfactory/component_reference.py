@@ -117,6 +117,71 @@ def _rotate_points(
     return displacement * ca + perpendicular * sa + c0
 
 
+def _get_port_arrays(
+    component: Component,
+) -> tuple[tuple[str, ...], ndarray, ndarray]:
+    """Returns port names, centers (Nx2) and orientations (N, NaN for None).
+
+    The arrays are cached for locked Components until they are unlocked.
+    """
+    ports = component.ports
+    key = (id(ports), len(ports))
+    cached = component._port_arrays
+    if component._locked and cached is not None and cached[0] == key:
+        return cached[1]
+
+    names = tuple(ports)
+    centers = np.array([port.center for port in ports.values()], dtype=float)
+    orientations = np.array(
+        [
+            np.nan if port.orientation is None else port.orientation
+            for port in ports.values()
+        ],
+        dtype=float,
+    )
+    centers = centers.reshape(len(names), 2)
+    port_arrays = names, centers, orientations
+    if component._locked:
+        component._port_arrays = key, port_arrays
+    return port_arrays
+
+
+def _transform_ports(
+    centers: ndarray,
+    orientations: ndarray,
+    origin: Coordinate = (0, 0),
+    rotation: float = 0,
+    x_reflection: bool = False,
+) -> tuple[ndarray, ndarray]:
+    """Apply GDS-type transformation to port centers and orientations.
+
+    Like ComponentReference._transform_port for all ports at once.
+
+    Args:
+        centers: Nx2 port centers.
+        orientations: N port orientations in degrees (NaN for None).
+        origin: translation.
+        rotation: in degrees.
+        x_reflection: reflect across x-axis before rotating.
+    """
+    new_centers = centers.copy()
+    new_orientations = orientations.copy()
+    has_orientation = ~np.isnan(orientations)
+
+    if x_reflection:
+        new_centers[:, 1] = -new_centers[:, 1]
+        new_orientations = -new_orientations
+    if rotation is not None:
+        new_centers[has_orientation] = _rotate_points(
+            new_centers[has_orientation], angle=rotation, center=(0, 0)
+        )
+        new_orientations += rotation
+    if origin is not None:
+        new_centers += np.array(origin)
+
+    return new_centers, mod(new_orientations, 360)
+
+
 class ComponentReference(_GeometryHelper):
     """Pointer to a Component with x, y, rotation, mirror.
 
@@ -180,6 +245,9 @@ class ComponentReference(_GeometryHelper):
         self._local_ports = {
             name: port._copy() for name, port in component.ports.items()
         }
+        self._local_ports_arrays = None
+        self._local_ports_transform = None
+        self._local_ports_placement = []
         self.visual_label = visual_label
         # self.uid = str(uuid.uuid4())[:8]
 
@@ -296,6 +364,7 @@ class ComponentReference(_GeometryHelper):
         as_array: bool = True,
         as_shapely: bool = False,
         as_shapely_merged: bool = False,
+        as_packed: bool = False,
     ) -> list[Polygon] | dict[tuple[int, int], list[Polygon]]:
         """Return the list of polygons created by this reference.
 
@@ -316,6 +385,8 @@ class ComponentReference(_GeometryHelper):
                 and are faster to retrieve.
             as_shapely: returns shapely polygons.
             as_shapely_merged: returns a shapely polygonize.
+            as_packed: returns PackedPolygons (or a dict of PackedPolygons if
+                `by_spec` is True) with the vertices in one contiguous array.
 
         Returns
             out : list of array-like[N][2] or dictionary
@@ -335,6 +406,7 @@ class ComponentReference(_GeometryHelper):
             as_array=as_array,
             as_shapely=as_shapely,
             as_shapely_merged=as_shapely_merged,
+            as_packed=as_packed,
         )
 
     def get_labels(self, depth=None, set_transform=True):
@@ -492,32 +564,68 @@ class ComponentReference(_GeometryHelper):
         """This property allows you to access myref.ports, and receive a copy.
 
         of the ports dict which is correctly rotated and translated.
+
+        All ports are transformed at once. For locked parents the result is
+        reused until the reference origin, rotation or reflection change.
         """
-        for name, port in self.parent.ports.items():
-            port = self.parent.ports[name]
-            new_center, new_orientation = self._transform_port(
-                port.center,
-                port.orientation,
-                self.origin,
-                self.rotation,
-                self.x_reflection,
-            )
-            if name not in self._local_ports:
-                self._local_ports[name] = port.copy()
-            self._local_ports[name].center = new_center
-            self._local_ports[name].orientation = (
-                mod(new_orientation, 360) if new_orientation else new_orientation
+        parent = self.parent
+        port_arrays = _get_port_arrays(parent)
+        transform = (
+            self._reference.origin,
+            self._reference.rotation,
+            self._reference.x_reflection,
+        )
+        local_ports = self._local_ports
+        names, centers, orientations = port_arrays
+
+        if (
+            parent._locked
+            and port_arrays is self._local_ports_arrays
+            and transform == self._local_ports_transform
+            and len(local_ports) == len(names)
+        ):
+            # restore the cached values in case the ports were modified in place
+            for name, center, orientation in self._local_ports_placement:
+                port = local_ports[name]
+                port.center = center.copy()
+                port.orientation = orientation
+                port.parent = self
+            return local_ports
+
+        new_centers, new_orientations = _transform_ports(
+            centers,
+            orientations,
+            origin=self.origin,
+            rotation=self.rotation,
+            x_reflection=self.x_reflection,
+        )
+        parent_ports = parent.ports
+        placement = [
+            (name, center, None if np.isnan(orientation) else orientation)
+            for name, center, orientation in zip(
+                names, list(new_centers), new_orientations
             )
-            self._local_ports[name].parent = self
+        ]
+
+        for name, center, orientation in placement:
+            if name not in local_ports:
+                local_ports[name] = parent_ports[name].copy()
+            port = local_ports[name]
+            port.center = center.copy()
+            port.orientation = orientation
+            port.parent = self
+            port.reference = self
+
         # Remove any ports that no longer exist in the reference's parent
-        parent_names = self.parent.ports.keys()
-        local_names = list(self._local_ports.keys())
-        for name in local_names:
-            if name not in parent_names:
-                self._local_ports.pop(name)
-        for k in list(self._local_ports):
-            self._local_ports[k].reference = self
-        return self._local_ports
+        if len(local_ports) != len(names):
+            for name in list(local_ports):
+                if name not in parent_ports:
+                    local_ports.pop(name)
+
+        self._local_ports_arrays = port_arrays
+        self._local_ports_transform = transform
+        self._local_ports_placement = placement
+        return local_ports
 
     @property
     def info(self) -> dict[str, Any]:
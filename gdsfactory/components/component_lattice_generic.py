@@ -10,7 +10,7 @@ from gdsfactory.component import Component
 from gdsfactory.components.mzi import mzi2x2_2x2
 from gdsfactory.components.straight import straight
 from gdsfactory.port import select_ports_electrical
-from gdsfactory.routing import get_route
+from gdsfactory.routing.get_route import get_route
 
 
 def find_largest_component(component_list: list) -> Component:
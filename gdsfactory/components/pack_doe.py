@@ -6,7 +6,6 @@ from typing import Any
 import gdsfactory as gf
 from gdsfactory.cell import cell
 from gdsfactory.component import Component
-from gdsfactory.grid import grid, grid_with_text
 from gdsfactory.pack import pack
 from gdsfactory.typings import CellSpec, ComponentSpec
 
@@ -131,6 +130,8 @@ def pack_doe_grid(
         h_mirror: horizontal mirror y axis (x, 1) (1, 0). most common mirror.
         v_mirror: vertical mirror using x axis (1, y) (0, y).
     """
+    from gdsfactory.grid import grid, grid_with_text
+
     if do_permutations:
         settings_list = [dict(zip(settings, t)) for t in it.product(*settings.values())]
     else:
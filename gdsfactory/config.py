@@ -186,6 +186,8 @@ class Paths:
     netlists = module_path / "samples" / "netlists"
     gdsdir = repo_path / "tests" / "gds"
     gdslib = home / ".gdsfactory"
+    cell_cache = gdslib / "cell_cache"
+    gds_index = gdslib / "gds_index"
     modes = gdslib / "modes"
     sparameters = gdslib / "sp"
     interconnect = gdslib / "interconnect"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import shapely
 
 from gdsfactory.component import Component
@@ -7,6 +8,104 @@ from gdsfactory.technology import LayerStack, LayerViews
 from gdsfactory.typings import Layer
 
 
+def _extrude_polygons(
+    polygons: list[np.ndarray],
+    height: float,
+    zmin: float = 0.0,
+    hull_invalid_polygons: bool = True,
+):
+    """Returns a single trimesh with the union of polygons extruded in z.
+
+    Merges the polygons that touch each other, triangulates each merged polygon
+    once and builds the caps and side walls of all of them at once, instead of
+    creating one mesh per polygon.
+
+    Args:
+        polygons: list of (n, 2) arrays of points.
+        height: extrusion thickness.
+        zmin: bottom z of the extrusion.
+        hull_invalid_polygons: If True, replaces invalid polygons with their
+            convex hull. If False, fixes them with shapely.make_valid.
+
+    """
+    import trimesh
+    from mapbox_earcut import triangulate_float64
+
+    geometries = np.array([shapely.Polygon(points) for points in polygons])
+    invalid = ~shapely.is_valid(geometries)
+    if invalid.any():
+        geometries[invalid] = (
+            shapely.convex_hull(geometries[invalid])
+            if hull_invalid_polygons
+            else shapely.make_valid(geometries[invalid])
+        )
+        # make_valid returns multipolygons or collections for self-intersections
+        geometries = shapely.get_parts(shapely.get_parts(geometries))
+        geometries = geometries[shapely.get_type_id(geometries) == 3]
+
+    # only the polygons that touch other polygons need to be merged
+    tree = shapely.STRtree(geometries)
+    pairs = tree.query(geometries, predicate="intersects")
+    isolated = np.bincount(pairs[0], minlength=len(geometries)) == 1
+    parts = list(geometries[isolated])
+    if not isolated.all():
+        parts += list(shapely.get_parts(shapely.union_all(geometries[~isolated])))
+
+    xy = []
+    faces = []
+    edges = []
+    offset = 0
+    for polygon in parts:
+        if polygon.is_empty:
+            continue
+        # counterclockwise exterior and clockwise holes give outward normals
+        polygon = shapely.geometry.polygon.orient(polygon)
+        rings = [polygon.exterior, *polygon.interiors]
+        rings = [np.asarray(ring.coords)[:-1, :2] for ring in rings]
+        ring_ends = np.cumsum([len(ring) for ring in rings])
+        points = np.concatenate(rings)
+        triangles = triangulate_float64(points, ring_ends.astype(np.uint32))
+        faces.append(triangles.reshape(-1, 3) + offset)
+
+        # each ring vertex is connected to the next one in the same ring
+        index = np.arange(len(points))
+        ring_starts = np.concatenate(([0], ring_ends[:-1]))
+        following = index + 1
+        following[ring_ends - 1] = ring_starts
+        edges.append(np.column_stack((index, following)) + offset)
+
+        xy.append(points)
+        offset += len(points)
+
+    if not xy:
+        return trimesh.Trimesh()
+
+    xy = np.concatenate(xy)
+    faces = np.concatenate(faces)
+    edges = np.concatenate(edges)
+    a, b, c = (xy[faces[:, i]] for i in range(3))
+    clockwise = np.cross(b - a, c - a) < 0
+    faces[clockwise] = faces[clockwise][:, ::-1]
+
+    # bottom vertices are 0 ... n - 1 and top vertices n ... 2n - 1
+    n = len(xy)
+    vertices = np.vstack(
+        (
+            np.column_stack((xy, np.full(n, zmin))),
+            np.column_stack((xy, np.full(n, zmin + height))),
+        )
+    )
+    start, end = edges.T
+    walls = np.vstack(
+        (
+            np.column_stack((start, end, end + n)),
+            np.column_stack((start, end + n, start + n)),
+        )
+    )
+    faces = np.vstack((faces[:, ::-1], faces + n, walls))
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
 def to_3d(
     component: Component,
     layer_views: LayerViews | None = None,
@@ -15,6 +114,8 @@ def to_3d(
 ):
     """Return Component 3D trimesh Scene.
 
+    Returns one mesh per layer, with the polygons of each layer merged.
+
     Args:
         component: to extrude in 3D.
         layer_views: layer colors from Klayout Layer Properties file.
@@ -27,7 +128,6 @@ def to_3d(
     from gdsfactory.pdk import get_active_pdk, get_layer_stack, get_layer_views
 
     try:
-        from trimesh.creation import extrude_polygon
         from trimesh.scene import Scene
     except ImportError as e:
         print("you need to `pip install trimesh`")
@@ -44,13 +144,10 @@ def to_3d(
 
     component_with_booleans = layer_stack.get_component_with_derived_layers(component)
     component_layers = component_with_booleans.get_layers()
-    component_with_booleans.show()
 
     has_polygons = False
 
-    for layer, polygons in component_with_booleans.get_polygons(
-        by_spec=True, as_array=False
-    ).items():
+    for layer, polygons in component_with_booleans.get_polygons(by_spec=True).items():
         if (
             layer not in exclude_layers
             and layer in layer_to_zmin
@@ -67,13 +164,10 @@ def to_3d(
             # print(layer, height, zmin, opacity, layer_view.visible)
 
             if zmin is not None and layer_view.visible:
-                for polygon in polygons:
-                    p = shapely.geometry.Polygon(polygon.points)
-                    mesh = extrude_polygon(p, height=height)
-                    mesh.apply_translation((0, 0, zmin))
-                    mesh.visual.face_colors = (*color_rgb, 0.5)
-                    scene.add_geometry(mesh)
-                    has_polygons = True
+                mesh = _extrude_polygons(polygons, height=height, zmin=zmin)
+                mesh.visual.face_colors = (*color_rgb, 0.5)
+                scene.add_geometry(mesh, geom_name=f"{layer[0]}_{layer[1]}")
+                has_polygons = True
 
     if not has_polygons:
         raise ValueError(
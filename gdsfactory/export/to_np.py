@@ -1,9 +1,185 @@
+"""Rasterize Component polygons into numpy arrays.
+
+Polygons are filled with a scanline algorithm over all the polygons of a layer
+at once, tile by tile, so the memory used while rasterizing only depends on the
+tile size. Tiles can be rasterized in a pool of forked processes and written to
+a memory-mapped `.npy` file.
+"""
+
 from __future__ import annotations
 
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
 from gdsfactory.component import Component
-from gdsfactory.typings import Floats, Layers
+from gdsfactory.typings import Floats, Layers, PathType
+
+# edges and polygon bboxes (in pixels) of each layer, values and antialias,
+# inherited by the forked worker processes
+_raster: tuple[list, list[float], int] = ([], [], 1)
+
+
+def _get_edges(
+    polygons: list[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns start points, end points, polygon index of each edge and bboxes.
+
+    Args:
+        polygons: list of (n, 2) arrays. Each polygon is closed implicitly.
+    """
+    if not len(polygons):
+        empty = np.zeros((0, 2))
+        return empty, empty, np.zeros(0, dtype=np.int64), np.zeros((0, 2, 2))
+
+    sizes = np.array([len(p) for p in polygons])
+    start = np.concatenate(polygons).astype(float)
+    polygon_index = np.repeat(np.arange(len(polygons)), sizes)
+    first = np.cumsum(sizes) - sizes
+    following = np.arange(len(start)) + 1
+    following[first + sizes - 1] = first
+    bboxes = np.stack(
+        (
+            np.minimum.reduceat(start, first),
+            np.maximum.reduceat(start, first),
+        ),
+        axis=1,
+    )
+    return start, start[following], polygon_index, bboxes
+
+
+def _scanline(
+    start: np.ndarray,
+    end: np.ndarray,
+    polygon_index: np.ndarray,
+    shape: tuple[int, int],
+) -> np.ndarray:
+    """Returns a (rows, columns) mask of the pixels inside any polygon.
+
+    Pixel (i, j) is inside if its center (x, y) = (j + 0.5, i + 0.5) is inside.
+
+    Args:
+        start: (n, 2) start points of the edges in pixels.
+        end: (n, 2) end points of the edges in pixels.
+        polygon_index: polygon of each edge.
+        shape: rows and columns.
+    """
+    rows, columns = shape
+    x0, y0 = start.T
+    x1, y1 = end.T
+
+    # each edge crosses the rows with centers in [ymin, ymax)
+    first = np.clip(np.ceil(np.minimum(y0, y1) - 0.5), 0, rows).astype(np.int64)
+    last = np.clip(np.ceil(np.maximum(y0, y1) - 0.5), 0, rows).astype(np.int64)
+    counts = last - first
+    edge = np.repeat(np.arange(len(counts)), counts)
+    row = (
+        first[edge]
+        + np.arange(len(edge))
+        - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    x = x0[edge] + (row + 0.5 - y0[edge]) * (x1[edge] - x0[edge]) / (
+        y1[edge] - y0[edge]
+    )
+
+    # every polygon crosses each row an even number of times: sorted by
+    # polygon, row and x, the crossings pair up into spans
+    order = np.lexsort((x, row, polygon_index[edge]))
+    x, row = x[order], row[order][0::2]
+    span_start = np.clip(np.ceil(x[0::2] - 0.5), 0, columns).astype(np.int64)
+    span_end = np.clip(np.ceil(x[1::2] - 0.5), 0, columns).astype(np.int64)
+
+    spans = np.zeros((rows, columns + 1), dtype=np.int16)
+    np.add.at(spans, (row, span_start), 1)
+    np.add.at(spans, (row, span_end), -1)
+    return np.cumsum(spans, axis=1, dtype=np.int16)[:, :-1] > 0
+
+
+def _coverage(
+    start: np.ndarray,
+    end: np.ndarray,
+    polygon_index: np.ndarray,
+    shape: tuple[int, int],
+    antialias: int = 1,
+) -> np.ndarray:
+    """Returns the fraction of each pixel covered by the polygons.
+
+    Returns a boolean mask of the pixels with their center inside the polygons
+    if antialias is 1.
+
+    Args:
+        start: (n, 2) start points of the edges in pixels.
+        end: (n, 2) end points of the edges in pixels.
+        polygon_index: polygon of each edge.
+        shape: rows and columns.
+        antialias: number of samples along x and y in each pixel.
+    """
+    if antialias == 1:
+        return _scanline(start, end, polygon_index, shape)
+    rows, columns = shape
+    inside = _scanline(
+        start * antialias,
+        end * antialias,
+        polygon_index,
+        (rows * antialias, columns * antialias),
+    )
+    return inside.reshape(rows, antialias, columns, antialias).mean(axis=(1, 3))
+
+
+def rasterize_polygons(
+    polygons: list[np.ndarray],
+    shape: tuple[int, int],
+    origin: tuple[float, float] = (0, 0),
+    pixel_size: tuple[float, float] = (1, 1),
+    antialias: int = 1,
+) -> np.ndarray:
+    """Returns the fraction of each pixel covered by the union of polygons.
+
+    Args:
+        polygons: list of (n, 2) arrays of points.
+        shape: rows (along y) and columns (along x) of the raster.
+        origin: x, y of the lower left corner of pixel (0, 0).
+        pixel_size: x, y size of each pixel.
+        antialias: number of samples along x and y in each pixel.
+            1 returns 1 for pixels with their center inside the polygons.
+    """
+    polygons = [(np.asarray(p) - origin) / pixel_size for p in polygons]
+    start, end, polygon_index, _ = _get_edges(polygons)
+    return _coverage(start, end, polygon_index, shape, antialias).astype(float)
+
+
+def _rasterize_tile(tile: tuple[int, int, int, int]) -> np.ndarray:
+    """Returns the (x, y) image of a tile (x0, y0, x1, y1) in pixels."""
+    layer_edges, values, antialias = _raster
+    x0, y0, x1, y1 = tile
+    image = np.zeros((x1 - x0, y1 - y0))
+
+    for (start, end, polygon_index, bboxes), value in zip(layer_edges, values):
+        in_tile = (
+            (bboxes[:, 0, 0] < x1)
+            & (bboxes[:, 1, 0] > x0)
+            & (bboxes[:, 0, 1] < y1)
+            & (bboxes[:, 1, 1] > y0)
+        )
+        if not in_tile.any():
+            continue
+        edges = in_tile[polygon_index]
+        # swap x and y to scan along x, so that rows are x pixels as in image
+        coverage = _coverage(
+            (start[edges] - (x0, y0))[:, ::-1],
+            (end[edges] - (x0, y0))[:, ::-1],
+            polygon_index[edges],
+            image.shape,
+            antialias,
+        )
+        # later layers overwrite the covered fraction of former ones
+        if coverage.dtype == bool:
+            image[coverage] = value
+        else:
+            image += (value - image) * coverage
+    return image
 
 
 def to_np(
@@ -12,18 +188,38 @@ def to_np(
     layers: Layers = ((1, 0),),
     values: Floats | None = None,
     pad_width: int = 1,
+    antialias: int = 1,
+    tile_size: int = 1024,
+    processes: int = 1,
+    filepath: PathType | None = None,
 ) -> np.ndarray:
     """Returns a pixelated numpy array from Component polygons.
 
+    The array is indexed by x and y pixels: pixel (i, j) covers
+    [xmin + i * d, xmin + (i + 1) * d) x [ymin + j * d, ymin + (j + 1) * d)
+    before padding, where d is the pixel size.
+
     Args:
         component: Component.
         nm_per_pixel: you can go from 20 (coarse) to 4 (fine).
         layers: to convert. Order matters (latter overwrite former).
         values: associated to each layer (defaults to 1).
         pad_width: padding pixels around the image.
+        antialias: number of samples along x and y in each pixel. If more than 1,
+            each pixel gets the fraction of its area covered by each layer.
+        tile_size: number of pixels along x and y rasterized at once.
+        processes: number of processes rasterizing tiles in parallel.
+        filepath: optional `.npy` file to write the array to, as a memory-mapped
+            array instead of keeping it in memory.
+
+    .. code::
+
+        import gdsfactory as gf
 
+        c = gf.components.spiral_inner_io()
+        img = gf.export.to_np(c, nm_per_pixel=5, processes=8, filepath="c.npy")
     """
-    import skimage.draw as skdraw
+    global _raster
 
     pixels_per_um = (1 / nm_per_pixel) * 1e3
     xmin, ymin = component.bbox[0]
@@ -32,23 +228,59 @@ def to_np(
         int(np.ceil(xmax - xmin) * pixels_per_um),
         int(np.ceil(ymax - ymin) * pixels_per_um),
     )
-    img = np.zeros(shape, dtype=float)
-    layer_to_polygons = component.get_polygons(by_spec=True, depth=None)
+    padded_shape = (shape[0] + 2 * pad_width, shape[1] + 2 * pad_width)
+    if filepath:
+        img = np.lib.format.open_memmap(
+            filepath, mode="w+", dtype=float, shape=padded_shape
+        )
+    else:
+        img = np.zeros(padded_shape, dtype=float)
 
+    layer_to_polygons = component.get_polygons(by_spec=True, depth=None)
     values = values or [1] * len(layers)
+    layer_edges = []
+    for layer in layers:
+        polygons = [
+            (p - (xmin, ymin)) * pixels_per_um for p in layer_to_polygons.get(layer, [])
+        ]
+        layer_edges.append(_get_edges(polygons))
+
+    tiles = [
+        (x0, y0, min(x0 + tile_size, shape[0]), min(y0 + tile_size, shape[1]))
+        for x0 in range(0, shape[0], tile_size)
+        for y0 in range(0, shape[1], tile_size)
+    ]
+
+    if processes > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        warnings.warn(
+            "to_np needs the fork start method, rasterizing in this process",
+            stacklevel=2,
+        )
+        processes = 1
+
+    _raster = (layer_edges, list(values), antialias)
+    executor = None
+    try:
+        if processes > 1 and len(tiles) > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=min(processes, len(tiles)),
+                mp_context=multiprocessing.get_context("fork"),
+            )
+            images = executor.map(_rasterize_tile, tiles)
+        else:
+            images = map(_rasterize_tile, tiles)
+
+        p = pad_width
+        for (x0, y0, x1, y1), image in zip(tiles, images):
+            img[x0 + p : x1 + p, y0 + p : y1 + p] = image
+    finally:
+        if executor:
+            executor.shutdown()
+        _raster = ([], [], 1)
 
-    for layer, value in zip(layers, values):
-        if layer in layer_to_polygons:
-            polygons = layer_to_polygons[layer]
-            for polygon in polygons:
-                r = polygon[:, 0] - xmin
-                c = polygon[:, 1] - ymin
-                rr, cc = skdraw.polygon(
-                    r * pixels_per_um, c * pixels_per_um, shape=shape
-                )
-                img[rr, cc] = value
-
-    return np.pad(img, pad_width=pad_width)
+    if filepath:
+        img.flush()
+    return img
 
 
 if __name__ == "__main__":
@@ -29,9 +29,7 @@ def to_stl(
         scale: Optional factor by which to scale meshes before writing.
 
     """
-    import shapely
-    import trimesh.creation
-
+    from gdsfactory.export.to_3d import _extrude_polygons
     from gdsfactory.pdk import get_layer_stack
 
     layer_stack = layer_stack or get_layer_stack()
@@ -70,18 +68,12 @@ def to_stl(
         print(
             f"Write {filepath_layer.absolute()!r} zmin = {zmin:.3f}, height = {height:.3f}"
         )
-        meshes = []
-        for polygon in polygons:
-            p = shapely.geometry.Polygon(polygon)
-
-            if hull_invalid_polygons and not p.is_valid:
-                p = p.convex_hull
-
-            mesh = trimesh.creation.extrude_polygon(p, height=height)
-            mesh.apply_translation((0, 0, zmin))
-            meshes.append(mesh)
-
-        layer_mesh = trimesh.util.concatenate(meshes)
+        layer_mesh = _extrude_polygons(
+            polygons,
+            height=height,
+            zmin=zmin,
+            hull_invalid_polygons=hull_invalid_polygons,
+        )
 
         if scale:
             layer_mesh.apply_scale(scale)
@@ -51,29 +51,21 @@ def _rasterize_polygons(polygons, bounds=([-100, -100], [100, 100]), dx=1, dy=1)
             "$ pip install --upgrade scikit-image"
         ) from e
 
-    # Prepare polygon array by shifting all points into the first quadrant and
-    # separating points into x and y lists
-    xpts = []
-    ypts = []
-    for p in polygons:
-        p_array = np.asarray(p)
-        x = p_array[:, 0]
-        y = p_array[:, 1]
-        xpts.append((x - bounds[0][0]) / dx - 0.5)
-        ypts.append((y - bounds[0][1]) / dy - 0.5)
+    from gdsfactory.export.to_np import rasterize_polygons
 
     # Initialize the raster matrix we'll be writing to
     xsize = int(np.ceil(bounds[1][0] - bounds[0][0]) / dx)
     ysize = int(np.ceil(bounds[1][1] - bounds[0][1]) / dy)
-    raster = np.zeros((ysize, xsize), dtype=bool)
+    raster = rasterize_polygons(
+        polygons, shape=(ysize, xsize), origin=bounds[0], pixel_size=(dx, dy)
+    ).astype(bool)
 
     # TODO: Replace polygon_perimeter with the supercover version
-    for n in range(len(xpts)):
-        rr, cc = draw.polygon(ypts[n], xpts[n], shape=raster.shape)
-        rrp, ccp = draw.polygon_perimeter(
-            ypts[n], xpts[n], shape=raster.shape, clip=False
-        )
-        raster[rr, cc] = 1
+    for p in polygons:
+        p_array = np.asarray(p)
+        x = (p_array[:, 0] - bounds[0][0]) / dx - 0.5
+        y = (p_array[:, 1] - bounds[0][1]) / dy - 0.5
+        rrp, ccp = draw.polygon_perimeter(y, x, shape=raster.shape, clip=False)
         raster[rrp, ccp] = 1
 
     return raster
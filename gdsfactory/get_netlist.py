@@ -18,9 +18,11 @@ Assumes two ports are connected when they have same width, x, y
 
 from __future__ import annotations
 
+import copy
+import itertools
 from collections import defaultdict
 from collections.abc import Callable
-from typing import Any
+from typing import Any, Literal
 
 import numpy as np
 import omegaconf
@@ -114,6 +116,7 @@ def get_netlist(
     exclude_port_types: list[str] | tuple[str] | None = ("placement",),
     get_instance_name: Callable[..., str] = get_instance_name_from_alias,
     allow_multiple: bool = False,
+    engine: Literal["two_sweep", "kdtree"] = "two_sweep",
 ) -> dict[str, Any]:
     """From Component returns instances, connections and placements dict.
 
@@ -146,6 +149,9 @@ def get_netlist(
         get_instance_name: function to get instance name.
         allow_multiple: False to raise an error if more than two ports share the same connection.
             if True, will return key: [value] pairs with [value] a list of all connected instances.
+        engine: to find connected ports.
+            two_sweep: groups ports in python dicts on a fine and a coarse grid.
+            kdtree: groups ports with numpy arrays and a KD-tree, faster for many ports.
 
     Returns:
         instances: Dict of instance name and settings.
@@ -263,6 +269,7 @@ def get_netlist(
             port_type,
             tolerance=tolerance,
             allow_multiple=allow_multiple,
+            engine=engine,
         )
         if warnings_t:
             warnings[port_type] = warnings_t
@@ -300,12 +307,31 @@ def extract_connections(
     tolerance: int = 5,
     validators: dict[str, Callable] | None = None,
     allow_multiple: bool = False,
+    engine: Literal["two_sweep", "kdtree"] = "two_sweep",
 ):
+    """Returns connections and warnings for ports of the same type.
+
+    Args:
+        port_names: names of the ports to connect.
+        ports: dict of port name to Port.
+        port_type: used to select the connection validator.
+        tolerance: tolerance in nm to consider two ports connected.
+        validators: dict of port_type to connection validator.
+        allow_multiple: False to raise an error if more than two ports share the same connection.
+        engine: two_sweep or kdtree.
+    """
     if validators is None:
         validators = DEFAULT_CONNECTION_VALIDATORS
 
+    engines = {
+        "two_sweep": _extract_connections_two_sweep,
+        "kdtree": _extract_connections_kdtree,
+    }
+    if engine not in engines:
+        raise ValueError(f"engine = {engine!r} not in {list(engines)}")
+
     validator = validators.get(port_type, _null_validator)
-    return _extract_connections_two_sweep(
+    return engines[engine](
         port_names,
         ports,
         port_type,
@@ -407,6 +433,141 @@ def _extract_connections_two_sweep(
     return connections, dict(warnings)
 
 
+def _split_groups(labels: np.ndarray) -> list[np.ndarray]:
+    """Returns indices grouped by label, ordered by first occurrence."""
+    order = np.argsort(labels, kind="stable")
+    _, starts = np.unique(labels[order], return_index=True)
+    groups = np.split(order, starts[1:])
+    return sorted(groups, key=lambda group: group[0])
+
+
+def _group_on_grid(centers: np.ndarray, nm: int) -> np.ndarray:
+    """Returns group labels for points that snap to the same grid point."""
+    keys = centers if nm == 0 else np.round(centers * 1e3 / nm)
+    _, labels = np.unique(keys, axis=0, return_inverse=True)
+    return labels.reshape(-1)
+
+
+def _group_within_distance(centers: np.ndarray, distance: float) -> np.ndarray:
+    """Returns group labels for points closer than distance to each other."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+
+    n = len(centers)
+    pairs = cKDTree(centers).query_pairs(r=distance, output_type="ndarray")
+    graph = coo_matrix(
+        (np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])), shape=(n, n)
+    )
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def _extract_connections_kdtree(
+    port_names: list[str],
+    ports: dict[str, Port],
+    port_type: str,
+    connection_validator: Callable,
+    tolerance: int,
+    raise_error_for_warnings: list[str] | None = None,
+    allow_multiple: bool = False,
+):
+    """Same as _extract_connections_two_sweep using numpy arrays.
+
+    The fine sweep groups ports on the same grid point with numpy.
+    The coarse sweep connects the remaining ports closer than tolerance with a KD-tree,
+    also the ones that the coarse grid of the two sweep engine splits into two cells.
+    Connection validators run only for pairs that fail a vectorized check.
+    """
+    warnings = defaultdict(list)
+    if raise_error_for_warnings is None:
+        raise_error_for_warnings = DEFAULT_CRITICAL_CONNECTION_ERROR_TYPES.get(
+            port_type, []
+        )
+
+    if tolerance < 0:
+        raise ValueError(f"Cannot have a tolerance less than zero. Got {tolerance}")
+
+    port_names = list(port_names)
+    centers = np.array([ports[name].center for name in port_names], dtype=float)
+    centers = centers.reshape(len(port_names), 2)
+
+    groups = []
+    unconnected = np.arange(len(port_names))
+    sweeps = [(_group_on_grid, min(tolerance, 1))]
+    if tolerance > 1:
+        sweeps.append((_group_within_distance, tolerance * 1e-3))
+
+    for group_ports, grid_size in sweeps:
+        if len(unconnected) < 2:
+            break
+        labels = group_ports(centers[unconnected], grid_size)
+        unconnected_groups = []
+        for group in _split_groups(labels):
+            if len(group) == 1:
+                unconnected_groups.append(unconnected[group])
+            else:
+                groups.append(unconnected[group])
+        unconnected = (
+            np.sort(np.concatenate(unconnected_groups))
+            if unconnected_groups
+            else np.array([], dtype=int)
+        )
+
+    connections = []
+    for group in groups:
+        ports_at_xy = [port_names[i] for i in group]
+        if len(group) == 2:
+            connections.append(ports_at_xy)
+        elif not allow_multiple:
+            xy = tuple(snap_to_grid(centers[group[0]]))
+            warnings["multiple_connections"].append(ports_at_xy)
+            raise ValueError(f"Found multiple connections at {xy}:{ports_at_xy}")
+        else:
+            # Iterates over the list of multiple ports to create related two-port connectivity
+            connections.extend(
+                [ports_at_xy[i - 1], ports_at_xy[i]] for i in range(len(group))
+            )
+
+    if connection_validator in CONNECTION_VALIDATOR_FILTERS:
+        connection_filter = CONNECTION_VALIDATOR_FILTERS[connection_validator]
+        to_validate = (
+            connection_filter(connections, ports)
+            if connection_filter and connections
+            else np.zeros(len(connections), dtype=bool)
+        )
+    else:
+        to_validate = np.ones(len(connections), dtype=bool)
+
+    for connection in itertools.compress(connections, to_validate):
+        port1 = ports[connection[0]]
+        port2 = ports[connection[1]]
+        connection_validator(port1, port2, connection, warnings)
+
+    unconnected_non_top_level = [
+        port_names[i] for i in unconnected if "," in port_names[i]
+    ]
+    if unconnected_non_top_level:
+        unconnected_xys = [ports[pname].center for pname in unconnected_non_top_level]
+        warnings["unconnected_ports"].append(
+            _make_warning(
+                ports=unconnected_non_top_level,
+                values=unconnected_xys,
+                message=f"{len(unconnected_non_top_level)} unconnected {port_type} ports!",
+            )
+        )
+
+    critical_warnings = {
+        w: warnings[w] for w in raise_error_for_warnings if w in warnings
+    }
+
+    if critical_warnings:
+        raise ValueError(
+            f"Found critical warnings while extracting netlist: {critical_warnings}"
+        )
+    return connections, dict(warnings)
+
+
 def _make_warning(ports: list[str], values: Any, message: str) -> dict[str, Any]:
     w = {
         "ports": ports,
@@ -513,6 +674,78 @@ def validate_optical_connection(
         )
 
 
+def get_optical_connections_to_validate(
+    connections: list[list[str]],
+    ports: dict[str, Port],
+    angle_tolerance=0.01,
+    offset_tolerance=0.001,
+    width_tolerance=0.001,
+) -> np.ndarray:
+    """Returns a mask of the connections that validate_optical_connection may warn about.
+
+    Vectorized check over all connections. Uses half the tolerances of
+    validate_optical_connection so that it never misses a warning.
+
+    Args:
+        connections: list of port name pairs.
+        ports: dict of port name to Port.
+        angle_tolerance: in degrees.
+        offset_tolerance: in um.
+        width_tolerance: in um.
+    """
+    names = np.array(connections, dtype=object).reshape(-1, 2)
+    pairs = [(ports[name1], ports[name2]) for name1, name2 in names]
+
+    is_top_level = np.array(
+        [("," not in name1, "," not in name2) for name1, name2 in names], dtype=bool
+    ).reshape(-1, 2)
+    widths = np.array(
+        [(port1.width, port2.width) for port1, port2 in pairs], dtype=float
+    ).reshape(-1, 2)
+    shear_angles = np.array(
+        [(port1.shear_angle or 0, port2.shear_angle or 0) for port1, port2 in pairs],
+        dtype=float,
+    ).reshape(-1, 2)
+    orientations = np.array(
+        [
+            (
+                np.nan if port1.orientation is None else port1.orientation,
+                np.nan if port2.orientation is None else port2.orientation,
+            )
+            for port1, port2 in pairs
+        ],
+        dtype=float,
+    ).reshape(-1, 2)
+    centers = np.array(
+        [(port1.center, port2.center) for port1, port2 in pairs], dtype=float
+    ).reshape(-1, 2, 2)
+
+    def _difference_between_angles(angles: np.ndarray) -> np.ndarray:
+        return np.abs(np.mod(angles[:, 0] - angles[:, 1] + 180, 360) - 180)
+
+    has_shear_angle = shear_angles != 0
+    orientation_difference = _difference_between_angles(orientations)
+    orientation_misalignment = np.where(
+        is_top_level.any(axis=1),
+        orientation_difference,
+        np.abs(orientation_difference - 180),
+    )
+    offsets = np.sqrt(np.sum(np.square(centers[:, 1] - centers[:, 0]), axis=1))
+
+    return (
+        is_top_level.all(axis=1)
+        | (np.abs(widths[:, 0] - widths[:, 1]) > width_tolerance / 2)
+        | (has_shear_angle[:, 0] != has_shear_angle[:, 1])
+        | (
+            has_shear_angle.all(axis=1)
+            & (_difference_between_angles(shear_angles) > angle_tolerance / 2)
+        )
+        | np.isnan(orientations).any(axis=1)
+        | (orientation_misalignment > angle_tolerance / 2)
+        | (offsets > offset_tolerance / 2)
+    )
+
+
 def difference_between_angles(angle2: float, angle1: float) -> float:
     diff = angle2 - angle1
     while diff < 180:
@@ -550,40 +783,122 @@ def get_netlist_recursive(
 ) -> dict[str, Any]:
     """Returns recursive netlist for a component and subcomponents.
 
+    The netlists of locked components (all cells from @cell) whose
+    subcomponents are also locked are memoized, so that repeated calls only
+    extract the netlists of the components that changed.
+    Unlocking a component clears its memoized netlists, and the memoized
+    netlists of the components referencing it are extracted again.
+
     Args:
         component: to extract netlist.
         component_suffix: suffix to append to each component name.
             useful if to save and reload a back-annotated netlist.
         get_netlist_func: function to extract individual netlists.
+        get_instance_name: function to get instance name.
 
     Keyword Args:
         full_settings: True returns all, false changed settings.
         tolerance: tolerance in nm to consider two ports connected.
         exclude_port_types: optional list of port types to exclude from netlisting.
-        get_instance_name: function to get instance name.
 
     Returns:
         Dictionary of netlists, keyed by the name of each component.
 
     """
-    all_netlists = {}
+    key = _get_netlist_cache_key(
+        component_suffix, get_netlist_func, get_instance_name, **kwargs
+    )
+    all_netlists, _ = _get_netlist_recursive(
+        component,
+        key=key,
+        memo={},
+        component_suffix=component_suffix,
+        get_netlist_func=get_netlist_func,
+        get_instance_name=get_instance_name,
+        **kwargs,
+    )
+    return copy.deepcopy(all_netlists)
+
+
+def _get_netlist_cache_key(*args, **kwargs) -> tuple | None:
+    """Returns a hashable key for the netlist arguments or None if unhashable."""
+    key = args + tuple(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in sorted(kwargs.items())
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+# stamps of the memoized netlists of locked components, to detect stale ones
+_netlist_stamps = itertools.count()
+
+
+def _get_netlist_recursive(
+    component: Component,
+    key: tuple | None,
+    memo: dict[int, tuple[dict[str, Any], int | None]],
+    component_suffix: str,
+    get_netlist_func: Callable,
+    get_instance_name: Callable[..., str],
+    **kwargs,
+) -> tuple[dict[str, Any], int | None]:
+    """Returns the netlists of a component and the stamp of its memoized netlists.
+
+    The stamp is None if the netlists can not be memoized. The memoized netlists
+    of a locked component are only reused if the stamps of its subcomponents did
+    not change, as a subcomponent may have been unlocked and changed since.
+
+    Args:
+        component: to extract netlist.
+        key: for the memoized netlists of locked components. None disables memoization.
+        memo: netlists of the components already visited in this call, keyed by id.
+        component_suffix: suffix to append to each component name.
+        get_netlist_func: function to extract individual netlists.
+        get_instance_name: function to get instance name.
+    """
+    if id(component) in memo:
+        return memo[id(component)]
 
     # only components with references (subcomponents) warrant a netlist
     references = _get_references_to_netlist(component)
+    children = [
+        _get_netlist_recursive(
+            component=ref.parent,
+            key=key,
+            memo=memo,
+            component_suffix=component_suffix,
+            get_netlist_func=get_netlist_func,
+            get_instance_name=get_instance_name,
+            **kwargs,
+        )
+        for ref in references
+    ]
+    child_stamps = tuple(stamp for _, stamp in children)
+
+    netlists = getattr(component, "_netlists", None)
+    is_locked = (
+        getattr(component, "_locked", False)
+        and netlists is not None
+        and key is not None
+        and None not in child_stamps
+    )
+    if is_locked and key in netlists and netlists[key][1] == child_stamps:
+        all_netlists, _, stamp = netlists[key]
+        memo[id(component)] = all_netlists, stamp
+        return memo[id(component)]
+
+    all_netlists = {}
 
     if references:
         netlist = get_netlist_func(component, **kwargs)
         all_netlists[f"{component.name}{component_suffix}"] = netlist
 
         # for each reference, expand the netlist
-        for ref in references:
+        for ref, (grandchildren, _) in zip(references, children):
             rcell = ref.parent
-            grandchildren = get_netlist_recursive(
-                component=rcell,
-                component_suffix=component_suffix,
-                get_netlist_func=get_netlist_func,
-                **kwargs,
-            )
             all_netlists |= grandchildren
 
             child_references = _get_references_to_netlist(ref.ref_cell)
@@ -597,7 +912,12 @@ def get_netlist_recursive(
                     netlist_dict.update(info=rcell.info)
                 netlist["instances"][inst_name] = netlist_dict
 
-    return all_netlists
+    stamp = None
+    if is_locked:
+        stamp = next(_netlist_stamps)
+        netlists[key] = all_netlists, child_stamps, stamp
+    memo[id(component)] = all_netlists, stamp
+    return memo[id(component)]
 
 
 def _demo_ring_single_array() -> None:
@@ -625,6 +945,13 @@ def _demo_mzi_lattice() -> None:
 
 DEFAULT_CONNECTION_VALIDATORS = get_default_connection_validators()
 
+# vectorized checks that select the connections each validator needs to see
+# (None: the validator never warns). Other validators see all connections.
+CONNECTION_VALIDATOR_FILTERS = {
+    validate_optical_connection: get_optical_connections_to_validate,
+    _null_validator: None,
+}
+
 DEFAULT_CRITICAL_CONNECTION_ERROR_TYPES = {
     "optical": ["width_mismatch", "shear_angle_mismatch", "orientation_mismatch"]
 }
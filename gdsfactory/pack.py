@@ -5,14 +5,16 @@ Adapted from PHIDL https://github.com/amccaugh/phidl/ by Adam McCaughan
 
 from __future__ import annotations
 
+import time
 import warnings
-from typing import Any
+from typing import Any, Literal
 
 import numpy as np
 from pydantic import validate_arguments
 
 import gdsfactory as gf
 from gdsfactory.component import Component
+from gdsfactory.config import logger
 from gdsfactory.name import get_name_short
 from gdsfactory.typings import Anchor, ComponentSpec, Float2, Number
 
@@ -89,6 +91,103 @@ def _pack_single_bin(
     return packed_rect_dict, unpacked_rect_dict
 
 
+def _skyline_insert(
+    xs: np.ndarray, ys: np.ndarray, bin_size: np.ndarray, w: float, h: float
+) -> tuple[int, float] | None:
+    """Returns the bottom-left skyline segment index and y for a (w, h) rectangle.
+
+    Args:
+        xs: skyline segment starts, sorted. Each segment ends at the next start.
+        ys: skyline segment heights.
+        bin_size: width, height of the bin.
+        w: rectangle width.
+        h: rectangle height.
+    """
+    ends = np.searchsorted(xs, xs + w, side="left")
+    indices = np.stack([np.arange(len(xs)), ends], axis=-1).ravel()
+    # max height of the segments under the rectangle placed at each segment start
+    y = np.maximum.reduceat(np.append(ys, -np.inf), indices)[::2]
+    y[(xs + w > bin_size[0]) | (y + h > bin_size[1])] = np.inf
+    i = int(np.argmin(y))
+    return None if np.isinf(y[i]) else (i, y[i])
+
+
+def _pack_skyline(
+    rect_dict: dict[int, tuple[Number, Number]],
+    aspect_ratio: tuple[Number, Number],
+    max_size: tuple[float, float],
+    sort_by_area: bool,
+    density: float,
+) -> list[dict[int, tuple[Number, Number, Number, Number]]]:
+    """Packs a dict of rectangles {id:(w,h)} in bins with a bottom-left skyline.
+
+    Places all the rectangles in one pass: the bin width comes from the total area,
+    `density` and `aspect_ratio`, and a new bin is opened when a rectangle does
+    not fit in the open ones (only with a finite max_size).
+
+    Args:
+        rect_dict: dict of rectangles {id: (w, h)} to pack.
+        aspect_ratio: x, y.
+        max_size: tuple of max X, Y size.
+        sort_by_area: sorts the rectangles by decreasing height, then width.
+        density: bin area over the total area of the rectangles.
+
+    Returns:
+        list of packed rectangles dict {id:(x,y,w,h)} for each bin.
+
+    """
+    if not rect_dict:
+        return []
+
+    ids = np.array(list(rect_dict.keys()))
+    sizes = np.array(list(rect_dict.values()), dtype=np.float64).reshape(-1, 2)
+    max_size = np.asarray(max_size, dtype=np.float64)
+
+    total_area = np.sum(sizes[:, 0] * sizes[:, 1]) * density
+    width = np.sqrt(total_area * aspect_ratio[0] / aspect_ratio[1])
+    width = max(width, total_area / max_size[1], sizes[:, 0].max())
+    bin_size = np.array([min(width, max_size[0]), max_size[1]])
+
+    if sort_by_area:
+        order = np.lexsort((-sizes[:, 0], -sizes[:, 1]))
+    else:
+        order = np.arange(len(ids))
+
+    skylines: list[tuple[np.ndarray, np.ndarray]] = []
+    packed_list: list[dict[int, tuple[Number, Number, Number, Number]]] = []
+    for n in order:
+        w, h = sizes[n]
+        for b, (xs, ys) in enumerate(skylines):
+            position = _skyline_insert(xs, ys, bin_size, w, h)
+            if position is not None:
+                break
+        else:
+            b = len(skylines)
+            xs, ys = np.zeros(1), np.zeros(1)
+            skylines.append((xs, ys))
+            packed_list.append({})
+            position = _skyline_insert(xs, ys, bin_size, w, h)
+
+        i, y = position
+        x = xs[i]
+        # segments under the rectangle, the last one may continue on its right
+        j = np.searchsorted(xs, x + w, side="left")
+        end = xs[j] if j < len(xs) else bin_size[0]
+        new_xs, new_ys = [x], [y + h]
+        if x + w < end:
+            new_xs.append(x + w)
+            new_ys.append(ys[j - 1])
+        xs = np.concatenate([xs[:i], new_xs, xs[j:]])
+        ys = np.concatenate([ys[:i], new_ys, ys[j:]])
+
+        # merge neighbours at the same height
+        keep = np.append(True, ys[1:] != ys[:-1])
+        skylines[b] = (xs[keep], ys[keep])
+        packed_list[b][int(ids[n])] = (x, y, w, h)
+
+    return packed_list
+
+
 @validate_arguments
 def pack(
     component_list: list[ComponentSpec],
@@ -110,6 +209,7 @@ def pack(
     v_mirror: bool = False,
     add_ports_prefix: bool = True,
     add_ports_suffix: bool = False,
+    engine: Literal["rectpack", "skyline"] = "rectpack",
 ) -> list[Component]:
     """Pack a list of components into as few Components as possible.
 
@@ -134,6 +234,9 @@ def pack(
         v_mirror: vertical mirror using x axis (1, y) (0, y).
         add_ports_prefix: adds port names with prefix.
         add_ports_suffix: adds port names with suffix.
+        engine: rectpack grows each bin until the components fit (MaxRects).
+            skyline places all the components in one pass over numpy arrays,
+            which is much faster for thousands of components.
 
     .. plot::
         :include-source:
@@ -182,16 +285,39 @@ def pack(
             )
         rect_dict[n] = (w, h)
 
-    packed_list = []
-    while rect_dict:
-        (packed_rect_dict, rect_dict) = _pack_single_bin(
+    t0 = time.perf_counter()
+    efficiencies = []
+    if engine == "skyline":
+        packed_list = _pack_skyline(
             rect_dict,
             aspect_ratio=aspect_ratio,
             max_size=max_size,
             sort_by_area=sort_by_area,
             density=density,
         )
-        packed_list.append(packed_rect_dict)
+    elif engine == "rectpack":
+        packed_list = []
+        while rect_dict:
+            (packed_rect_dict, rect_dict) = _pack_single_bin(
+                rect_dict,
+                aspect_ratio=aspect_ratio,
+                max_size=max_size,
+                sort_by_area=sort_by_area,
+                density=density,
+            )
+            packed_list.append(packed_rect_dict)
+    else:
+        raise ValueError(f"engine={engine!r} must be 'rectpack' or 'skyline'")
+
+    for rect_dict in packed_list:
+        rects = np.array(list(rect_dict.values()), dtype=np.float64).reshape(-1, 4)
+        xmax, ymax = np.max(rects[:, :2] + rects[:, 2:], axis=0)
+        efficiency = np.sum(rects[:, 2] * rects[:, 3]) / (xmax * ymax)
+        efficiencies.append(round(float(efficiency), 3))
+    logger.debug(
+        f"pack: {len(component_list)} components in {len(packed_list)} bins "
+        f"in {time.perf_counter() - t0:.2f}s with efficiencies {efficiencies}"
+    )
 
     components_packed_list = []
     index = 0
@@ -11,9 +11,11 @@ from __future__ import annotations
 import hashlib
 import math
 import warnings
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 
+import gdstk
 import numpy as np
+import numpy.typing as npt
 from numpy import mod, pi
 
 from gdsfactory import snap
@@ -826,12 +828,7 @@ def extrude(
         shear_angle_start: an optional angle to shear the starting face by (in degrees).
         shear_angle_end: an optional angle to shear the ending face by (in degrees).
     """
-    from gdsfactory.pdk import (
-        get_active_pdk,
-        get_cross_section,
-        get_grid_size,
-        get_layer,
-    )
+    from gdsfactory.pdk import get_grid_size, get_layer
 
     if cross_section is None and layer is None:
         raise ValueError("CrossSection or layer needed")
@@ -852,60 +849,15 @@ def extrude(
     xsection_points = []
     c = Component()
 
-    x = get_cross_section(cross_section)
-    if x and x.mirror:
-        sections = x.sections or []
-        cladding_offsets = x.cladding_offsets or []
-        sections = [
-            section.copy(update=dict(offset=-section.offset)) for section in sections
-        ]
-        cladding_offsets = [-o for o in cladding_offsets]
-        x = x.copy(
-            offset=-cross_section.offset,
-            sections=sections,
-            cladding_offsets=cladding_offsets,
-        )
-
-    sections = x.sections or []
-    sections = list(sections)
-
+    x, sections = _get_sections(cross_section)
     if isinstance(x, CrossSection):
         snap_to_grid_nm = int(1e3 * (x.snap_to_grid or get_grid_size()))
-        sections += [
-            Section(
-                width=x.width,
-                offset=x.offset,
-                layer=get_layer(x.layer),
-                simplify=x.simplify,
-                port_names=x.port_names,
-                port_types=x.port_types,
-                insets=None,
-            )
-        ]
-
-        if x.cladding_layers and x.cladding_offsets:
-            cladding_simplify = x.cladding_simplify or [None] * len(x.cladding_layers)
-            for layer, cladding_offset, with_simplify in zip(
-                x.cladding_layers, x.cladding_offsets, cladding_simplify
-            ):
-                width = x.width(1) if callable(x.width) else x.width
-                width = max(width) if isinstance(width, Iterable) else width
-                sections += [
-                    Section(
-                        width=width + 2 * cladding_offset,
-                        offset=x.offset,
-                        layer=get_layer(layer),
-                        simplify=with_simplify,
-                    )
-                ]
 
     for section in sections:
         p_sec = p.copy()
         width = section.width
         offset = section.offset
         layer = get_layer(section.layer)
-        port_names = section.port_names
-        port_types = section.port_types
         hidden = section.hidden
 
         if isinstance(width, int | float) and isinstance(offset, int | float):
@@ -1016,68 +968,24 @@ def extrude(
         # Join points together
         points_poly = np.concatenate([points1, points2[::-1, :]])
 
-        layers = layer if hidden else [layer, layer]
         if not hidden and p_sec.length() > 1e-3:
             c.add_polygon(points_poly, layer=layer)
 
-        pdk = get_active_pdk()
-        warn_off_grid_ports = pdk.warn_off_grid_ports
-
-        # Add port_names if they were specified
-        if port_names[0] is not None:
-            port_width = width if np.isscalar(width) else width[0]
-            port_orientation = (p_sec.start_angle + 180) % 360
-            center = points[0]
-            face = [points1[0], points2[0]]
-            face = [_rotated_delta(point, center, port_orientation) for point in face]
-
-            if warn_off_grid_ports:
-                center_snap = snap.snap_to_grid(center, snap_to_grid_nm)
-                if center[0] != center_snap[0] or center[1] != center_snap[1]:
-                    warnings.warn(f"Port center {center} has off-grid ports")
-
-            port1 = c.add_port(
-                port=Port(
-                    name=port_names[0],
-                    layer=get_layer(layers[0]),
-                    port_type=port_types[0],
-                    width=port_width,
-                    orientation=port_orientation,
-                    center=center,
-                    cross_section=x.cross_section1
-                    if hasattr(x, "cross_section1")
-                    else x,
-                    shear_angle=shear_angle_start,
-                )
-            )
-            port1.info["face"] = face
-        if port_names[1] is not None:
-            port_width = width if np.isscalar(width) else width[-1]
-            port_orientation = (p_sec.end_angle) % 360
-            center = points[-1]
-            face = [points1[-1], points2[-1]]
-            face = [_rotated_delta(point, center, port_orientation) for point in face]
-
-            if warn_off_grid_ports:
-                center_snap = snap.snap_to_grid(center, snap_to_grid_nm)
-
-                if center[0] != center_snap[0] or center[1] != center_snap[1]:
-                    warnings.warn(f"Port center {center} has off-grid ports")
-            port2 = c.add_port(
-                port=Port(
-                    name=port_names[1],
-                    layer=get_layer(layers[1]),
-                    port_type=port_types[1],
-                    width=port_width,
-                    center=center,
-                    orientation=port_orientation,
-                    cross_section=x.cross_section2
-                    if hasattr(x, "cross_section2")
-                    else x,
-                    shear_angle=shear_angle_end,
-                )
-            )
-            port2.info["face"] = face
+        _add_section_ports(
+            component=c,
+            cross_section=x,
+            section=section,
+            layer=layer,
+            width=width,
+            points=points,
+            points1=points1,
+            points2=points2,
+            start_angle=p_sec.start_angle,
+            end_angle=p_sec.end_angle,
+            snap_to_grid_nm=snap_to_grid_nm,
+            shear_angle_start=shear_angle_start,
+            shear_angle_end=shear_angle_end,
+        )
 
     c.info["length"] = float(np.round(p.length(), 3))
 
@@ -1106,6 +1014,384 @@ def extrude(
     return c
 
 
+def extrude_many(
+    paths: Sequence[Path | npt.ArrayLike],
+    cross_section: CrossSectionSpec,
+    as_list: bool = True,
+) -> list[Component] | Component:
+    """Returns Components extruding many Paths with the same cross_section.
+
+    Equivalent to `[extrude(p, cross_section) for p in paths]`, but the
+    cross_section is resolved once and the offset curves of all the paths are
+    computed at once. Cross_sections with variable width or offset, insets or
+    vias are extruded one path at a time.
+
+    The Components are named after a hash of the cross_section and the path
+    points, and cached in the CACHE like the ones from @cell, so that
+    extruding the same path again returns the same Component.
+
+    Args:
+        paths: Paths or arrays of points.
+        cross_section: to extrude.
+        as_list: if True returns one Component per path. If False returns a single
+            Component with all the polygons, and the ports of path i suffixed with `_i`.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        paths = [gf.path.straight(length=length) for length in range(10, 20)]
+        components = gf.path.extrude_many(paths, cross_section="strip")
+    """
+    from gdsfactory.cell import CACHE
+
+    paths = [p if isinstance(p, Path) else Path(p) for p in paths]
+    x, sections = _get_sections(cross_section)
+
+    if not paths:
+        return [] if as_list else Component()
+
+    is_vectorized = not x.vias and not any(
+        callable(section.width)
+        or callable(section.offset)
+        or (section.insets and section.insets != (0, 0))
+        for section in sections
+    )
+    names = _get_extrude_many_names(paths, x)
+    if not as_list:
+        names = [f"extrude_many_{_hash_names(names)}"]
+
+    components = {name: CACHE.get(name) for name in names}
+    paths_to_extrude = {
+        name: p for name, p in zip(names, paths) if components[name] is None
+    }
+    if not paths_to_extrude:
+        return [components[name] for name in names] if as_list else components[names[0]]
+
+    if not is_vectorized and as_list:
+        # copies of the extruded cells, to name and cache them as the others
+        extruded = [
+            extrude(p, cross_section=cross_section).copy()
+            for p in paths_to_extrude.values()
+        ]
+        for c in extruded:
+            c.info = dict(c.info)
+    elif not is_vectorized:
+        c = Component()
+        for i, p in enumerate(paths):
+            ref = c << extrude(p, cross_section=cross_section)
+            for port in ref.ports.values():
+                c.add_port(f"{port.name}_{i}", port=port)
+        extruded = [c]
+    elif as_list:
+        extruded = _extrude_many(list(paths_to_extrude.values()), x, sections, True)
+    else:
+        extruded = _extrude_many(paths, x, sections, False)
+
+    for name, c in zip(paths_to_extrude, extruded):
+        c.name = name
+        c.lock()
+        CACHE[name] = c
+        components[name] = c
+
+    return [components[name] for name in names] if as_list else components[names[0]]
+
+
+def _hash_names(names: Iterable[str]) -> str:
+    return hashlib.md5(",".join(names).encode()).hexdigest()[:8]
+
+
+def _get_extrude_many_names(paths: list[Path], x: CrossSection) -> list[str]:
+    """Returns a name for each path extruded with a cross_section."""
+    from gdsfactory.serialization import clean_value_name
+
+    cross_section_hash = hashlib.md5(clean_value_name(x).encode())
+    names = []
+    for p in paths:
+        path_hash = cross_section_hash.copy()
+        path_hash.update(np.ascontiguousarray(p.points, dtype=float).tobytes())
+        path_hash.update(repr((p.start_angle, p.end_angle)).encode())
+        names.append(f"extrude_many_{path_hash.hexdigest()[:8]}")
+    return names
+
+
+def _extrude_many(
+    paths: list[Path],
+    x: CrossSection,
+    sections: list[Section],
+    as_list: bool,
+) -> list[Component]:
+    """Returns the extruded Components, one per path or a single one.
+
+    Args:
+        paths: to extrude.
+        x: cross_section, reflected if mirror.
+        sections: of the cross_section, including the cladding sections.
+        as_list: if True returns one Component per path.
+    """
+    from gdsfactory.pdk import get_grid_size, get_layer
+
+    snap_to_grid_nm = int(1e3 * (x.snap_to_grid or get_grid_size()))
+    points = np.concatenate([p.points for p in paths])
+    sizes = np.array([len(p.points) for p in paths])
+    first = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    last = first + sizes - 1
+
+    # for each point, the angle of the segments before and after it in its path
+    theta = np.arctan2(np.diff(points[:, 1]), np.diff(points[:, 0]))
+    index = np.arange(len(points))
+    index_prev = index - 1
+    index_prev[first] = first
+    index_next = np.minimum(index, len(theta) - 1)
+    index_next[last] = last - 1
+    theta_mid = (np.pi + theta[index_prev] + theta[index_next]) / 2
+    sin_half_int = np.sin((np.pi + theta[index_prev] - theta[index_next]) / 2)
+    normal = np.column_stack([np.cos(theta_mid), np.sin(theta_mid)])
+
+    start_angles = np.array(
+        [np.nan if p.start_angle is None else p.start_angle for p in paths],
+        dtype=float,
+    )
+    end_angles = np.array(
+        [np.nan if p.end_angle is None else p.end_angle for p in paths],
+        dtype=float,
+    )
+
+    def _offset_curve(offset_distance: float) -> np.ndarray:
+        """Vectorized Path._centerpoint_offset_curve for all the paths."""
+        distance = offset_distance / sin_half_int
+        new_points = points - distance[:, None] * normal
+        for ends, angles in ((first, start_angles), (last, end_angles)):
+            has_angle = ~np.isnan(angles)
+            ends = ends[has_angle]
+            angle = np.radians(angles[has_angle])
+            new_points[ends] = points[ends] + distance[ends, None] * np.column_stack(
+                [np.sin(angle), -np.cos(angle)]
+            )
+        return new_points
+
+    length = np.concatenate([[0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))])
+    lengths = length[last] - length[first]
+
+    centers = snap.snap_to_grid(points, snap_to_grid_nm) if x.snap_to_grid else points
+    components = [Component() for _ in paths] if as_list else [Component()]
+
+    for section in sections:
+        width = section.width
+        offset = section.offset
+        layer = get_layer(section.layer)
+        points1 = _offset_curve(offset + width / 2)
+        points2 = _offset_curve(offset - width / 2)
+
+        if x.snap_to_grid and not section.simplify:
+            points1 = snap.snap_to_grid(points1, snap_to_grid_nm)
+            points2 = snap.snap_to_grid(points2, snap_to_grid_nm)
+
+        polygons = [[] for _ in components]
+        for i, (start, stop) in enumerate(zip(first, last + 1)):
+            c = components[i] if as_list else components[0]
+            path_points1 = points1[start:stop]
+            path_points2 = points2[start:stop]
+
+            if section.simplify:
+                path_points1 = _simplify(path_points1, tolerance=section.simplify)
+                path_points2 = _simplify(path_points2, tolerance=section.simplify)
+                if x.snap_to_grid:
+                    path_points1 = snap.snap_to_grid(path_points1, snap_to_grid_nm)
+                    path_points2 = snap.snap_to_grid(path_points2, snap_to_grid_nm)
+
+            if layer is not None and not section.hidden and lengths[i] > 1e-3:
+                polygons[i if as_list else 0].append(
+                    gdstk.Polygon(
+                        np.concatenate([path_points1, path_points2[::-1]]), *layer
+                    )
+                )
+
+            _add_section_ports(
+                component=c,
+                cross_section=x,
+                section=section,
+                layer=layer,
+                width=width,
+                points=centers[start:stop],
+                points1=path_points1,
+                points2=path_points2,
+                start_angle=paths[i].start_angle,
+                end_angle=paths[i].end_angle,
+                snap_to_grid_nm=snap_to_grid_nm,
+                suffix="" if as_list else f"_{i}",
+            )
+
+        for c, component_polygons in zip(components, polygons):
+            if component_polygons:
+                c._add_polygons(*component_polygons)
+
+    for i, c in enumerate(components):
+        if as_list:
+            c.info["length"] = float(np.round(lengths[i], 3))
+        if x.add_bbox:
+            c = x.add_bbox(c)
+        if x.add_pins:
+            c = x.add_pins(c)
+        if x.decorator:
+            c = x.decorator(c) or c
+        components[i] = c
+
+    return components
+
+
+def _get_sections(
+    cross_section: CrossSectionSpec,
+) -> tuple[CrossSection, list[Section]]:
+    """Returns the cross_section (reflected if mirror) and all its Sections.
+
+    The sections include the main section and the cladding sections.
+    """
+    from gdsfactory.pdk import get_cross_section, get_layer
+
+    x = get_cross_section(cross_section)
+    if x and x.mirror:
+        sections = x.sections or []
+        cladding_offsets = x.cladding_offsets or []
+        sections = [
+            section.copy(update=dict(offset=-section.offset)) for section in sections
+        ]
+        cladding_offsets = [-o for o in cladding_offsets]
+        x = x.copy(
+            offset=-x.offset,
+            sections=sections,
+            cladding_offsets=cladding_offsets,
+        )
+
+    sections = x.sections or []
+    sections = list(sections)
+
+    if isinstance(x, CrossSection):
+        sections += [
+            Section(
+                width=x.width,
+                offset=x.offset,
+                layer=get_layer(x.layer),
+                simplify=x.simplify,
+                port_names=x.port_names,
+                port_types=x.port_types,
+                insets=None,
+            )
+        ]
+
+        if x.cladding_layers and x.cladding_offsets:
+            cladding_simplify = x.cladding_simplify or [None] * len(x.cladding_layers)
+            for layer, cladding_offset, with_simplify in zip(
+                x.cladding_layers, x.cladding_offsets, cladding_simplify
+            ):
+                width = x.width(1) if callable(x.width) else x.width
+                width = max(width) if isinstance(width, Iterable) else width
+                sections += [
+                    Section(
+                        width=width + 2 * cladding_offset,
+                        offset=x.offset,
+                        layer=get_layer(layer),
+                        simplify=with_simplify,
+                    )
+                ]
+    return x, sections
+
+
+def _add_section_ports(
+    component: Component,
+    cross_section: CrossSection,
+    section: Section,
+    layer: tuple[int, int],
+    width: float | np.ndarray,
+    points: np.ndarray,
+    points1: np.ndarray,
+    points2: np.ndarray,
+    start_angle: float,
+    end_angle: float,
+    snap_to_grid_nm: int,
+    shear_angle_start: float | None = None,
+    shear_angle_end: float | None = None,
+    suffix: str = "",
+) -> None:
+    """Adds the ports of an extruded section to a component.
+
+    Args:
+        component: to add the ports to.
+        cross_section: extruded.
+        section: extruded.
+        layer: of the section.
+        width: of the section. An array for variable width sections.
+        points: of the path.
+        points1: of the offset curve on one side of the section.
+        points2: of the offset curve on the other side of the section.
+        start_angle: of the path in degrees.
+        end_angle: of the path in degrees.
+        snap_to_grid_nm: grid to check port centers are on grid.
+        shear_angle_start: of the starting face in degrees.
+        shear_angle_end: of the ending face in degrees.
+        suffix: for the port names.
+    """
+    from gdsfactory.pdk import get_active_pdk, get_layer
+
+    x = cross_section
+    port_names = section.port_names
+    port_types = section.port_types
+    layers = layer if section.hidden else [layer, layer]
+    warn_off_grid_ports = get_active_pdk().warn_off_grid_ports
+
+    # Add port_names if they were specified
+    if port_names[0] is not None:
+        port_width = width if np.isscalar(width) else width[0]
+        port_orientation = (start_angle + 180) % 360
+        center = points[0]
+        face = [points1[0], points2[0]]
+        face = [_rotated_delta(point, center, port_orientation) for point in face]
+
+        if warn_off_grid_ports:
+            center_snap = snap.snap_to_grid(center, snap_to_grid_nm)
+            if center[0] != center_snap[0] or center[1] != center_snap[1]:
+                warnings.warn(f"Port center {center} has off-grid ports")
+
+        port1 = component.add_port(
+            port=Port(
+                name=f"{port_names[0]}{suffix}",
+                layer=get_layer(layers[0]),
+                port_type=port_types[0],
+                width=port_width,
+                orientation=port_orientation,
+                center=center,
+                cross_section=x.cross_section1 if hasattr(x, "cross_section1") else x,
+                shear_angle=shear_angle_start,
+            )
+        )
+        port1.info["face"] = face
+    if port_names[1] is not None:
+        port_width = width if np.isscalar(width) else width[-1]
+        port_orientation = (end_angle) % 360
+        center = points[-1]
+        face = [points1[-1], points2[-1]]
+        face = [_rotated_delta(point, center, port_orientation) for point in face]
+
+        if warn_off_grid_ports:
+            center_snap = snap.snap_to_grid(center, snap_to_grid_nm)
+
+            if center[0] != center_snap[0] or center[1] != center_snap[1]:
+                warnings.warn(f"Port center {center} has off-grid ports")
+        port2 = component.add_port(
+            port=Port(
+                name=f"{port_names[1]}{suffix}",
+                layer=get_layer(layers[1]),
+                port_type=port_types[1],
+                width=port_width,
+                center=center,
+                orientation=port_orientation,
+                cross_section=x.cross_section2 if hasattr(x, "cross_section2") else x,
+                shear_angle=shear_angle_end,
+            )
+        )
+        port2.info["face"] = face
+
+
 def _rotated_delta(
     point: np.ndarray, center: np.ndarray, orientation: float
 ) -> np.ndarray:
@@ -16,7 +16,6 @@ from pydantic import BaseModel, Field, validator
 from gdsfactory.config import PATH, logger
 from gdsfactory.events import Event
 from gdsfactory.name import MAX_NAME_LENGTH
-from gdsfactory.read.from_yaml_template import cell_from_yaml_template
 from gdsfactory.show import show
 from gdsfactory.symbols import floorplan_with_block_letters
 from gdsfactory.technology import LayerStack, LayerViews
@@ -136,6 +135,10 @@ class GdsWriteSettings(BaseModel):
         default=4000,
         description="Maximum number of points to allow in a polygon before fracturing.",
     )
+    streaming: bool = Field(
+        default=False,
+        description="If true, writes GDS cells one at a time, dependencies first, without building a library in memory. OASIS files are always written from a library.",
+    )
 
 
 class OasisWriteSettings(BaseModel):
@@ -205,6 +208,18 @@ class CellDecoratorSettings(BaseModel):
     naming_style: Literal["default", "updk"] = Field(
         default="default", description="Naming style for autogenerated component names."
     )
+    persistent_cache: bool = Field(
+        default=False,
+        description="If true, will also store and load cells from a persistent cache on disk.",
+    )
+    persistent_cache_dir: pathlib.Path = Field(
+        default=PATH.cell_cache,
+        description="Directory for the persistent cell cache.",
+    )
+    persistent_cache_max_size: int = Field(
+        default=2**30,
+        description="Maximum size of the persistent cell cache in bytes. Least recently used cells are removed first.",
+    )
 
 
 class Pdk(BaseModel):
@@ -382,6 +397,7 @@ class Pdk(BaseModel):
             cell_name: cell function. To update cells dict.
 
         """
+        from gdsfactory.read.from_yaml_template import cell_from_yaml_template
 
         message = "Updated" if update else "Registered"
 
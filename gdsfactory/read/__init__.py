@@ -6,7 +6,8 @@ from gdsfactory.read.from_np import from_np
 from gdsfactory.read.from_phidl import from_gdstk, from_phidl
 from gdsfactory.read.from_yaml import cell_from_yaml, from_yaml
 from gdsfactory.read.from_yaml_template import cell_from_yaml_template
-from gdsfactory.read.import_gds import import_gds, import_gds_raw
+from gdsfactory.read.gds_info import get_gds_info
+from gdsfactory.read.import_gds import get_gds_index, import_gds, import_gds_raw
 
 __all__ = [
     "from_dphox",
@@ -18,6 +19,8 @@ __all__ = [
     "from_gdstk",
     "cell_from_yaml",
     "cell_from_yaml_template",
+    "get_gds_index",
+    "get_gds_info",
     "import_gds",
     "import_gds_raw",
 ]
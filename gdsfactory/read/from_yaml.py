@@ -596,6 +596,7 @@ def from_yaml(
     label_instance_function: Callable = add_instance_label,
     name: str | None = None,
     prefix: str | None = None,
+    processes: int = 1,
     **kwargs,
 ) -> Component:
     """Returns Component from YAML string or file.
@@ -608,6 +609,13 @@ def from_yaml(
         label_instance_function: to label each instance.
         name: Optional name.
         prefix: name prefix.
+        processes: number of processes building the instance components.
+            If more than 1, the unique instance components are built in
+            parallel into the CACHE (see gf.build_parallel) before placing
+            and routing them. Their polygons come back from the workers
+            through GDS, snapped to its grid (1nm by default), so the result
+            only matches the serial build to that precision: polygons off
+            the grid and labels at instance centers can move by up to 1nm.
         kwargs: function settings for creating YAML PCells.
 
     .. code::
@@ -708,8 +716,12 @@ def from_yaml(
         else:
             conf["settings"][key] = value
 
+    conf = OmegaConf.to_container(conf, resolve=True)
+    if processes > 1 and mode == "layout":
+        _build_instances(conf, processes=processes)
+
     return _from_yaml(
-        conf=OmegaConf.to_container(conf, resolve=True),
+        conf=conf,
         routing_strategy=routing_strategy,
         label_instance_function=label_instance_function,
         prefix=prefix or conf.get("name", "Unnamed"),
@@ -718,6 +730,48 @@ def from_yaml(
     )
 
 
+def _activate_pdk(pdk: str | None):
+    """Activates the PDK module named in the YAML, if any. Returns the active PDK.
+
+    Args:
+        pdk: "generic" or name of a module with a PDK variable.
+    """
+    from gdsfactory.generic_tech import get_generic_pdk
+    from gdsfactory.pdk import get_active_pdk
+
+    if pdk and pdk == "generic":
+        get_generic_pdk().activate()
+
+    elif pdk:
+        module = importlib.import_module(pdk)
+        pdk = module.PDK
+        if pdk is None:
+            raise ValueError(f"'from {pdk} import PDK' failed")
+        pdk.activate()
+
+    return get_active_pdk()
+
+
+def _build_instances(conf: dict[str, Any], processes: int) -> None:
+    """Builds the unique instance components in parallel, into the CACHE.
+
+    Args:
+        conf: resolved YAML dict.
+        processes: number of worker processes.
+    """
+    from gdsfactory.build_parallel import build_parallel
+
+    _activate_pdk(conf.get("pdk"))
+    specs = [
+        {
+            "component": instance_conf["component"],
+            "settings": instance_conf.get("settings", {}),
+        }
+        for instance_conf in conf["instances"].values()
+    ]
+    build_parallel(specs, processes=processes)
+
+
 @cell
 def _from_yaml(
     conf,
@@ -733,11 +787,6 @@ def _from_yaml(
         label_instance_function: to label each instance.
 
     """
-    from gdsfactory.generic_tech import get_generic_pdk
-    from gdsfactory.pdk import get_active_pdk
-
-    GENERIC = get_generic_pdk()
-
     c = Component()
     instances = {}
     routes = {}
@@ -747,20 +796,9 @@ def _from_yaml(
     ports_conf = conf.get("ports")
     connections_conf = conf.get("connections")
     instances_dict = conf["instances"]
-    pdk = conf.get("pdk")
     c.info = conf.get("info", {})
 
-    if pdk and pdk == "generic":
-        GENERIC.activate()
-
-    elif pdk:
-        module = importlib.import_module(pdk)
-        pdk = module.PDK
-        if pdk is None:
-            raise ValueError(f"'from {pdk} import PDK' failed")
-        pdk.activate()
-
-    pdk = get_active_pdk()
+    pdk = _activate_pdk(conf.get("pdk"))
     if mode == "layout":
         component_getter = pdk.get_component
     elif mode == "schematic":
@@ -0,0 +1,219 @@
+"""Read the cells, hierarchy, bounding boxes and layers of GDS files.
+
+The cells are decoded in batches, bottom-up in the hierarchy, without creating
+Components. Each referenced cell is replaced by a stub that only contains its
+bounding box, so a batch never needs the geometry of other cells.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import gdstk
+
+from gdsfactory.read.import_gds import (
+    _GDS_ENDLIB,
+    _get_top_cellnames,
+    _write_gds_index,
+    get_gds_index,
+)
+from gdsfactory.typings import PathType
+
+_GDS_INFO_VERSION = 1
+_BATCH_SIZE = 64 * 2**20  # bytes of GDS cells decoded at once
+
+
+def _record(record_type: int, data_type: int, data: bytes = b"") -> bytes:
+    return struct.pack(">HBB", len(data) + 4, record_type, data_type) + data
+
+
+def _stub_cell(name: str, bbox: list[list[float]] | None, scale: float) -> bytes:
+    """Returns the GDS records of a cell with one rectangle covering bbox."""
+    name_bytes = name.encode()
+    if len(name_bytes) % 2:
+        name_bytes += b"\0"
+    records = [_record(0x05, 0x02, bytes(24)), _record(0x06, 0x06, name_bytes)]
+    if bbox is not None:
+        (xmin, ymin), (xmax, ymax) = bbox
+        xmin, ymin = math.floor(xmin * scale), math.floor(ymin * scale)
+        xmax, ymax = math.ceil(xmax * scale), math.ceil(ymax * scale)
+        xy = [xmin, ymin, xmax, ymin, xmax, ymax, xmin, ymax, xmin, ymin]
+        records += [
+            _record(0x08, 0x00),
+            _record(0x0D, 0x02, struct.pack(">h", 0)),
+            _record(0x0E, 0x02, struct.pack(">h", 0)),
+            _record(0x10, 0x03, struct.pack(">10i", *xy)),
+            _record(0x11, 0x00),
+        ]
+    records.append(_record(0x07, 0x00))
+    return b"".join(records)
+
+
+def _get_levels(cells: dict[str, list]) -> list[list[str]]:
+    """Returns the cell names grouped by hierarchy level, leaf cells first."""
+    levels: dict[str, int] = {}
+    for name in cells:
+        stack = [name]
+        while stack:
+            current = stack[-1]
+            if current in levels:
+                stack.pop()
+                continue
+            pending = [d for d in cells[current][2] if d not in levels]
+            if pending:
+                stack.extend(pending)
+            else:
+                dependencies = cells[current][2]
+                levels[current] = 1 + max((levels[d] for d in dependencies), default=-1)
+                stack.pop()
+
+    grouped: list[list[str]] = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for name, level in levels.items():
+        grouped[level].append(name)
+    return grouped
+
+
+def _get_gds_info(gdspath: Path) -> dict[str, Any]:
+    index = get_gds_index(gdspath)
+    if index.get("info", {}).get("version") == _GDS_INFO_VERSION:
+        return index["info"]
+
+    cells = index["cells"]
+    unit, precision = gdstk.gds_units(str(gdspath))
+    scale = unit / precision
+    bboxes: dict[str, list[list[float]] | None] = {}
+    layers: dict[str, set[tuple[int, int]]] = {}
+
+    with open(gdspath, "rb") as f, tempfile.TemporaryDirectory() as dirpath:
+        header = f.read(index["header_size"])
+        subset_path = Path(dirpath) / gdspath.name
+
+        batches = []
+        for level in _get_levels(cells):
+            batch: list[str] = []
+            batch_size = 0
+            for name in level:
+                batch.append(name)
+                batch_size += cells[name][1]
+                if batch_size > _BATCH_SIZE:
+                    batches.append(batch)
+                    batch, batch_size = [], 0
+            if batch:
+                batches.append(batch)
+
+        for batch in batches:
+            dependencies = {d for name in batch for d in cells[name][2]}
+            with open(subset_path, "wb") as subset:
+                subset.write(header)
+                for name in dependencies:
+                    subset.write(_stub_cell(name, bboxes[name], scale))
+                for name in batch:
+                    offset, size, _ = cells[name]
+                    f.seek(offset)
+                    subset.write(f.read(size))
+                subset.write(_GDS_ENDLIB)
+
+            library = gdstk.read_gds(str(subset_path))
+            for cell in library.cells:
+                if cell.name in dependencies:
+                    continue
+                bbox = cell.bounding_box()
+                bboxes[cell.name] = (
+                    None if bbox is None else [list(bbox[0]), list(bbox[1])]
+                )
+
+                own = gdstk.Library()
+                own.add(cell)
+                layers[cell.name] = own.layers_and_datatypes().union(
+                    *(layers[d] for d in cells[cell.name][2])
+                )
+
+    info = dict(
+        version=_GDS_INFO_VERSION,
+        unit=unit,
+        precision=precision,
+        top_cells=_get_top_cellnames(index),
+        cells={
+            name: dict(
+                dependencies=dependencies,
+                bbox=bboxes[name],
+                layers=[list(layer) for layer in sorted(layers[name])],
+            )
+            for name, (_, _, dependencies) in cells.items()
+        },
+    )
+    index["info"] = info
+    _write_gds_index(gdspath, index)
+    return info
+
+
+def _get_oas_info(gdspath: Path) -> dict[str, Any]:
+    library = gdstk.read_oas(str(gdspath))
+    cells = {}
+    for cell in library.cells:
+        bbox = cell.bounding_box()
+        polygons = cell.get_polygons(depth=None)
+        cells[cell.name] = dict(
+            dependencies=[c.name for c in cell.dependencies(False)],
+            bbox=None if bbox is None else [list(bbox[0]), list(bbox[1])],
+            layers=[
+                list(layer)
+                for layer in sorted({(p.layer, p.datatype) for p in polygons})
+            ],
+        )
+    return dict(
+        version=_GDS_INFO_VERSION,
+        unit=library.unit,
+        precision=library.precision,
+        top_cells=[c.name for c in library.top_level()],
+        cells=cells,
+    )
+
+
+def get_gds_info(gdspath: PathType) -> dict[str, Any]:
+    """Returns the cells, hierarchy, bounding boxes and layers of a GDS file.
+
+    Does not create any Component. For GDS files, the cells are decoded one
+    batch at a time and the result is cached with the index of the file
+    (see get_gds_index), so the next call only reads the index.
+    OASIS files are read in full and not cached.
+
+    Args:
+        gdspath: path of GDS or OASIS file.
+
+    Returns:
+        dict with unit, precision, top_cells and cells. For each cell name,
+        its dependencies (names of the cells it references), bbox
+        [[xmin, ymin], [xmax, ymax]] (None if empty) and layers, both including
+        the referenced cells.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        info = gf.read.get_gds_info("chip.gds")
+        for name in info["top_cells"]:
+            print(name, info["cells"][name]["bbox"])
+    """
+    gdspath = Path(gdspath)
+    if not gdspath.exists():
+        raise FileNotFoundError(f"No file {str(gdspath)!r} found")
+    if gdspath.suffix.lower() == ".gds":
+        return _get_gds_info(gdspath)
+    if gdspath.suffix.lower() == ".oas":
+        return _get_oas_info(gdspath)
+    raise ValueError(f"gdspath.suffix {gdspath.suffix!r} not .gds or .oas")
+
+
+if __name__ == "__main__":
+    import gdsfactory as gf
+
+    c = gf.components.mzi_phase_shifter_top_heater_metal()
+    gdspath = c.write_gds()
+    info = get_gds_info(gdspath)
+    for name, cell in info["cells"].items():
+        print(name, cell["bbox"], cell["layers"])
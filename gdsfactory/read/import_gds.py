@@ -1,17 +1,147 @@
 from __future__ import annotations
 
+import hashlib
+import struct
+import tempfile
 from pathlib import Path
+from typing import Any
 
 import gdstk
+import orjson
 from omegaconf import OmegaConf
 
 from gdsfactory.cell import Settings, cell
 from gdsfactory.component import Component
 from gdsfactory.component_reference import ComponentReference
-from gdsfactory.config import logger
+from gdsfactory.config import PATH, logger
 from gdsfactory.name import get_name_short
 
 
+_GDS_BGNSTR = 0x05
+_GDS_STRNAME = 0x06
+_GDS_ENDLIB = b"\x00\x04\x04\x00"
+_GDS_INDEX_VERSION = 1
+
+
+def _get_gds_index_path(gdspath: Path) -> Path:
+    """Returns the index path in the PATH.gds_index cache dir for a GDS file."""
+    key = hashlib.md5(str(gdspath.resolve()).encode()).hexdigest()[:16]
+    return PATH.gds_index / f"{gdspath.stem}_{key}.json"
+
+
+def get_gds_index(gdspath: str | Path) -> dict[str, Any]:
+    """Returns the index of the cells in a GDS file.
+
+    The index is saved in the PATH.gds_index cache dir, keyed by the GDS file
+    path, and reused while the file size and modification time do not change.
+
+    Args:
+        gdspath: path of GDS file.
+
+    Returns:
+        dict with the header size in bytes, and for each cell name its byte
+        offset, byte size and the names of the cells it references.
+    """
+    gdspath = Path(gdspath)
+    stat = gdspath.stat()
+    index_path = _get_gds_index_path(gdspath)
+    if index_path.exists():
+        index = orjson.loads(index_path.read_bytes())
+        if (
+            index.get("version") == _GDS_INDEX_VERSION
+            and index.get("size") == stat.st_size
+            and index.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return index
+
+    # raw cells are not decoded, and their sizes let us jump from cell to cell
+    raw_cells = gdstk.read_rawcells(str(gdspath))
+    cells = {}
+    header_size = None
+    with open(gdspath, "rb") as f:
+        offset = 0
+        while True:
+            f.seek(offset)
+            record = f.read(4)
+            if len(record) < 4:
+                break
+            record_size, record_type = struct.unpack(">HB", record[:3])
+            if record_type != _GDS_BGNSTR:
+                if header_size is not None or record_size == 0:
+                    break
+                offset += record_size
+                continue
+            if header_size is None:
+                header_size = offset
+            f.seek(offset + record_size)
+            name_record = f.read(4)
+            name_size, name_type = struct.unpack(">HB", name_record[:3])
+            if name_type != _GDS_STRNAME:
+                raise ValueError(f"No cell name at byte {offset} of {gdspath}")
+            name = f.read(name_size - 4).rstrip(b"\0").decode()
+            raw_cell = raw_cells[name]
+            cells[name] = [
+                offset,
+                raw_cell.size,
+                [c.name for c in raw_cell.dependencies(False)],
+            ]
+            offset += raw_cell.size
+
+    if len(cells) != len(raw_cells):
+        raise ValueError(f"Could not index the cells of {gdspath}")
+
+    index = dict(
+        version=_GDS_INDEX_VERSION,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        header_size=header_size or 0,
+        cells=cells,
+    )
+    _write_gds_index(gdspath, index)
+    return index
+
+
+def _write_gds_index(gdspath: Path, index: dict[str, Any]) -> None:
+    index_path = _get_gds_index_path(gdspath)
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_bytes(orjson.dumps(index))
+    except OSError:
+        logger.warning(f"Could not write GDS index {index_path}")
+
+
+def _get_top_cellnames(index: dict[str, Any]) -> list[str]:
+    cells = index["cells"]
+    referenced = {
+        name for _, _, dependencies in cells.values() for name in dependencies
+    }
+    return [name for name in cells if name not in referenced]
+
+
+def _read_gds_cell(
+    gdspath: Path, cellname: str, index: dict[str, Any]
+) -> gdstk.Library:
+    """Returns a library with only cellname and its dependencies from a GDS file."""
+    cells = index["cells"]
+    cellnames = set()
+    stack = [cellname]
+    while stack:
+        name = stack.pop()
+        if name not in cellnames:
+            cellnames.add(name)
+            stack.extend(cells[name][2])
+
+    with open(gdspath, "rb") as f, tempfile.TemporaryDirectory() as dirpath:
+        subset_path = Path(dirpath) / gdspath.name
+        with open(subset_path, "wb") as subset:
+            subset.write(f.read(index["header_size"]))
+            for offset, size, _ in sorted(cells[name] for name in cellnames):
+                f.seek(offset)
+                subset.write(f.read(size))
+            subset.write(_GDS_ENDLIB)
+        return gdstk.read_gds(str(subset_path))
+
+
 @cell
 def import_gds(
     gdspath: str | Path,
@@ -19,6 +149,7 @@ def import_gds(
     gdsdir: str | Path | None = None,
     read_metadata: bool = False,
     hashed_name: bool = True,
+    lazy: bool = False,
     **kwargs,
 ) -> Component:
     """Returns a Component from a GDS file.
@@ -31,6 +162,12 @@ def import_gds(
         gdsdir: optional GDS directory.
         read_metadata: loads metadata (ports, settings) if it exists in YAML format.
         hashed_name: appends a hash to a shortened component name.
+        lazy: only reads cellname and its dependencies from a GDS file, using
+            an index of the cells cached in PATH.gds_index (see get_gds_index).
+            OASIS files are always read in full.
+            lazy is part of the cell name, so importing the same cell lazily and
+            eagerly caches two Components with the same GDS cell name.
+            Use the same lazy value for all the imports of a GDS file.
         kwargs: extra to add to component.info (polarization, wavelength ...).
     """
     gdspath = Path(gdsdir) / Path(gdspath) if gdsdir else Path(gdspath)
@@ -39,7 +176,16 @@ def import_gds(
 
     metadata_filepath = gdspath.with_suffix(".yml")
 
-    if gdspath.suffix.lower() == ".gds":
+    if gdspath.suffix.lower() == ".gds" and lazy:
+        index = get_gds_index(gdspath)
+        top_cellnames = _get_top_cellnames(index)
+        if cellname is None and len(top_cellnames) == 1:
+            cellname = top_cellnames[0]
+        if cellname in index["cells"]:
+            gdsii_lib = _read_gds_cell(gdspath, cellname, index)
+        else:
+            gdsii_lib = gdstk.read_gds(str(gdspath))
+    elif gdspath.suffix.lower() == ".gds":
         gdsii_lib = gdstk.read_gds(str(gdspath))
     elif gdspath.suffix.lower() == ".oas":
         gdsii_lib = gdstk.read_oas(str(gdspath))
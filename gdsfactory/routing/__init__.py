@@ -39,7 +39,7 @@ from gdsfactory.routing.get_route import (
     get_route_from_waypoints_electrical_m2,
     get_route_from_waypoints_electrical_multilayer,
 )
-from gdsfactory.routing.get_route_astar import get_route_astar
+from gdsfactory.routing.get_route_astar import get_route_astar, get_routes_astar
 from gdsfactory.routing.get_route_from_steps import (
     get_route_from_steps,
     get_route_from_steps_electrical,
@@ -74,6 +74,7 @@ __all__ = [
     "get_bundle_from_waypoints_electrical_multilayer",
     "get_route",
     "get_route_astar",
+    "get_routes_astar",
     "get_route_electrical",
     "get_route_electrical_m2",
     "get_route_electrical_multilayer",
@@ -29,7 +29,10 @@ from gdsfactory.routing.get_bundle_from_waypoints import get_bundle_from_waypoin
 from gdsfactory.routing.get_bundle_sbend import get_bundle_sbend
 from gdsfactory.routing.get_bundle_u import get_bundle_udirect, get_bundle_uindirect
 from gdsfactory.routing.get_route import get_route, get_route_from_waypoints
-from gdsfactory.routing.manhattan import generate_manhattan_waypoints
+from gdsfactory.routing.manhattan import (
+    generate_manhattan_waypoints,
+    generate_manhattan_waypoints_batch,
+)
 from gdsfactory.routing.path_length_matching import path_length_matched_points
 from gdsfactory.routing.sort_ports import get_port_x, get_port_y
 from gdsfactory.routing.sort_ports import sort_ports as sort_ports_function
@@ -56,6 +59,7 @@ def get_bundle(
     path_length_match_loops: int | None = None,
     path_length_match_extra_length: float = 0.0,
     path_length_match_modify_segment_i: int = -2,
+    merge_straights: bool = False,
     **kwargs,
 ) -> list[Route]:
     """Returns list of routes to connect two groups of ports.
@@ -81,6 +85,8 @@ def get_bundle(
             to path length matching loops (requires path_length_match_loops != None).
         path_length_match_modify_segment_i: Index of straight segment to add path
             length matching loops to (requires path_length_match_loops != None).
+        merge_straights: extrudes the straight sections of each route into one cell
+            instead of one straight cell per length.
 
     Keyword Args:
         width: main layer waveguide width (um).
@@ -198,6 +204,11 @@ def get_bundle(
     if start_straight_length is not None:
         params["start_straight_length"] = start_straight_length
     params.update(**kwargs)
+    route_params = (
+        dict(route_filter=partial(get_route_from_waypoints, merge_straights=True))
+        if merge_straights
+        else {}
+    )
 
     start_angle = ports1[0].orientation
     end_angle = ports2[0].orientation
@@ -218,7 +229,7 @@ def get_bundle(
         return get_bundle_from_waypoints(**params)
 
     if start_axis != end_axis:
-        return get_bundle_corner(**params)
+        return get_bundle_corner(**params | route_params)
     if (
         start_angle == 0
         and end_angle == 180
@@ -236,11 +247,11 @@ def get_bundle(
         # print("get_bundle_same_axis")
         if with_sbend:
             return get_bundle_sbend(ports1, ports2, sort_ports=sort_ports, **kwargs)
-        return get_bundle_same_axis(**params)
+        return get_bundle_same_axis(merge_straights=merge_straights, **params)
 
     elif start_angle == end_angle:
         # print('get_bundle_udirect')
-        return get_bundle_udirect(**params)
+        return get_bundle_udirect(**params | route_params)
 
     elif end_angle == (start_angle + 180) % 360:
         # print("get_bundle_uindirect")
@@ -248,7 +259,8 @@ def get_bundle(
             k: v for k, v in params.items() if k not in path_length_match_params
         }
         return get_bundle_uindirect(
-            extension_length=extension_length, **params_without_pathlength
+            extension_length=extension_length,
+            **params_without_pathlength | route_params,
         )
     else:
         raise NotImplementedError("This should never happen")
@@ -283,6 +295,7 @@ def get_bundle_same_axis(
     path_length_match_extra_length: float = 0.0,
     path_length_match_modify_segment_i: int = -2,
     cross_section: CrossSectionSpec | MultiCrossSectionAngleSpec = "strip",
+    merge_straights: bool = False,
     **kwargs,
 ) -> list[Route]:
     r"""Semi auto-routing for two lists of ports.
@@ -302,6 +315,8 @@ def get_bundle_same_axis(
         path_length_match_modify_segment_i: Index of straight segment to add path
             length matching loops to (requires path_length_match_loops != None).
         cross_section: CrossSection or function that returns a cross_section.
+        merge_straights: extrudes the straight sections of each route into one cell
+            instead of one straight cell per length.
         kwargs: cross_section settings.
 
 
@@ -376,6 +391,7 @@ def get_bundle_same_axis(
             route,
             bend=bend,
             cross_section=cross_section,
+            merge_straights=merge_straights,
             **kwargs,
         )
         for route in routes
@@ -491,19 +507,15 @@ def _get_bundle_waypoints(
 
     end_straights += [max(x - L, 0) + Le for x in end_straights_in_group]
 
-    # Second pass - route the ports pairwise
-    N = len(ports1)
-    return [
-        generate_manhattan_waypoints(
-            ports1[i],
-            ports2[i],
-            start_straight_length=start_straight_length,
-            end_straight_length=end_straights[i],
-            cross_section=cross_section,
-            **kwargs,
-        )
-        for i in range(N)
-    ]
+    # Second pass - route all the ports at once
+    return generate_manhattan_waypoints_batch(
+        ports1,
+        ports2,
+        start_straight_length=start_straight_length,
+        end_straight_length=end_straights,
+        cross_section=cross_section,
+        **kwargs,
+    )
 
 
 def compute_ports_max_displacement(ports1: list[Port], ports2: list[Port]) -> float:
@@ -7,7 +7,10 @@ import numpy as np
 from gdsfactory.component_layout import _rotate_points
 from gdsfactory.port import Port
 from gdsfactory.routing.get_route import get_route_from_waypoints
-from gdsfactory.routing.manhattan import generate_manhattan_waypoints
+from gdsfactory.routing.manhattan import (
+    generate_manhattan_waypoints,
+    generate_manhattan_waypoints_batch,
+)
 from gdsfactory.routing.path_length_matching import path_length_matched_points
 from gdsfactory.typings import Route
 
@@ -247,6 +250,16 @@ def _get_bundle_corner_waypoints(
 
     kwargs.pop("start_straight_length", "")
     kwargs.pop("end_straight_length", "")
+    if routing_func is generate_manhattan_waypoints:
+        lengths = [i * separation for i in range(nb_ports)]
+        return generate_manhattan_waypoints_batch(
+            ports1,
+            ports2,
+            start_straight_length=lengths,
+            end_straight_length=lengths,
+            **kwargs,
+        )
+
     for i, (p1, p2) in enumerate(zip(ports1, ports2)):
         conn = routing_func(
             p1,
@@ -13,6 +13,7 @@ from gdsfactory.port import Port
 from gdsfactory.routing.get_route import get_route_from_waypoints
 from gdsfactory.routing.manhattan import (
     generate_manhattan_waypoints,
+    generate_manhattan_waypoints_batch,
     remove_flat_angles,
 )
 from gdsfactory.routing.path_length_matching import path_length_matched_points
@@ -221,6 +222,18 @@ def _get_bundle_udirect_waypoints(
     start_straight_length += start_straight_offset
     end_straight_length += end_straight_offset
 
+    if routing_func is generate_manhattan_waypoints:
+        lengths = [i * separation for i in range(len(group1))]
+        lengths += [i * separation for i in range(len(group2))]
+        return generate_manhattan_waypoints_batch(
+            group1 + group2,
+            end_group1 + end_group2,
+            start_straight_length=np.add(start_straight_length, lengths),
+            end_straight_length=np.add(end_straight_length, lengths),
+            bend=bend,
+            **routing_func_params,
+        )
+
     connections = []
     straight_len_end = end_straight_length
     straight_len_start = start_straight_length
@@ -71,6 +71,7 @@ def get_route(
     end_straight_length: float | None = None,
     min_straight_length: float | None = None,
     cross_section: CrossSectionSpec | MultiCrossSectionAngleSpec = "strip",
+    merge_straights: bool = False,
     **kwargs,
 ) -> Route:
     """Returns a Manhattan Route between 2 ports.
@@ -89,6 +90,8 @@ def get_route(
         end_straight_length: length of end straight.
         min_straight_length: min length of straight for any intermediate segment.
         cross_section: spec.
+        merge_straights: extrudes the straight sections of each route into one cell
+            instead of one straight cell per length.
         kwargs: cross_section settings.
 
 
@@ -142,6 +145,7 @@ def get_route(
         bend=bend90,
         with_sbend=with_sbend,
         cross_section=cross_section,
+        merge_straights=merge_straights,
         **kwargs,
     )
 
@@ -173,6 +177,7 @@ def get_route_from_waypoints(
     straight: Callable = straight_function,
     taper: Callable | None = taper_function,
     cross_section: CrossSectionSpec = "strip",
+    merge_straights: bool = False,
     **kwargs,
 ) -> Route:
     """Returns a route formed by the given waypoints with bends instead of \
@@ -188,6 +193,8 @@ def get_route_from_waypoints(
         straight: function that returns straight waveguides.
         taper: function that returns tapers.
         cross_section: spec.
+        merge_straights: extrudes the straight sections of each route into one cell
+            instead of one straight cell per length.
         kwargs: cross_section settings.
 
     .. plot::
@@ -260,6 +267,7 @@ def get_route_from_waypoints(
         straight=straight,
         taper=taper,
         cross_section=cross_section,
+        merge_straights=merge_straights,
         **kwargs,
     )
 
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import math
+from typing import Literal
 from warnings import warn
 
 import numpy as np
@@ -12,16 +16,8 @@ from gdsfactory.routing import get_route_from_waypoints
 from gdsfactory.routing.manhattan import route_manhattan
 from gdsfactory.typings import CrossSectionSpec, LayerSpec, Route
 
-
-class Node:
-    def __init__(self, parent=None, position: tuple = ()) -> None:
-        """Initializes a node. A node is a point on the grid."""
-        self.parent = parent  # parent node of current node
-        self.position = position  # position of current node
-
-        self.g = 0  # distance between current node and start node
-        self.h = 0  # distance between current node and end node
-        self.f = self.g + self.h  # cost of the node (sum of g and h)
+# grid steps for each direction, direction = orientation / 90
+_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
 
 
 def get_route_astar(
@@ -32,6 +28,8 @@ def get_route_astar(
     avoid_layers: list[LayerSpec] | None = None,
     distance: float = 1,
     cross_section: CrossSectionSpec = "strip",
+    bend_penalty: float = 0,
+    jump_point_search: bool = False,
     **kwargs,
 ) -> Route:
     """A* routing function. Finds a route between two ports avoiding obstacles.
@@ -47,12 +45,185 @@ def get_route_astar(
         avoid_layers: list of layers to avoid.
         distance: distance from obstacles in um.
         cross_section: spec.
+        bend_penalty: extra cost of each bend in um.
+            0 finds the shortest route, higher values route with fewer bends.
+        jump_point_search: True jumps along straight lines to the next grid row or
+            column where the obstacles change. Faster for large open areas.
         kwargs: cross_section settings.
     """
+    return get_routes_astar(
+        component=component,
+        ports1=[port1],
+        ports2=[port2],
+        resolution=resolution,
+        avoid_layers=avoid_layers,
+        distance=distance,
+        cross_section=cross_section,
+        bend_penalty=bend_penalty,
+        jump_point_search=jump_point_search,
+        **kwargs,
+    )[0]
+
+
+def get_routes_astar(
+    component: Component,
+    ports1: list[Port],
+    ports2: list[Port],
+    resolution: float = 1,
+    avoid_layers: list[LayerSpec] | None = None,
+    distance: float = 1,
+    cross_section: CrossSectionSpec = "strip",
+    bend_penalty: float = 0,
+    jump_point_search: bool = False,
+    net_order: Literal["shortest", "longest"] | None = "shortest",
+    max_reroutes: int = 3,
+    **kwargs,
+) -> list[Route]:
+    """A* routing of many nets. Finds routes between pairs of ports avoiding obstacles.
+
+    Builds the obstacle grid once and routes the nets one after the other,
+    each route becomes an obstacle for the next ones.
+    When a net fails, the routes that block its path are ripped up and rerouted
+    after it.
+
+    Args:
+        component: Component the routes, and ports belong to.
+        ports1: list of start ports.
+        ports2: list of end ports.
+        resolution: discretization resolution in um.
+        avoid_layers: list of layers to avoid.
+        distance: distance from obstacles and other routes in um.
+        cross_section: spec.
+        bend_penalty: extra cost of each bend in um.
+            0 finds the shortest route, higher values route with fewer bends.
+        jump_point_search: True jumps along straight lines to the next grid row or
+            column where the obstacles change. Faster for large open areas.
+        net_order: order to route the nets.
+            shortest: shortest distance between ports first.
+            longest: longest distance between ports first.
+            None: in the order of the ports.
+        max_reroutes: maximum number of times each net can rip up other routes.
+        kwargs: cross_section settings.
+
+    Returns:
+        list of routes, in the order of the ports.
+    """
+    if len(ports1) != len(ports2):
+        raise ValueError(f"len(ports1) = {len(ports1)} != len(ports2) = {len(ports2)}")
+
+    net_orders = {
+        "shortest": False,
+        "longest": True,
+    }
+    if net_order is not None and net_order not in net_orders:
+        raise ValueError(f"net_order = {net_order!r} not in {list(net_orders)}")
+
     cross_section = gf.get_cross_section(cross_section, **kwargs)
+    margin = cross_section.width / 2 + distance
 
     grid, x, y = _generate_grid(component, resolution, avoid_layers, distance)
+    # number of routes that cover each grid point
+    route_grid = np.zeros(grid.shape, dtype=np.int16)
+
+    nets = [_get_net(port1, port2, resolution) for port1, port2 in zip(ports1, ports2)]
+
+    # reserve the access to the ports of each net
+    pins = [
+        [[port1.center, start], [end, port2.center]]
+        for port1, port2, (start, end, _, _) in zip(ports1, ports2, nets)
+    ]
+    pin_grid = np.zeros(grid.shape, dtype=np.int16)
+    for pin_points in itertools.chain.from_iterable(pins):
+        _mark_path(pin_grid, x, y, pin_points, margin, 1)
+
+    def _route_net(index: int, with_routes: bool = True) -> list | None:
+        for pin_points in pins[index]:
+            _mark_path(pin_grid, x, y, pin_points, margin, -1)
+        obstacles = grid | (pin_grid > 0)
+        if with_routes:
+            obstacles |= route_grid > 0
+        for pin_points in pins[index]:
+            _mark_path(pin_grid, x, y, pin_points, margin, 1)
+
+        start, end, start_direction, end_direction = nets[index]
+        points = _astar(
+            grid=obstacles,
+            x=x,
+            y=y,
+            start=start,
+            end=end,
+            resolution=resolution,
+            start_direction=start_direction,
+            end_direction=end_direction,
+            bend_penalty=bend_penalty,
+            jump_point_search=jump_point_search,
+        )
+        if points is None:
+            return None
+        # add the start and end ports
+        port1, port2 = ports1[index], ports2[index]
+        return _remove_collinear_points([port1.center, *points, port2.center])
+
+    indices = list(range(len(nets)))
+    if net_order is not None:
+        indices.sort(
+            key=lambda i: np.abs(ports2[i].center - ports1[i].center).sum(),
+            reverse=net_orders[net_order],
+        )
+
+    routed = {}
+    reroutes = dict.fromkeys(indices, 0)
+    while indices:
+        index = indices.pop(0)
+        points = _route_net(index)
+        if points is not None:
+            routed[index] = points
+            _mark_path(route_grid, x, y, points, margin, 1)
+            continue
+
+        if reroutes[index] >= max_reroutes:
+            continue
+        reroutes[index] += 1
 
+        # rip up the routes that block the path without other routes
+        points = _route_net(index, with_routes=False)
+        if points is None:
+            continue
+        path_grid = np.zeros(grid.shape, dtype=np.int16)
+        _mark_path(path_grid, x, y, points, margin, 1)
+        blocking = [
+            i
+            for i, route_points in routed.items()
+            if _is_path_blocked(path_grid, x, y, route_points, margin)
+        ]
+        for i in blocking:
+            _mark_path(route_grid, x, y, routed.pop(i), margin, -1)
+        indices = [index, *indices, *blocking]
+
+    routes = []
+    for index, (port1, port2) in enumerate(zip(ports1, ports2)):
+        if index not in routed:
+            warn(
+                "A* algorithm failed, resorting to Manhattan routing. Watch for overlaps."
+            )
+            routes.append(route_manhattan(port1, port2, cross_section=cross_section))
+        elif cross_section.radius:
+            routes.append(
+                get_route_from_waypoints(routed[index], cross_section=cross_section)
+            )
+        else:
+            routes.append(
+                get_route_from_waypoints(
+                    routed[index], cross_section=cross_section, bend=wire_corner
+                )
+            )
+    return routes
+
+
+def _get_net(
+    port1: Port, port2: Port, resolution: float
+) -> tuple[tuple[float, float], tuple[float, float], int | None, int | None]:
+    """Returns path start and end points and directions for a pair of ports."""
     # Tell the algorithm which start and end directions to follow based on port orientation
     input_orientation = {
         0.0: (resolution, 0),
@@ -70,111 +241,251 @@ def get_route_astar(
         None: (0, 0),
     }[port2.orientation]
 
-    # Instantiate nodes
-    start_node = Node(
-        None,
-        (
-            round(port1.x + input_orientation[0]),
-            round(port1.y + input_orientation[1]),
-        ),
+    start = (
+        round(port1.x + input_orientation[0], 3),
+        round(port1.y + input_orientation[1], 3),
     )
-    start_node.g = start_node.h = start_node.f = 0
-
-    end_node = Node(
-        None,
-        (
-            round(port2.x + output_orientation[0]),
-            round(port2.y + output_orientation[1]),
-        ),
+    end = (
+        round(port2.x + output_orientation[0], 3),
+        round(port2.y + output_orientation[1], 3),
     )
-    end_node.g = end_node.h = end_node.f = 0
-
-    # Add the start node
-    open_list = [start_node]
-    closed = []
-
-    while open_list:
-        # Current node
-        current_index = 0
-        for index in range(len(open_list)):
-            if open_list[index].f < open_list[current_index].f:
-                current_index = index
-
-        # Pop current off open_list list, add to closed list
-        current_node = open_list[current_index]
-        closed.append(open_list.pop(current_index))
-
-        # Reached end port
-        if (
-            current_node.position[0] == end_node.position[0]
-            and current_node.position[1] == end_node.position[1]
-        ):
-            points = []
-            current = current_node
-
-            # trace back path from end node to start node
-            while current is not None:
-                points.append(current.position)
-                current = current.parent
-            # reverse to get true path
-            points = points[::-1]
-
-            # add the start and end ports
-            points.insert(0, port1.center)
-            points.append(port2.center)
-
-            # return route from points
-            if cross_section.radius:
-                return get_route_from_waypoints(points, cross_section=cross_section)
-            else:
-                return get_route_from_waypoints(
-                    points, cross_section=cross_section, bend=wire_corner
-                )
-
-        # Generate neighbours
-        neighbours = _generate_neighbours(
-            grid=grid,
-            x=x,
-            y=y,
-            current_node=current_node,
-            resolution=resolution,
+    # the route leaves port1 along its orientation and enters port2 against it
+    start_direction = (
+        None if port1.orientation is None else round(port1.orientation / 90) % 4
+    )
+    end_direction = (
+        None if port2.orientation is None else (round(port2.orientation / 90) + 2) % 4
+    )
+    return start, end, start_direction, end_direction
+
+
+def _get_path_boxes(
+    x: np.ndarray, y: np.ndarray, points: np.ndarray, margin: float
+) -> list[tuple[int, int, int, int]]:
+    """Returns grid index ranges covered by each path segment grown by margin."""
+    points = np.asarray(points)
+    xmin = np.minimum(points[:-1, 0], points[1:, 0]) - margin
+    xmax = np.maximum(points[:-1, 0], points[1:, 0]) + margin
+    ymin = np.minimum(points[:-1, 1], points[1:, 1]) - margin
+    ymax = np.maximum(points[:-1, 1], points[1:, 1]) + margin
+    return list(
+        zip(
+            np.searchsorted(x, xmin, side="left"),
+            np.searchsorted(x, xmax, side="right"),
+            np.searchsorted(y, ymin, side="left"),
+            np.searchsorted(y, ymax, side="right"),
         )
+    )
 
-        # Loop through neighbours
-        for neighbour in neighbours:
-            for closed_neighbour in closed:
-                if neighbour == closed_neighbour:
-                    continue
 
-            # Compute f, g, h
-            neighbour.g = current_node.g + resolution
-            # print(neighbour.g)
-            neighbour.h = np.sqrt(
-                (neighbour.position[0] - end_node.position[0]) ** 2
-            ) + ((neighbour.position[1] - end_node.position[1]) ** 2)
-            neighbour.f = neighbour.g + neighbour.h
-
-            if current_node.parent is not None and (
-                neighbour.position[0] - current_node.parent.position[0],
-                neighbour.position[1] - current_node.parent.position[1],
-            ) in [
-                (resolution, -resolution),
-                (-resolution, resolution),
-                (resolution, resolution),
-                (-resolution, -resolution),
-            ]:
-                neighbour.f *= 1.1  # penalize for turns
-
-            # neighbour is already in the open_list
-            for open_list_node in open_list:
-                if neighbour == open_list_node and neighbour.g > open_list_node.g:
-                    continue
+def _mark_path(
+    grid: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    points: np.ndarray,
+    margin: float,
+    value: int,
+) -> None:
+    """Adds value to the grid points covered by the path."""
+    for i0, i1, j0, j1 in _get_path_boxes(x, y, points, margin):
+        grid[i0:i1, j0:j1] += value
+
+
+def _is_path_blocked(
+    grid: np.ndarray, x: np.ndarray, y: np.ndarray, points: np.ndarray, margin: float
+) -> bool:
+    """Returns True if the path covers any nonzero grid point."""
+    return any(
+        grid[i0:i1, j0:j1].any()
+        for i0, i1, j0, j1 in _get_path_boxes(x, y, points, margin)
+    )
 
-            # Add the neighbour to open_list
-            open_list.append(neighbour)
 
-    warn("A* algorithm failed, resorting to Manhattan routing. Watch for overlaps.")
-    return route_manhattan(port1, port2, cross_section=cross_section)
+def _astar(
+    grid: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    start: tuple[float, float],
+    end: tuple[float, float],
+    resolution: float,
+    start_direction: int | None = None,
+    end_direction: int | None = None,
+    bend_penalty: float = 0,
+    jump_point_search: bool = False,
+) -> list[tuple[float, float]] | None:
+    """Returns the points of the cheapest path from start to end, None if there is none.
+
+    Searches on a lattice of points spaced by resolution from start.
+    The occupancy of each lattice point is the one of the closest grid point,
+    points outside the grid are obstacles.
+    Each state is a lattice point and the direction the path arrives with,
+    so that bends can be penalized.
+
+    Args:
+        grid: occupancy grid from _generate_grid, 1 for obstacles.
+        x: grid x coordinates.
+        y: grid y coordinates.
+        start: path start point.
+        end: path end point. Needs to be on the lattice.
+        resolution: lattice spacing in um.
+        start_direction: path direction at start (0: east, 1: north, 2: west, 3: south).
+        end_direction: path direction at end.
+        bend_penalty: cost of each bend in um.
+        jump_point_search: only expand the rows and columns where obstacles change.
+    """
+    end_offset = (np.array(end) - np.array(start)) / resolution
+    if not np.allclose(end_offset, np.round(end_offset), atol=1e-6):
+        return None
+    end_offset = np.round(end_offset).astype(int)
+
+    def _lattice(coordinates: np.ndarray, origin: float, offset: int):
+        """Returns lattice indices range, grid indices and in grid mask."""
+        imin = min(math.ceil((coordinates.min() - origin) / resolution - 1e-6), 0)
+        imax = max(math.floor((coordinates.max() - origin) / resolution + 1e-6), 0)
+        imin, imax = min(imin, offset), max(imax, offset)
+        points = origin + np.arange(imin, imax + 1) * resolution
+        step = (
+            (coordinates[-1] - coordinates[0]) / (len(coordinates) - 1)
+            if len(coordinates) > 1
+            else 1
+        )
+        indices = np.rint((points - coordinates[0]) / step).astype(int)
+        indices = np.clip(indices, 0, len(coordinates) - 1)
+        inside = (points >= coordinates.min() - 1e-6) & (
+            points <= coordinates.max() + 1e-6
+        )
+        return imin, points, indices, inside
+
+    imin, xs, xindices, xinside = _lattice(x, start[0], end_offset[0])
+    jmin, ys, yindices, yinside = _lattice(y, start[1], end_offset[1])
+    nx, ny = len(xs), len(ys)
+
+    blocked = grid[np.ix_(xindices, yindices)] != 0
+    blocked |= ~xinside[:, None] | ~yinside[None, :]
+    si, sj = -imin, -jmin
+    ei, ej = end_offset[0] - imin, end_offset[1] - jmin
+    blocked[si, sj] = blocked[ei, ej] = False
+
+    # visited states: lattice point and arriving direction
+    closed = np.zeros((nx, ny, 4), dtype=np.int8)
+    costs = {}
+    parents = {}
+    # among equal cost states expand the most recent first
+    counter = itertools.count(0, -1)
+    heap = []
+
+    def _heuristic(i: int, j: int, direction: int) -> float:
+        """Returns Manhattan distance plus the penalty of the bends still needed."""
+        di, dj = ei - i, ej - j
+        step_i, step_j = _DIRECTIONS[direction]
+        bends = 0
+        if di and dj:
+            bends = 1
+        elif di or dj:
+            bends = int(di * step_i + dj * step_j <= 0)
+        return (abs(di) + abs(dj)) * resolution + bends * bend_penalty
+
+    def _is_free(i: int, j: int) -> bool:
+        return 0 <= i < nx and 0 <= j < ny and not blocked[i, j]
+
+    if jump_point_search:
+        # rows and columns where the obstacles change. Shifting a segment between
+        # them keeps the path free without making it longer or adding bends,
+        # so the path only needs to turn on them.
+        stops = []
+        for axis, size, start_index, end_index in ((0, nx, si, ei), (1, ny, sj, ej)):
+            changes = np.any(np.diff(blocked, axis=axis) != 0, axis=1 - axis).reshape(
+                -1
+            )
+            is_stop = np.zeros(size, dtype=bool)
+            is_stop[1:] |= changes
+            is_stop[:-1] |= changes
+            is_stop[[0, -1, start_index, end_index]] = True
+            indices = np.flatnonzero(is_stop)
+            # next stop in the negative and positive directions
+            previous_stop = np.full(size, -1)
+            previous_stop[indices[1:]] = indices[:-1]
+            next_stop = np.full(size, -1)
+            next_stop[indices[:-1]] = indices[1:]
+            stops.append({-1: previous_stop.tolist(), 1: next_stop.tolist()})
+
+    def _jump(i: int, j: int, di: int, dj: int) -> tuple[int, int, int] | None:
+        """Returns the next row or column where the path can turn and the steps."""
+        if not _is_free(i + di, j + dj):
+            return None
+        axis_stops, index, step = (stops[0], i, di) if di else (stops[1], j, dj)
+        new_index = axis_stops[step][index]
+        steps = abs(new_index - index)
+        return (new_index, j, steps) if di else (i, new_index, steps)
+
+    directions = range(4) if start_direction is None else [start_direction]
+    for direction in directions:
+        state = (si, sj, direction)
+        costs[state] = 0
+        h = _heuristic(si, sj, direction)
+        heapq.heappush(heap, (h, h, next(counter), state))
+
+    while heap:
+        _, _, _, state = heapq.heappop(heap)
+        i, j, direction = state
+        if closed[state]:
+            continue
+        closed[state] = 1
+
+        if i == ei and j == ej:
+            points = []
+            while state is not None:
+                points.append((float(xs[state[0]]), float(ys[state[1]])))
+                state = parents.get(state)
+            return points[::-1]
+
+        cost = costs[state]
+        for new_direction, (di, dj) in enumerate(_DIRECTIONS):
+            if new_direction == (direction + 2) % 4:
+                continue
+            if jump_point_search:
+                jump = _jump(i, j, di, dj)
+                if jump is None:
+                    continue
+                ni, nj, steps = jump
+            elif _is_free(i + di, j + dj):
+                ni, nj, steps = i + di, j + dj, 1
+            else:
+                continue
+
+            new_state = (ni, nj, new_direction)
+            if closed[new_state]:
+                continue
+
+            new_cost = cost + steps * resolution
+            if new_direction != direction:
+                new_cost += bend_penalty
+            if (
+                ni == ei
+                and nj == ej
+                and end_direction is not None
+                and new_direction != end_direction
+            ):
+                new_cost += bend_penalty
+
+            if new_cost < costs.get(new_state, math.inf):
+                costs[new_state] = new_cost
+                parents[new_state] = state
+                h = _heuristic(ni, nj, new_direction)
+                heapq.heappush(heap, (new_cost + h, h, next(counter), new_state))
+
+    return None
+
+
+def _remove_collinear_points(points) -> np.ndarray:
+    """Returns points without duplicates and without points in straight segments."""
+    points = np.array(points, dtype=float)
+    points = points[np.append(True, np.any(np.diff(points, axis=0) != 0, axis=1))]
+    if len(points) < 3:
+        return points
+    directions = np.sign(np.diff(points, axis=0))
+    corners = np.any(directions[1:] != directions[:-1], axis=1)
+    return points[np.concatenate([[True], corners, [True]])]
 
 
 def _extract_all_bbox(c: Component, avoid_layers: list[LayerSpec] | None = None):
@@ -187,26 +498,30 @@ def _generate_grid(
     resolution: float = 0.5,
     avoid_layers: list[LayerSpec] | None = None,
     distance: float = 1,
-) -> np.ndarray:
-    """Generate discretization grid that the algorithm will step through."""
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Generate discretization grid that the algorithm will step through.
+
+    Returns:
+        grid: int8 array of shape (len(x), len(y)), 1 for obstacles.
+        x: grid x coordinates.
+        y: grid y coordinates.
+    """
     bbox = c.bbox
-    x, y = np.meshgrid(
-        np.linspace(
-            bbox[0][0],
-            bbox[1][0],
-            int((bbox[1][0] - bbox[0][0]) / resolution),
-            endpoint=True,
-        ),
-        np.linspace(
-            bbox[0][1],
-            bbox[1][1],
-            int((bbox[1][1] - bbox[0][1]) / resolution),
-            endpoint=True,
-        ),
-    )  # discretize component space
-    x, y = x[0], y[:, 0]  # weed out copies
+    # discretize component space
+    x = np.linspace(
+        bbox[0][0],
+        bbox[1][0],
+        int((bbox[1][0] - bbox[0][0]) / resolution),
+        endpoint=True,
+    )
+    y = np.linspace(
+        bbox[0][1],
+        bbox[1][1],
+        int((bbox[1][1] - bbox[0][1]) / resolution),
+        endpoint=True,
+    )
     grid = np.zeros(
-        (len(x), len(y))
+        (len(x), len(y)), dtype=np.int8
     )  # mapping from gdsfactory's x-, y- coordinate to grid vertex
 
     # assign 1 for obstacles
@@ -229,65 +544,7 @@ def _generate_grid(
                 ymax = np.abs(y - bbox[2][1] - distance).argmin()
                 grid[xmin:xmax, ymin:ymax] = 1
 
-    return np.ndarray.round(grid, 3), np.ndarray.round(x, 3), np.ndarray.round(y, 3)
-
-
-def _generate_neighbours(
-    current_node: Node,
-    grid,
-    x: np.ndarray,
-    y: np.ndarray,
-    resolution: float,
-) -> list[Node]:
-    """Generate neighbours of a node."""
-    neighbours = []
-
-    for new_position in [
-        (0, -resolution),
-        (0, resolution),
-        (-resolution, 0),
-        (resolution, 0),
-    ]:  # Adjacent nodes along Manhattan path
-        # Get node position
-        node_position = (
-            current_node.position[0] + new_position[0],
-            current_node.position[1] + new_position[1],
-        )
-
-        # Make sure within range and not in obstacle
-        if (
-            node_position[0] > x.max()
-            or node_position[0] < x.min()
-            or node_position[1] > y.max()
-            or node_position[1] < y.min()
-        ):
-            continue
-
-        if (
-            grid[
-                next(
-                    i
-                    for i, _ in enumerate(x)
-                    if np.isclose(_, node_position[0], atol=resolution)
-                )
-            ][
-                next(
-                    i
-                    for i, _ in enumerate(y)
-                    if np.isclose(_, node_position[1], atol=resolution)
-                )
-            ]
-            == 1.0
-        ):
-            continue
-
-        # Create new node
-        new_node = Node(current_node, node_position)
-
-        # Append
-        neighbours.append(new_node)
-
-    return neighbours
+    return grid, np.ndarray.round(x, 3), np.ndarray.round(y, 3)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 import warnings
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from functools import partial
 
 import gdstk
@@ -419,6 +419,204 @@ def _generate_route_manhattan_points(
     return points
 
 
+def _generate_route_manhattan_points_batch(
+    p_input: ndarray,
+    p_output: ndarray,
+    a_input: ndarray,
+    a_output: ndarray,
+    bs1: float | ndarray,
+    bs2: float | ndarray,
+    start_straight_length: float | ndarray = 0.01,
+    end_straight_length: float | ndarray = 0.01,
+    min_straight_length: float | ndarray = 0.01,
+) -> list[ndarray]:
+    """Returns the waypoints of N routes at once.
+
+    Vectorized version of `_generate_route_manhattan_points`, where all the
+    routes advance one step of the same state machine at each iteration.
+
+    Args:
+        p_input: (N, 2) input port centers.
+        p_output: (N, 2) output port centers.
+        a_input: (N,) input port orientations.
+        a_output: (N,) output port orientations.
+        bs1: bend size.
+        bs2: bend size.
+        start_straight_length: in um. Scalar or (N,) array.
+        end_straight_length: in um. Scalar or (N,) array.
+        min_straight_length: in um. Scalar or (N,) array.
+
+    """
+    threshold = TOLERANCE
+    p_input = np.asarray(p_input, dtype=float).reshape(-1, 2)
+    p_output = np.asarray(p_output, dtype=float).reshape(-1, 2)
+    n = len(p_input)
+    if n == 0:
+        return []
+
+    bs1, bs2, ssl, esl, msl = (
+        np.broadcast_to(np.asarray(value, dtype=float), (n,))
+        for value in (
+            bs1,
+            bs2,
+            start_straight_length,
+            end_straight_length,
+            min_straight_length,
+        )
+    )
+
+    # transform I/O to the case where output is at (0, 0) pointing east (180)
+    bend_orientation = -np.asarray(a_output, dtype=float) + 180
+    c = np.cos(DEG2RAD * bend_orientation)
+    s_ = np.sin(DEG2RAD * bend_orientation)
+
+    def _transform(pts: ndarray) -> ndarray:
+        x = pts[..., 0] - p_output[:, None, 0]
+        y = pts[..., 1] - p_output[:, None, 1]
+        return np.stack(
+            [x * c[:, None] - y * s_[:, None], x * s_[:, None] + y * c[:, None]],
+            axis=-1,
+        )
+
+    def _reverse_transform(pts: ndarray) -> ndarray:
+        x = pts[..., 0]
+        y = pts[..., 1]
+        return np.stack(
+            [
+                x * c[:, None] + y * s_[:, None] + p_output[:, None, 0],
+                -x * s_[:, None] + y * c[:, None] + p_output[:, None, 1],
+            ],
+            axis=-1,
+        )
+
+    _pts_io = _transform(np.stack([p_input, p_output], axis=1))
+    px, py = _pts_io[:, 0, 0], _pts_io[:, 0, 1]
+    _p_output = _pts_io[:, 1, :]
+
+    a = (np.asarray(a_input, dtype=float) + bend_orientation).astype(int) % 360
+    s = ssl.copy()
+    active = np.ones(n, dtype=bool)
+
+    # each iteration emits up to two points per route
+    points = [np.stack([px, py], axis=-1)]
+    emitted = [np.ones(n, dtype=bool)]
+
+    count = 0
+    while active.any():
+        count += 1
+        if count > 40:
+            i = int(np.flatnonzero(active)[0])
+            raise AttributeError(
+                f"Too many iterations for in {p_input[i]} -> out {p_output[i]}"
+            )
+        sigp = np.where(np.sign(py) == 0, 1, np.sign(py))
+        abs_py = np.abs(py)
+        new_px, new_py, new_a = px.copy(), py.copy(), a.copy()
+
+        # same directions
+        same = active & (a % 360 == 0)
+        reached = same & (abs_py < threshold) & (px <= threshold)
+        sbend = (
+            same
+            & ~reached
+            & (px + (bs1 + bs2 + esl + s) < threshold)
+            & (abs_py - (bs1 + bs2 + msl) > -threshold)
+        )
+        aside = same & ~reached & ~sbend
+        new_px = np.where(sbend, -esl - bs2, new_px)
+        new_px = np.where(aside, px + s + bs1, new_px)
+        turn_away = aside & (
+            (px + (2 * bs1 + 2 * bs2 + esl + s + msl) < threshold)
+            | (abs_py - (2 * bs1 + 2 * bs2 + 2 * msl) > -threshold)
+        )
+        new_a = np.where(sbend | turn_away, -sigp * 90, new_a)
+        new_a = np.where(aside & ~turn_away, sigp * 90, new_a)
+
+        # opposite directions
+        opposite = active & (a == 180)
+        uturn = opposite & (abs_py - (bs1 + bs2 + msl) > -threshold)
+        new_px = np.where(uturn, np.minimum(px - s, -esl) - bs2, new_px)
+        new_px = np.where(
+            opposite & ~uturn,
+            np.minimum(px - s - bs1, -esl - msl - 2 * bs1 - bs2),
+            new_px,
+        )
+        new_a = np.where(opposite, -sigp * 90, new_a)
+
+        # perpendicular directions
+        perpendicular = active & (a % 180 == 90)
+        siga = -np.sign((a % 360) - 180)
+        siga = np.where(siga == 0, 1, siga)
+        c1 = (
+            perpendicular
+            & ((-py * siga) - (s + bs2) > -threshold)
+            & ((-px - (esl + bs2)) > -threshold)
+        )
+        c2 = (
+            perpendicular
+            & ~c1
+            & ((py * siga) <= threshold)
+            & (px + (esl + bs1) > -threshold)
+        )
+        c3 = (
+            perpendicular & ~c1 & ~c2 & (-px - (esl + 2 * bs1 + bs2 + msl) > -threshold)
+        )
+        c4 = perpendicular & ~c1 & ~c2 & ~c3 & (-px - (esl + bs2) > -threshold)
+        c5 = perpendicular & ~c1 & ~c2 & ~c3 & ~c4
+
+        # simple case: one right angle to the end
+        new_py = np.where(c1, 0, new_py)
+        new_a = np.where(c1, 0, new_a)
+
+        # go to the west, and then turn upward
+        _y = np.minimum(
+            np.maximum(np.minimum(msl, 0.5 * abs_py), abs_py - s - bs1),
+            bs1 + bs2 + msl,
+        )
+        if count == 1:  # take care of the start_straight case
+            _y2 = -sigp * np.maximum(ssl, _y)
+        else:
+            _y2 = sigp * _y
+        new_py = np.where(c2, _y2, new_py)
+        new_a = np.where(c2, 180, new_a)
+
+        # go sufficiently up, and then east
+        new_py = np.where(
+            c3, siga * np.maximum(py * siga + s + bs1, bs1 + bs2 + msl), new_py
+        )
+        new_a = np.where(c3, 0, new_a)
+
+        # make vertical S-bend to get sufficient room for movement
+        extra_py = py + siga * (bs2 + s)
+        new_px = np.where(
+            c4,
+            np.minimum(px - bs1 + bs2 + msl, -2 * bs1 - bs2 - esl - msl),
+            new_px,
+        )
+        new_py = np.where(c4, extra_py, new_py)
+
+        # no viable solution for this case. May result in crossed straights
+        new_py = np.where(c5, py + sigp * (s + bs1), new_py)
+        new_a = np.where(c5, 180, new_a)
+
+        points.append(np.stack([px, extra_py], axis=-1))
+        emitted.append(c4)
+
+        # Reach the output!
+        new_px = np.where(reached, _p_output[:, 0], new_px)
+        new_py = np.where(reached, _p_output[:, 1], new_py)
+        points.append(np.stack([new_px, new_py], axis=-1))
+        emitted.append(active.copy())
+
+        px, py, a = new_px, new_py, new_a
+        active &= ~reached
+        s = msl + bs1
+
+    points = _reverse_transform(np.stack(points, axis=1))
+    emitted = np.stack(emitted, axis=1)
+    return [points[i][emitted[i]] for i in range(n)]
+
+
 def _get_bend_reference_parameters(
     p0: ndarray,
     p1: ndarray,
@@ -605,6 +803,7 @@ def round_corners(
     on_route_error: Callable = get_route_error,
     with_point_markers: bool = False,
     with_sbend: bool = False,
+    merge_straights: bool = False,
     **kwargs,
 ) -> Route:
     """Returns Route.
@@ -625,6 +824,10 @@ def round_corners(
         on_route_error: function to run when route fails.
         with_point_markers: add route points markers (easy for debugging).
         with_sbend: add sbend in case there are routing errors.
+        merge_straights: extrudes all the straight sections of the route into
+            one cell per cross_section instead of one straight cell per length.
+            Bounds the number of cells per route. Ignores straight and
+            straight_fall_back_no_taper.
         kwargs: cross_section settings.
 
     """
@@ -819,6 +1022,8 @@ def round_corners(
             )
 
     wg_refs = []
+    # straight (start, end) points to merge by cross_section name
+    merged_straights: dict[str, tuple[CrossSection, list]] = {}
     for straight_origin, angle, length in straight_sections:
         if isinstance(cross_section, list):
             for section, angles in cross_section:
@@ -839,12 +1044,15 @@ def round_corners(
             or length <= auto_widen_minimum_length
             or not width_wide
         ):
-            wg = gf.get_component(
-                straight_fall_back_no_taper,
-                length=length,
-                cross_section=xsection,
-                **kwargs,
-            )
+            if merge_straights:
+                xs_straight = x
+            else:
+                wg = gf.get_component(
+                    straight_fall_back_no_taper,
+                    length=length,
+                    cross_section=xsection,
+                    **kwargs,
+                )
         else:
             # Taper starts where straight would have started
             with_taper = True
@@ -872,32 +1080,51 @@ def round_corners(
                 cross_section_wide = partial(cross_section, **kwargs_wide)
             else:
                 cross_section_wide = x.copy(width=width_wide)
-            wg = gf.get_component(
-                straight, length=length, cross_section=cross_section_wide
+            if merge_straights:
+                xs_straight = gf.get_cross_section(cross_section_wide)
+            else:
+                wg = gf.get_component(
+                    straight, length=length, cross_section=cross_section_wide
+                )
+
+        if merge_straights:
+            if mirror_straight:
+                xs_straight = xs_straight.copy(mirror=not xs_straight.mirror)
+            direction = np.round(
+                (np.cos(angle * DEG2RAD), np.sin(angle * DEG2RAD)), decimals=12
+            )
+            straight_end = np.asarray(straight_origin) + length * direction
+            _, paths = merged_straights.setdefault(
+                xs_straight.get_name(), (xs_straight, [])
             )
-        if straight_ports is None:
-            straight_ports = [p.name for p in _get_straight_ports(wg, layer=layer)]
+            if length > 0:
+                wg_refs += [(xs_straight.get_name(), len(paths))]
+                paths.append((straight_origin, straight_end))
+        else:
+            if straight_ports is None:
+                straight_ports = [p.name for p in _get_straight_ports(wg, layer=layer)]
 
-        pname_west, pname_east = straight_ports
+            pname_west, pname_east = straight_ports
 
-        wg_ref = wg.ref()
-        wg_ref.move(wg.ports[pname_west], (0, 0))
-        if mirror_straight:
-            wg_ref.mirror_y(list(wg_ref.ports.values())[0].name)
+            wg_ref = wg.ref()
+            wg_ref.move(wg.ports[pname_west], (0, 0))
+            if mirror_straight:
+                wg_ref.mirror_y(list(wg_ref.ports.values())[0].name)
 
-        wg_ref.rotate(angle)
-        wg_ref.move(straight_origin)
+            wg_ref.rotate(angle)
+            wg_ref.move(straight_origin)
+            straight_end = wg_ref.ports[pname_east]
 
-        if length > 0:
-            references.append(wg_ref)
-            wg_refs += [wg_ref]
+            if length > 0:
+                references.append(wg_ref)
+                wg_refs += [wg_ref]
 
         port_index_out = 1
         if with_taper:
             # Second taper:
             # Origin at end of straight waveguide, starting from east side of taper
 
-            taper_origin = wg_ref.ports[pname_east]
+            taper_origin = straight_end
             pname_west, pname_east = (
                 p.name for p in _get_straight_ports(taper, layer=layer)
             )
@@ -922,8 +1149,31 @@ def round_corners(
         references += route.references
         labels += route.labels
 
-    port_input = list(wg_refs[0].ports.values())[0]
-    port_output = list(wg_refs[-1].ports.values())[port_index_out]
+    straights_refs = {}
+    for name, (xs_straight, paths) in merged_straights.items():
+        if paths:
+            paths = tuple(
+                tuple(tuple(float(xy) for xy in np.round(point, 6)) for point in path)
+                for path in paths
+            )
+            straights_refs[name] = merged_straights_cell(
+                paths=paths, cross_section=xs_straight
+            ).ref()
+            references.append(straights_refs[name])
+
+    def _get_ports(wg_ref: ComponentReference | tuple[str, int]) -> list[Port]:
+        if isinstance(wg_ref, ComponentReference):
+            return list(wg_ref.ports.values())
+        name, index = wg_ref
+        ports = []
+        for port_name, port in straights_refs[name].ports.items():
+            port_name, port_index = port_name.rsplit("_", 1)
+            if port_index == str(index):
+                ports.append(port.copy(name=port_name))
+        return ports
+
+    port_input = _get_ports(wg_refs[0])[0]
+    port_output = _get_ports(wg_refs[-1])[port_index_out]
     length = float(np.round(total_length, 3))
     return Route(
         references=references,
@@ -933,6 +1183,51 @@ def round_corners(
     )
 
 
+@gf.cell
+def merged_straights_cell(
+    paths: tuple[tuple[Coordinate, Coordinate], ...],
+    cross_section: CrossSectionSpec = strip,
+) -> Component:
+    """Returns straights between pairs of points extruded into a single cell.
+
+    The ports of straight i are suffixed with `_i`.
+
+    Args:
+        paths: (start, end) points of each straight.
+        cross_section: spec.
+    """
+    from gdsfactory.add_padding import get_padding_points
+
+    x = gf.get_cross_section(cross_section)
+    components = gf.path.extrude_many(
+        [np.array(path) for path in paths], cross_section=x
+    )
+
+    c = Component()
+    for i, (path, component) in enumerate(zip(paths, components)):
+        if component.references:
+            c.add_ref(component)
+        else:
+            c._add_polygons(*component.polygons)
+            c._cell.add(*component.labels)
+        for port in component.ports.values():
+            c.add_port(f"{port.name}_{i}", port=port)
+
+        if x.bbox_layers:
+            (x0, y0), (x1, y1) = path
+            padding = "top bottom" if abs(y1 - y0) < TOLERANCE else "left right"
+            for layer, offset in zip(x.bbox_layers, x.bbox_offsets):
+                points = get_padding_points(
+                    component=component,
+                    default=0,
+                    **{side: offset for side in padding.split()},
+                )
+                c.add_polygon(points, layer=layer)
+
+    c.info["length"] = float(np.round(sum(c.info["length"] for c in components), 3))
+    return c
+
+
 def generate_manhattan_waypoints(
     input_port: Port,
     output_port: Port,
@@ -988,6 +1283,98 @@ def generate_manhattan_waypoints(
     )
 
 
+def generate_manhattan_waypoints_batch(
+    ports1: list[Port],
+    ports2: list[Port],
+    start_straight_length: float | Sequence[float] | None = None,
+    end_straight_length: float | Sequence[float] | None = None,
+    min_straight_length: float | None = None,
+    bend: ComponentSpec = bend_euler,
+    cross_section: CrossSectionSpec | MultiCrossSectionAngleSpec = strip,
+    **kwargs,
+) -> list[ndarray]:
+    """Return waypoints for Manhattan routes between pairs of ports.
+
+    Equivalent to calling `generate_manhattan_waypoints` for each pair of ports,
+    but resolves the bend and cross_section only once and computes the waypoints
+    of all the routes together.
+
+    Args:
+        ports1: source ports.
+        ports2: destination ports.
+        start_straight_length: in um. One value for all routes or one per route.
+        end_straight_length: in um. One value for all routes or one per route.
+        min_straight_length: in um.
+        bend: bend spec.
+        cross_section: spec.
+        kwargs: cross_section settings.
+
+    """
+    if len(ports1) != len(ports2):
+        raise ValueError(f"ports1={len(ports1)} and ports2={len(ports2)} must be equal")
+    if not ports1:
+        return []
+
+    if "straight" in kwargs:
+        _ = kwargs.pop("straight")
+
+    bend90 = (
+        bend
+        if isinstance(bend, Component)
+        else gf.get_component(bend, cross_section=cross_section, **kwargs)
+    )
+
+    if isinstance(cross_section, tuple | list):
+        x = [gf.get_cross_section(xsection[0], **kwargs) for xsection in cross_section]
+        min_length = min(_x.min_length for _x in x)
+    else:
+        x = gf.get_cross_section(cross_section, **kwargs)
+        min_length = x.min_length
+
+    n = len(ports1)
+    lengths = []
+    for length in (start_straight_length, end_straight_length):
+        length = np.broadcast_to(
+            np.asarray(0 if length is None else length, dtype=float), (n,)
+        )
+        lengths.append(np.where(length != 0, length, min_length))
+    start_straight_length, end_straight_length = lengths
+    min_straight_length = min_straight_length or min_length
+
+    bs = _get_bend_size(bend90)
+    waypoints: list[ndarray | None] = [None] * n
+    batch = []
+    for i, (input_port, output_port) in enumerate(zip(ports1, ports2)):
+        if input_port.orientation is None or output_port.orientation is None:
+            waypoints[i] = _generate_route_manhattan_points(
+                input_port,
+                output_port,
+                bs,
+                bs,
+                start_straight_length[i],
+                end_straight_length[i],
+                min_straight_length,
+            )
+        else:
+            batch.append(i)
+
+    if batch:
+        points = _generate_route_manhattan_points_batch(
+            p_input=[ports1[i].center for i in batch],
+            p_output=[ports2[i].center for i in batch],
+            a_input=[ports1[i].orientation for i in batch],
+            a_output=[ports2[i].orientation for i in batch],
+            bs1=bs,
+            bs2=bs,
+            start_straight_length=start_straight_length[batch],
+            end_straight_length=end_straight_length[batch],
+            min_straight_length=min_straight_length,
+        )
+        for i, _points in zip(batch, points):
+            waypoints[i] = _points
+    return waypoints
+
+
 def _get_bend_size(bend90: Component):
     p1, p2 = list(bend90.ports.values())[:2]
     bsx = abs(p2.x - p1.x)
@@ -1008,6 +1395,7 @@ def route_manhattan(
     cross_section: CrossSectionSpec | MultiCrossSectionAngleSpec = strip,
     with_point_markers: bool = False,
     on_route_error: Callable = get_route_error,
+    merge_straights: bool = False,
     **kwargs,
 ) -> Route:
     """Generates the Manhattan waypoints for a route.
@@ -1027,6 +1415,9 @@ def route_manhattan(
         with_sbend: add sbend in case there are routing errors.
         cross_section: spec.
         with_point_markers: add point markers in the route.
+        on_route_error: function to run when route fails.
+        merge_straights: extrudes the straight sections of each route into one cell
+            instead of one straight cell per length.
         kwargs: cross_section settings.
 
     """
@@ -1061,6 +1452,7 @@ def route_manhattan(
             with_point_markers=with_point_markers,
             with_sbend=with_sbend,
             on_route_error=on_route_error,
+            merge_straights=merge_straights,
         )
 
     except RouteError:
@@ -0,0 +1,231 @@
+"""Sweep the settings of a component factory (Design of Experiment).
+
+Each unique variant is built once, in a pool of forked processes (as in
+build_parallel), and a failing variant does not stop the sweep.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import itertools as it
+import time
+import traceback
+from typing import Any
+
+from gdsfactory.build_parallel import _build_in_processes, _get_processes
+from gdsfactory.component import Component
+from gdsfactory.serialization import clean_value_name
+from gdsfactory.typings import CellSpec, ComponentFactory
+
+# factory, function and settings of the sweep in progress, inherited by the workers
+_sweep: tuple[
+    ComponentFactory | None, ComponentFactory | None, list[dict[str, Any]]
+] = (None, None, [])
+
+
+@dataclasses.dataclass
+class SweepVariant:
+    """One variant of a sweep.
+
+    Parameters:
+        settings: passed to the factory.
+        component: None if the build failed.
+        build_time: in seconds. Variants with the same settings share the build.
+        error: traceback of the build failure.
+    """
+
+    settings: dict[str, Any]
+    component: Component | None = None
+    build_time: float = 0.0
+    error: str | None = None
+
+
+@dataclasses.dataclass
+class SweepResult:
+    """Variants of a sweep, in the order of the settings.
+
+    Parameters:
+        variants: one for each settings.
+        build_time: total time building the unique variants in seconds.
+    """
+
+    variants: list[SweepVariant]
+    build_time: float = 0.0
+
+    @property
+    def components(self) -> list[Component]:
+        """Returns the unique components that built, ready for gf.pack or gf.grid."""
+        components = {}
+        for variant in self.variants:
+            if variant.component is not None:
+                components.setdefault(variant.component.name, variant.component)
+        return list(components.values())
+
+    @property
+    def failures(self) -> list[SweepVariant]:
+        """Returns the variants that failed to build."""
+        return [variant for variant in self.variants if variant.error is not None]
+
+
+def get_settings_list(
+    settings: dict[str, list[Any]] | list[dict[str, Any]],
+    do_permutations: bool = True,
+) -> list[dict[str, Any]]:
+    """Returns a list of settings for each variant.
+
+    Args:
+        settings: list of values for each setting, or list of settings.
+        do_permutations: all the combinations of values. Otherwise zips the values.
+    """
+    if not isinstance(settings, dict):
+        return [dict(s) for s in settings]
+    if do_permutations:
+        return [dict(zip(settings, t)) for t in it.product(*settings.values())]
+    return [dict(zip(settings, t)) for t in zip(*settings.values())]
+
+
+def _get_settings_key(factory: ComponentFactory, settings: dict[str, Any]) -> str:
+    """Returns the factory arguments as named by @cell, with defaults filled in.
+
+    Settings that only differ in arguments equal to their defaults get the same key.
+    """
+    try:
+        parameters = inspect.signature(factory).parameters.values()
+    except (TypeError, ValueError):
+        parameters = []
+    full = {
+        p.name: p.default
+        for p in parameters
+        if p.default is not inspect.Parameter.empty
+    }
+    full.update(settings)
+    return ",".join(f"{key}={clean_value_name(full[key])}" for key in sorted(full))
+
+
+def _build(index: int) -> tuple[Component | None, tuple[float, str | None]]:
+    """Builds one variant and returns it with its build time and error traceback.
+
+    Args:
+        index: of the settings in the sweep in progress.
+    """
+    factory, function, settings_list = _sweep
+    t0 = time.perf_counter()
+    try:
+        component = factory(**settings_list[index])
+        if function is not None:
+            component = function(component)
+        if not isinstance(component, Component):
+            raise TypeError(f"returned {type(component)}, not a Component")
+    except Exception:
+        return None, (time.perf_counter() - t0, traceback.format_exc())
+    return component, (time.perf_counter() - t0, None)
+
+
+def _store_error(
+    result: tuple[float, str | None], error: str
+) -> tuple[float, str | None]:
+    """Returns the build time and error of a variant that failed to store."""
+    build_time, _ = result
+    return build_time, error
+
+
+def sweep(
+    factory: CellSpec,
+    settings: dict[str, list[Any]] | list[dict[str, Any]],
+    do_permutations: bool = True,
+    function: CellSpec | None = None,
+    processes: int | None = None,
+    chunksize: int = 1,
+) -> SweepResult:
+    """Returns the variants of a component factory for a grid of settings.
+
+    Settings that name the same @cell (same arguments once defaults are filled in)
+    are built once. The variants are built in a pool of forked processes, and a
+    variant that raises, does not return a Component or cannot be sent back from
+    its worker is reported in the result instead of stopping the sweep.
+
+    With processes > 1 the components come back from the workers through GDS,
+    as in build_parallel: their polygons are snapped to 1nm and their info
+    and settings are cleaned to JSON values.
+
+    Args:
+        factory: component function or name of a PDK cell.
+        settings: list of values for each setting, or list of settings.
+        do_permutations: all the combinations of values. Otherwise zips the values.
+        function: to apply to each component (add padding, grating couplers).
+        processes: number of worker processes. Defaults to the number of CPUs.
+        chunksize: number of variants sent to a worker at a time.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        result = gf.sweep("mmi1x2", dict(length_mmi=[5, 10, 20], width_mmi=[4, 6]))
+        for variant in result.failures:
+            print(variant.settings, variant.error)
+        c = gf.pack(result.components)[0]
+    """
+    from gdsfactory.pdk import get_cell
+
+    global _sweep
+
+    factory = get_cell(factory)
+    function = get_cell(function) if function is not None else None
+    settings_list = get_settings_list(settings, do_permutations=do_permutations)
+
+    unique_settings: dict[str, dict[str, Any]] = {}
+    keys = []
+    for s in settings_list:
+        key = _get_settings_key(factory, s)
+        unique_settings.setdefault(key, s)
+        keys.append(key)
+
+    processes = _get_processes(processes, "sweep")
+
+    _sweep = (factory, function, list(unique_settings.values()))
+    indices = list(range(len(unique_settings)))
+    try:
+        if processes > 1 and len(indices) > 1:
+            results = _build_in_processes(
+                _build,
+                indices,
+                processes,
+                chunksize=chunksize,
+                on_store_error=_store_error,
+            )
+        else:
+            results = [_build(index) for index in indices]
+    finally:
+        _sweep = (None, None, [])
+
+    builds = {
+        key: SweepVariant(
+            settings=unique_settings[key],
+            component=component,
+            build_time=build_time,
+            error=error,
+        )
+        for key, (component, (build_time, error)) in zip(unique_settings, results)
+    }
+
+    return SweepResult(
+        variants=[
+            dataclasses.replace(builds[key], settings=s)
+            for key, s in zip(keys, settings_list)
+        ],
+        build_time=sum(variant.build_time for variant in builds.values()),
+    )
+
+
+if __name__ == "__main__":
+    import gdsfactory as gf
+
+    result = sweep(
+        "mmi1x2", dict(length_mmi=[5, 10, 20], width_mmi=[4, 6, -1]), processes=4
+    )
+    print(f"built {len(result.components)} in {result.build_time:.2f}s")
+    for variant in result.failures:
+        print(variant.settings, variant.error.splitlines()[-1])
+    c = gf.pack(result.components)[0]
+    c.show()
@@ -5,6 +5,7 @@ from collections import defaultdict
 from typing import TYPE_CHECKING, Any, Literal
 
 import gdstk
+import numpy as np
 from pydantic import BaseModel, Field
 
 from gdsfactory.cell import cell
@@ -415,80 +416,193 @@ class LayerStack(BaseModel):
         return self
 
 
-@cell
-def get_component_with_derived_layers(component, layer_stack: LayerStack):
-    unetched_layers = [
-        layer_name
-        for layer_name, level in layer_stack.layers.items()
-        if level.layer and level.layer_type == "grow"
-    ]
-    etch_layers = [
-        layer_name
-        for layer_name, level in layer_stack.layers.items()
-        if level.layer and level.layer_type == "etch"
-    ]
+def _transform_bbox(reference: gdstk.Reference, bbox: np.ndarray) -> np.ndarray:
+    """Returns the bboxes of bbox for each instance of a gdstk reference."""
+    (xmin, ymin), (xmax, ymax) = bbox
+    corners = np.array([[xmin, ymin], [xmax, ymin], [xmax, ymax], [xmin, ymax]])
+    if reference.x_reflection:
+        corners[:, 1] *= -1
+    c, s = np.cos(reference.rotation), np.sin(reference.rotation)
+    corners = reference.magnification * corners @ np.array([[c, s], [-s, c]])
+    corners = corners + np.asarray(reference.origin)
+
+    offsets = (
+        reference.repetition.get_offsets()
+        if reference.repetition.size
+        else np.zeros((1, 2))
+    )
+    points = corners[None] + offsets[:, None]
+    return np.stack((points.min(axis=1), points.max(axis=1)), axis=1)
+
+
+def _get_cell_with_derived_layers(
+    component,
+    grown_layers: set[tuple[int, int]],
+    etch_layers: dict[tuple[int, int], list[tuple[tuple[int, int], Any]]],
+    derived_cells: dict[str, tuple[Any, np.ndarray | None]],
+):
+    """Returns the derived cell of component and the bbox of its etch shapes.
+
+    Args:
+        component: to derive.
+        grown_layers: layers copied as they are.
+        etch_layers: for each etched layer, its etching layers and derived layers.
+        derived_cells: derived cell and bbox of each component name already derived.
+    """
+    import shapely
+
+    from gdsfactory.component import Component
+
+    if component.name in derived_cells:
+        return derived_cells[component.name]
 
-    # remove all etched layers from the grown layers
-    unetched_layers_dict = defaultdict(list)
-    for layer_name in etch_layers:
-        level = layer_stack.layers[layer_name]
-        into = level.into or []
-        for layer_name_etched in into:
-            unetched_layers_dict[layer_name_etched].append(layer_name)
-            if layer_name_etched in unetched_layers:
-                unetched_layers.remove(layer_name_etched)
-
-    component_layers = component.get_layers()
-
-    # Define pure grown layers
-    unetched_layer_numbers = [
-        layer_stack.layers[layer_name].layer
-        for layer_name in unetched_layers
-        if layer_stack.layers[layer_name].layer in component_layers
+    interaction_layers = set(etch_layers).union(
+        *[[layer for layer, _ in etching] for etching in etch_layers.values()]
+    )
+    layers = grown_layers | interaction_layers
+
+    polygons = component._cell.get_polygons(depth=0)
+    polygons = [p for p in polygons if (p.layer, p.datatype) in layers]
+    interaction_boxes = [
+        p.bounding_box()
+        for p in polygons
+        if (p.layer, p.datatype) in interaction_layers
     ]
-    component_derived = component.extract(unetched_layer_numbers)
-
-    # Define unetched layers
-    polygons_to_remove = []
-    for unetched_layer_name, unetched_layers in unetched_layers_dict.items():
-        layer = layer_stack.layers[unetched_layer_name].layer
-        polygons = component.get_polygons(by_spec=layer)
-
-        # Add all the etching layers (OR)
-        for etching_layers in unetched_layers:
-            layer = layer_stack.layers[etching_layers].layer
-            B_polys = component.get_polygons(by_spec=layer)
+
+    # bboxes of the etched and etching shapes of each reference instance
+    references = []
+    owners = []
+    instance_boxes = []
+    for reference in component.references:
+        derived, bbox = _get_cell_with_derived_layers(
+            reference.parent, grown_layers, etch_layers, derived_cells
+        )
+        if bbox is not None:
+            boxes = _transform_bbox(reference._reference, bbox)
+            owners += [len(references)] * len(boxes)
+            instance_boxes += list(boxes)
+        references.append((reference._reference, derived))
+
+    flattened = set()
+    if instance_boxes:
+        owners = np.array(owners)
+        boxes = np.array(instance_boxes + interaction_boxes)
+        tree = shapely.STRtree(shapely.box(*boxes.reshape(-1, 4).T))
+        i, j = tree.query(shapely.box(*boxes[: len(owners)].reshape(-1, 4).T))
+        # instances that only touch other shapes do not interact with them
+        overlap = np.minimum(boxes[i, 1], boxes[j, 1]) - np.maximum(
+            boxes[i, 0], boxes[j, 0]
+        )
+        overlapping = (i != j) & (overlap > 0).all(axis=1)
+        flattened = set(owners[i[overlapping]].tolist())
+        interaction_boxes += [
+            box for box, owner in zip(instance_boxes, owners) if owner not in flattened
+        ]
+
+    for index in flattened:
+        for p in references[index][0].get_polygons():
+            layer = (p.layer, p.datatype)
+            if layer in layers:
+                polygons.append(p)
+                if layer in interaction_layers:
+                    interaction_boxes.append(p.bounding_box())
+
+    polygons_by_layer = defaultdict(list)
+    for p in polygons:
+        polygons_by_layer[(p.layer, p.datatype)].append(p)
+
+    component_derived = Component(f"{component.name}_derived", with_uuid=True)
+    for layer in grown_layers:
+        component_derived.add(polygons_by_layer[layer])
+
+    for layer, etching in etch_layers.items():
+        etched = polygons_by_layer[layer]
+        polygons_to_remove = []
+        for etching_layer, derived_layer in etching:
+            etching_polygons = polygons_by_layer[etching_layer]
+            if not etching_polygons:
+                continue
             polygons_to_remove = gdstk.boolean(
                 operand1=polygons_to_remove,
-                operand2=B_polys,
+                operand2=etching_polygons,
                 operation="or",
-                layer=layer[0],
-                datatype=layer[1],
             )
-
-            derived_layer = layer_stack.layers[etching_layers].derived_layer
-            if derived_layer:
+            if derived_layer and etched:
                 slab_polygons = gdstk.boolean(
-                    operand1=polygons,
-                    operand2=B_polys,
+                    operand1=etched,
+                    operand2=etching_polygons,
                     operation="and",
                     layer=derived_layer[0],
                     datatype=derived_layer[1],
                 )
                 component_derived.add(slab_polygons)
 
-        # Remove all etching layers
-        layer = layer_stack.layers[unetched_layer_name].layer
-        polygons = component.get_polygons(by_spec=layer)
-        unetched_polys = gdstk.boolean(
-            operand1=polygons,
-            operand2=polygons_to_remove,
-            operation="not",
-            layer=layer[0],
-            datatype=layer[1],
+        if polygons_to_remove:
+            etched = gdstk.boolean(
+                operand1=etched,
+                operand2=polygons_to_remove,
+                operation="not",
+                layer=layer[0],
+                datatype=layer[1],
+            )
+        component_derived.add(etched)
+
+    for index, (reference, derived) in enumerate(references):
+        if index in flattened or not (derived.polygons or derived.references):
+            continue
+        ref = component_derived.add_ref(
+            derived,
+            origin=reference.origin,
+            rotation=np.rad2deg(reference.rotation),
+            magnification=reference.magnification,
+            x_reflection=reference.x_reflection,
+        )
+        ref._reference.repetition = reference.repetition
+
+    bbox = None
+    if interaction_boxes:
+        interaction_boxes = np.array(interaction_boxes)
+        bbox = np.array(
+            [interaction_boxes[:, 0].min(axis=0), interaction_boxes[:, 1].max(axis=0)]
         )
-        component_derived.add(unetched_polys)
+    derived_cells[component.name] = component_derived, bbox
+    return component_derived, bbox
 
+
+@cell
+def get_component_with_derived_layers(component, layer_stack: LayerStack):
+    """Returns component with the etched layers removed from the grown layers.
+
+    Evaluates the booleans once per cell and keeps the hierarchy.
+    A reference whose etched and etching shapes do not overlap any other of
+    them in the parent cell points to the derived cell of its component,
+    shared by all its instances. Only the other references are flattened.
+
+    Args:
+        component: to derive.
+        layer_stack: grow and etch layers. Each etch layer is removed from the
+            layers it goes into and its overlap with them is added to its
+            derived_layer.
+    """
+    levels = layer_stack.layers
+    etch_layers = defaultdict(list)
+    for level in levels.values():
+        if level.layer and level.layer_type == "etch":
+            for layer_name in level.into or []:
+                etch_layers[tuple(levels[layer_name].layer)].append(
+                    (tuple(level.layer), level.derived_layer)
+                )
+
+    grown_layers = {
+        tuple(level.layer)
+        for level in levels.values()
+        if level.layer
+        and level.layer_type == "grow"
+        and tuple(level.layer) not in etch_layers
+    }
+    component_derived, _ = _get_cell_with_derived_layers(
+        component, grown_layers, dict(etch_layers), {}
+    )
     component_derived.add_ports(component.ports)
     return component_derived
 
@@ -11,7 +11,7 @@ import gdstk
 from gdsfactory.component import _timestamp2019
 from gdsfactory.config import PATH, logger
 from gdsfactory.name import clean_name
-from gdsfactory.read.import_gds import import_gds
+from gdsfactory.read.import_gds import _get_top_cellnames, get_gds_index, import_gds
 from gdsfactory.typings import PathType
 
 script_prefix = """
@@ -164,9 +164,8 @@ def write_cells(
         gdspaths: dict of cell name to gdspath.
 
     """
-    cell = gdstk.read_gds(gdspath)
-    top_level_cells = cell.top_level()
-    top_cellnames = [c.name for c in top_level_cells]
+    top_cellnames = _get_top_cellnames(get_gds_index(gdspath))
+    top_level_cells = gdstk.read_gds(gdspath).top_level() if recursively else []
 
     dirpath = dirpath or pathlib.Path.cwd()
     dirpath = pathlib.Path(dirpath).absolute()
@@ -176,7 +175,7 @@ def write_cells(
     components = {}
 
     for cellname in top_cellnames:
-        c = import_gds(gdspath=gdspath, cellname=cellname)
+        c = import_gds(gdspath=gdspath, cellname=cellname, lazy=True)
         if flatten:
             c = c.flatten()
         components[cellname] = c
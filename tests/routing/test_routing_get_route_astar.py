@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import warnings
+
+import numpy as np
+import pytest
+
 import gdsfactory as gf
 
 
@@ -32,6 +37,170 @@ def test_astar_pass() -> None:
     assert route.length == route_length, print(f"route_length = {route.length}")
 
 
+def test_astar_bend_penalty() -> None:
+    """Penalizing bends trades a slightly longer route for fewer bends."""
+    c = gf.Component()
+    w = gf.components.straight()
+    left = c << w
+    right = c << w
+    right.move((100, 80))
+
+    obstacle = gf.components.rectangle(size=(100, 10))
+    obstacle1 = c << obstacle
+    obstacle2 = c << obstacle
+    obstacle1.ymin = 40
+    obstacle2.xmin = 25
+
+    routes = [
+        gf.routing.get_route_astar(
+            component=c,
+            port1=left.ports["o2"],
+            port2=right.ports["o2"],
+            resolution=5,
+            distance=5.5,
+            radius=5,
+            bend_penalty=bend_penalty,
+        )
+        for bend_penalty in [0, 5]
+    ]
+    bends = [
+        sum(ref.parent.name.startswith("bend") for ref in route.references)
+        for route in routes
+    ]
+    assert bends == [6, 4], bends
+    assert [route.length for route in routes] == [179.908, 183.272]
+
+
+def obstacle_field(size: float = 2000, seed: int = 0) -> gf.Component:
+    """Returns 2 straights on both sides of a field of obstacles and walls."""
+    c = gf.Component()
+    w = gf.components.straight()
+    left = c << w
+    right = c << w
+    left.movey(size / 2)
+    right.move((size - 10, size / 2))
+
+    rng = np.random.default_rng(seed)
+    for obstacle_size in [(100, 10), (10, 100)]:
+        obstacle = gf.components.rectangle(size=obstacle_size)
+        for xy in rng.uniform(50, size - 150, (200, 2)):
+            ref = c << obstacle
+            ref.move(tuple(xy))
+
+    wall = gf.components.rectangle(size=(10, size * 0.45))
+    for x, y in [(size / 4, size * 0.55), (size / 2, 0), (size * 3 / 4, size * 0.55)]:
+        ref = c << wall
+        ref.move((x, y))
+
+    c.add_ports([left.ports["o2"], right.ports["o1"]])
+    return c
+
+
+@pytest.mark.parametrize("jump_point_search", [False, True])
+def test_astar_obstacle_field(jump_point_search: bool) -> None:
+    """Routes across a 2mm x 2mm obstacle field."""
+    c = obstacle_field()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        route = gf.routing.get_route_astar(
+            component=c,
+            port1=c.ports["o2"],
+            port2=c.ports["o1"],
+            resolution=5,
+            distance=5,
+            radius=5,
+            bend_penalty=5,
+            jump_point_search=jump_point_search,
+        )
+    assert route.length == 2566.452, route.length
+
+
+def test_astar_multiple_nets() -> None:
+    c = gf.Component()
+    for size, xy in [((50, 100), (250, -150)), ((50, 100), (250, 800))]:
+        ref = c << gf.components.rectangle(size=size)
+        ref.move(xy)
+
+    pad = gf.components.straight(length=10, cross_section="metal_routing")
+    ports1 = []
+    ports2 = []
+    for i in range(8):
+        left = c << pad
+        right = c << pad
+        left.move((-20, 50 * i))
+        right.move((600, 100 * i))
+        ports1.append(left.ports["e2"])
+        ports2.append(right.ports["e1"])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        routes = gf.routing.get_routes_astar(
+            component=c,
+            ports1=ports1,
+            ports2=ports2,
+            resolution=5,
+            distance=2,
+            bend_penalty=5,
+            cross_section="metal_routing",
+        )
+    assert len(routes) == 8
+
+    # routes do not overlap each other
+    polygons = []
+    for route in routes:
+        route_component = gf.Component()
+        route_component.add(route.references)
+        polygons.append(route_component.get_polygons(as_shapely_merged=True))
+    for i, polygon1 in enumerate(polygons):
+        for polygon2 in polygons[i + 1 :]:
+            assert polygon1.intersection(polygon2).area == 0
+
+
+def test_astar_rip_up_and_reroute() -> None:
+    """Net a blocks net b inside a box, so it needs to be rerouted around it."""
+    c = gf.Component()
+    walls = [
+        ((80, 5), (60, 60)),
+        ((80, 5), (60, -65)),
+        ((5, 55), (55, 10)),
+        ((5, 55), (55, -65)),
+        ((5, 55), (140, 10)),
+        ((5, 55), (140, -65)),
+    ]
+    for size, xy in walls:
+        ref = c << gf.components.rectangle(size=size)
+        ref.move(xy)
+
+    pad = gf.components.straight(length=10, cross_section="metal_routing")
+    a1 = c << pad
+    a2 = c << pad
+    b1 = c << pad
+    b2 = c << pad
+    a1.move((-10, 0))
+    a2.move((200, 0))
+    b1.rotate(90).move((80, -50))
+    b2.rotate(-90).move((120, 50))
+
+    kwargs = dict(
+        component=c,
+        ports1=[a1.ports["e2"], b1.ports["e2"]],
+        ports2=[a2.ports["e1"], b2.ports["e2"]],
+        resolution=5,
+        distance=1,
+        bend_penalty=5,
+        cross_section="metal_routing",
+        net_order=None,
+    )
+    with pytest.warns(UserWarning, match="A\\* algorithm failed"):
+        gf.routing.get_routes_astar(max_reroutes=0, **kwargs)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        routes = gf.routing.get_routes_astar(**kwargs)
+    assert [route.length for route in routes] == [300, 120]
+
+
 # @cell
 # def test_astar_fail() -> Component:
 #     c = gf.Component()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.routing.get_bundle import _get_bundle_waypoints
+from gdsfactory.routing.manhattan import (
+    generate_manhattan_waypoints,
+    generate_manhattan_waypoints_batch,
+)
+
+
+def _random_ports(n: int, seed: int = 0) -> tuple[list[gf.Port], list[gf.Port]]:
+    rng = np.random.default_rng(seed)
+    centers1 = rng.uniform(-100, 100, (n, 2)).round(1)
+    centers2 = rng.uniform(-100, 100, (n, 2)).round(1)
+    # aligned ports exercise the threshold comparisons
+    centers2[::7, 1] = centers1[::7, 1]
+    centers2[::11, 0] = centers1[::11, 0]
+    orientations1 = rng.choice([0, 90, 180, 270], n)
+    orientations2 = rng.choice([0, 90, 180, 270], n)
+    ports1 = [
+        gf.Port(f"a{i}", center=c, width=0.5, orientation=o, layer=(1, 0))
+        for i, (c, o) in enumerate(zip(centers1, orientations1))
+    ]
+    ports2 = [
+        gf.Port(f"b{i}", center=c, width=0.5, orientation=o, layer=(1, 0))
+        for i, (c, o) in enumerate(zip(centers2, orientations2))
+    ]
+    return ports1, ports2
+
+
+@pytest.mark.parametrize("end_straight_length", [None, 0, 5.0, "per_route"])
+def test_generate_manhattan_waypoints_batch(end_straight_length) -> None:
+    ports1, ports2 = _random_ports(1000)
+    if end_straight_length == "per_route":
+        end_straight_length = [5.0 * (i % 3) for i in range(len(ports1))]
+        end_straight_lengths = end_straight_length
+    else:
+        end_straight_lengths = [end_straight_length] * len(ports1)
+
+    waypoints = generate_manhattan_waypoints_batch(
+        ports1, ports2, end_straight_length=end_straight_length
+    )
+    assert len(waypoints) == len(ports1)
+    for port1, port2, length, points in zip(
+        ports1, ports2, end_straight_lengths, waypoints
+    ):
+        expected = generate_manhattan_waypoints(
+            port1, port2, end_straight_length=length
+        )
+        assert points.shape == expected.shape
+        np.testing.assert_allclose(points, expected, atol=1e-9)
+
+
+def test_generate_manhattan_waypoints_batch_no_orientation() -> None:
+    ports1 = [
+        gf.Port("a0", center=(0, 0), width=0.5, orientation=None, layer=(1, 0)),
+        gf.Port("a1", center=(0, 10), width=0.5, orientation=0, layer=(1, 0)),
+    ]
+    ports2 = [
+        gf.Port("b0", center=(50, 50), width=0.5, orientation=None, layer=(1, 0)),
+        gf.Port("b1", center=(100, 50), width=0.5, orientation=180, layer=(1, 0)),
+    ]
+    waypoints = generate_manhattan_waypoints_batch(ports1, ports2)
+    assert waypoints[0].tolist() == [[0, 0], [0, 50], [50, 50]]
+    np.testing.assert_allclose(
+        waypoints[1], generate_manhattan_waypoints(ports1[1], ports2[1])
+    )
+
+
+def test_get_bundle_waypoints_batch() -> None:
+    n = 64
+    ports1 = [
+        gf.Port(f"a{i}", center=(0, 10 * i), width=0.5, orientation=90, layer=(1, 0))
+        for i in range(n)
+    ]
+    ports2 = [
+        gf.Port(
+            f"b{i}", center=(300 + 7 * i, 800), width=0.5, orientation=270, layer=(1, 0)
+        )
+        for i in range(n)
+    ]
+    routes = _get_bundle_waypoints(ports1, ports2, separation=7)
+    assert len(routes) == n
+    for port1, port2, points in zip(ports1, ports2, routes):
+        np.testing.assert_allclose(points[0], port1.center)
+        np.testing.assert_allclose(points[-1], port2.center)
+        assert np.isclose(np.diff(points, axis=0), 0).any(axis=1).all()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+import gdsfactory as gf
+
+
+def _bundle(merge_straights: bool, cross_section: str, n: int = 16) -> gf.Component:
+    c = gf.Component()
+    ports1 = [
+        gf.Port(f"a{i}", center=(0, 10 * i), width=0.5, orientation=90, layer=(1, 0))
+        for i in range(n)
+    ]
+    ports2 = [
+        gf.Port(
+            f"b{i}", center=(300 + 7 * i, 500), width=0.5, orientation=270, layer=(1, 0)
+        )
+        for i in range(n)
+    ]
+    routes = gf.routing.get_bundle(
+        ports1, ports2, cross_section=cross_section, merge_straights=merge_straights
+    )
+    for route in routes:
+        c.add(route.references)
+    c.info["lengths"] = [route.length for route in routes]
+    c.info["ports"] = [[p.to_dict() for p in route.ports] for route in routes]
+    return c
+
+
+@pytest.mark.parametrize("cross_section", ["strip", "rib", "strip_auto_widen"])
+def test_get_bundle_merge_straights(cross_section: str) -> None:
+    c1 = _bundle(merge_straights=False, cross_section=cross_section)
+    c2 = _bundle(merge_straights=True, cross_section=cross_section)
+
+    assert c1.info == c2.info
+    cells1 = c1.get_dependencies(recursive=True)
+    cells2 = c2.get_dependencies(recursive=True)
+    assert len(cells2) < len(cells1)
+    assert sum(cell.name.startswith("straight") for cell in cells2) == 0
+
+    polygons1 = c1.get_polygons(by_spec=True, as_shapely_merged=True)
+    polygons2 = c2.get_polygons(by_spec=True, as_shapely_merged=True)
+    assert set(polygons1) == set(polygons2)
+    for layer, polygon in polygons1.items():
+        assert polygon.symmetric_difference(polygons2[layer]).area < 1e-6, layer
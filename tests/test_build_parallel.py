@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import gdsfactory as gf
+from gdsfactory.cell import CACHE, set_cache
+from gdsfactory.cell_cache import ComponentCache
+
+
+def test_build_parallel() -> None:
+    specs = [
+        dict(component="mzi", settings=dict(delta_length=10 + i)) for i in range(3)
+    ]
+    specs += ["straight", specs[0]]
+
+    gf.clear_cache()
+    components = gf.build_parallel(specs, processes=2)
+    assert components[0] is components[-1]
+    assert all(c.name in CACHE for c in components)
+    assert gf.components.mzi(delta_length=10) is components[0]
+
+    gf.clear_cache()
+    for spec, c1 in zip(specs, components):
+        c2 = gf.get_component(spec)
+        assert c1.name == c2.name
+        assert c1.hash_geometry() == gf.import_gds(c2.write_gds()).hash_geometry()
+        assert list(c1.ports) == list(c2.ports)
+        assert c1.ports["o1"].center.tolist() == c2.ports["o1"].center.tolist()
+        assert c1.info == c2.info
+    gf.clear_cache()
+
+
+def test_build_parallel_set_cache() -> None:
+    cache = ComponentCache()
+    set_cache(cache)
+    try:
+        specs = [dict(component="straight", settings=dict(length=i)) for i in (3, 4)]
+        components = gf.build_parallel(specs, processes=2)
+        assert all(c.name in cache for c in components)
+        assert gf.components.straight(length=3) is components[0]
+    finally:
+        set_cache(CACHE)
+        gf.clear_cache()
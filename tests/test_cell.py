@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+
 import pytest
 from pydantic import ValidationError
 
@@ -21,6 +23,36 @@ def test_validator_error() -> None:
         _dummy2(length="error")
 
 
+def test_names_fast_path() -> None:
+    c1 = _dummy(length=3)
+    assert _dummy(length=3) is c1
+    assert _dummy(3) is c1
+    assert _dummy(length=3, cache=True) is c1
+
+    c2 = _dummy(length=3.0)
+    assert c2.name == _dummy(length=3.0, cache=True).name
+    assert c2 is not c1
+
+
+def test_cache_hit_skips_naming(monkeypatch) -> None:
+    """Cache hits skip the argument serialization used to name new cells."""
+    c = gf.components.straight(length=10)
+    cell_module = sys.modules["gdsfactory.cell"]
+    clean_value_name = cell_module.clean_value_name
+    calls = []
+
+    def _clean_value_name(value):
+        calls.append(value)
+        return clean_value_name(value)
+
+    monkeypatch.setattr(cell_module, "clean_value_name", _clean_value_name)
+    assert gf.components.straight(length=10) is c
+    assert not calls
+    assert gf.components.straight(length=10, cache=True) is c
+    assert calls
+    gf.clear_cache()
+
+
 if __name__ == "__main__":
     # test_raise_error_args()
     test_validator_error()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import gdsfactory as gf
+from gdsfactory.cell_cache import ComponentCache, DiskCache
+
+
+def test_persistent_cache(tmp_path) -> None:
+    settings = gf.get_active_pdk().cell_decorator_settings
+    settings_dir = settings.persistent_cache_dir
+    settings.persistent_cache_dir = tmp_path
+    try:
+        c1 = gf.components.mzi(delta_length=11, persistent_cache=True)
+        assert len(list(tmp_path.glob("*.gds"))) == 1
+
+        gf.clear_cache()
+        c2 = gf.components.mzi(delta_length=11, persistent_cache=True)
+        assert c2 is not c1
+        assert c2.name == c1.name
+        assert c2.settings.full == c1.settings.full
+        assert c2.info == c1.info
+        assert list(c2.ports) == list(c1.ports)
+        assert c2.hash_geometry() == gf.import_gds(c1.write_gds()).hash_geometry()
+        assert {c.name for c in c2.get_dependencies(recursive=True)} == {
+            c.name for c in c1.get_dependencies(recursive=True)
+        }
+        assert c2.get_netlist()["connections"] == c1.get_netlist()["connections"]
+
+        gf.clear_cache(persistent=True)
+        assert not tmp_path.exists()
+    finally:
+        settings.persistent_cache_dir = settings_dir
+        gf.clear_cache()
+
+
+def test_disk_cache_eviction(tmp_path) -> None:
+    disk_cache = DiskCache(dirpath=tmp_path, max_size=0)
+    disk_cache.set("straight", gf.components.straight())
+    assert "straight" not in disk_cache
+
+    disk_cache.max_size = 2**20
+    disk_cache.set("straight", gf.components.straight())
+    disk_cache.set("bend", gf.components.bend_euler())
+    assert "straight" in disk_cache
+    assert disk_cache.get("bend").name == gf.components.bend_euler().name
+
+
+def test_disk_cache_off_grid_ports(tmp_path) -> None:
+    disk_cache = DiskCache(dirpath=tmp_path)
+    c1 = gf.components.bend_euler(angle=30)
+    disk_cache.set("bend", c1)
+    c2 = disk_cache.get("bend")
+    for name, port in c1.ports.items():
+        assert list(c2.ports[name].center) == list(port.center)
+        assert c2.ports[name].orientation == port.orientation
+        assert c2.ports[name].width == port.width
+    gf.clear_cache()
+
+
+def test_component_cache_eviction() -> None:
+    cache = ComponentCache(max_size=2)
+    straight = gf.components.straight(length=1)
+    cache["straight"] = straight
+    cache["bend"] = gf.components.bend_euler()
+    assert cache.get("straight") is straight
+    cache["taper"] = gf.components.taper()
+
+    info = cache.info()
+    assert len(cache) == info.size == 2
+    assert info.evictions == 1
+    assert info.hits == 1
+    assert "bend" not in cache._data
+    assert cache.get("straight") is straight
+
+    cache.max_size = None
+    cache.max_memory = 0
+    cache.evict()
+    assert len(cache) == 0
+    # evicted components are returned while they are still alive
+    assert cache.get("straight") is straight
+
+
+def test_cache_info() -> None:
+    gf.clear_cache()
+    gf.components.straight(length=3.3)
+    gf.components.straight(length=3.3)
+    info = gf.cell.cache_info()
+    assert info.hits == 1
+    assert info.builds["straight"] == 1
+    assert info.build_time["straight"] > 0
+
+
+if __name__ == "__main__":
+    test_disk_cache_eviction()
@@ -8,6 +8,7 @@ import pytest
 from omegaconf import OmegaConf
 from pytest_regressions.data_regression import DataRegressionFixture
 
+import gdsfactory as gf
 from gdsfactory.difftest import difftest
 from gdsfactory.read.from_yaml import from_yaml, sample_doe_function, sample_mmis
 
@@ -597,6 +598,118 @@ def test_ref_names_retained_on_copy() -> None:
     assert orig_ref_names == new_ref_names
 
 
+sample_parallel = """
+name: sample_parallel
+
+instances:
+    gc_in:
+      component: grating_coupler_elliptical_trenches
+    gc_out:
+      component: grating_coupler_elliptical_trenches
+      settings:
+        polarization: tm
+    spiral:
+      component: spiral_inner_io
+      settings:
+        N: 8
+    mmi_long:
+      component: mmi1x2
+      settings:
+        length_mmi: 10
+    mmi_short:
+      component: mmi1x2
+
+placements:
+    gc_in:
+        rotation: 180
+    spiral:
+        x: 100
+    mmi_long:
+        x: 400
+        y: 100
+    mmi_short:
+        x: 400
+        y: -100
+
+routes:
+    optical:
+        links:
+            mmi_short,o2: mmi_long,o1
+
+connections:
+    gc_out,o1: mmi_long,o2
+"""
+
+
+def test_from_yaml_parallel() -> None:
+    gf.clear_cache()
+    c1 = from_yaml(sample_parallel)
+    # instances built in parallel come back through GDS, snapped to its 1nm grid
+    # (see the processes argument of from_yaml)
+    name, geometry, netlist = c1.name, c1.hash_geometry(1e-3), c1.get_netlist()
+
+    gf.clear_cache()
+    c2 = from_yaml(sample_parallel, processes=2)
+    assert c2.name == name
+    assert c2.hash_geometry(1e-3) == geometry
+    assert c2.get_netlist() == netlist
+    gf.clear_cache()
+
+
+sample_parallel_grid = """
+name: sample_parallel_grid
+
+instances:
+    mmi_in:
+      component: mmi1x2
+    mmi_out:
+      component: mmi2x2
+      settings:
+        length_mmi: 10
+    s_top:
+      component: straight
+      settings:
+        length: 20
+    s_bot:
+      component: straight
+      settings:
+        length: 30
+
+placements:
+    mmi_out:
+        x: 100
+        y: 3
+
+connections:
+    s_top,o1: mmi_in,o2
+    s_bot,o1: mmi_in,o3
+"""
+
+
+def test_from_yaml_parallel_full_precision() -> None:
+    """Instances on the 1nm grid come back from the workers unchanged."""
+    gf.clear_cache()
+    c1 = from_yaml(sample_parallel_grid)
+    geometry, netlist = c1.hash_geometry(), c1.get_netlist()
+    ports = {name: ref.ports for name, ref in c1.named_references.items()}
+    origins = {name: ref.origin for name, ref in c1.named_references.items()}
+
+    gf.clear_cache()
+    c2 = from_yaml(sample_parallel_grid, processes=2)
+    assert c2.hash_geometry() == geometry
+    assert c2.get_netlist() == netlist
+    assert c2.named_references.keys() == ports.keys()
+    for name, ref in c2.named_references.items():
+        assert np.array_equal(ref.origin, origins[name])
+        assert ref.ports.keys() == ports[name].keys()
+        for port_name, port in ref.ports.items():
+            port1 = ports[name][port_name]
+            assert np.array_equal(port.center, port1.center)
+            assert port.width == port1.width
+            assert port.orientation == port1.orientation
+    gf.clear_cache()
+
+
 if __name__ == "__main__":
     # test_connections_different_factory()
     # test_sample()
@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
+import shapely
 import trimesh
 
 import gdsfactory as gf
-from gdsfactory.export.to_3d import to_3d
+from gdsfactory.export.to_3d import _extrude_polygons, to_3d
 from gdsfactory.technology import LayerLevel, LayerStack
 
 
@@ -59,6 +61,45 @@ def test_missing_zmin_or_thickness() -> None:
         to_3d(c, layer_stack=layer_stack)
 
 
+def test_extrude_polygons_merged() -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (10, 0), (10, 10), (0, 10)], layer=(1, 0))
+    c.add_polygon([(5, 5), (15, 5), (15, 15), (5, 15)], layer=(1, 0))
+    c.add_ref(gf.components.ring(radius=5, width=1)).movex(40)
+    polygons = c.get_polygons(by_spec=(1, 0))
+
+    mesh = _extrude_polygons(polygons, height=2, zmin=1)
+    area = shapely.union_all([shapely.Polygon(p) for p in polygons]).area
+    assert mesh.is_watertight
+    assert mesh.is_winding_consistent
+    assert np.isclose(mesh.volume, 2 * area)
+    assert np.allclose(mesh.bounds[:, 2], [1, 3])
+
+
+def test_extrude_polygons_make_valid() -> None:
+    bowtie = np.array([(0, 0), (20, 10), (20, 0), (0, 10)])
+    square = np.array([(30, 0), (40, 0), (40, 10), (30, 10)])
+
+    mesh = _extrude_polygons([bowtie, square], height=1, hull_invalid_polygons=False)
+    area = shapely.make_valid(shapely.Polygon(bowtie)).area + 100
+    assert np.isclose(area, 200)
+    assert mesh.is_watertight
+    assert np.isclose(mesh.volume, area)
+
+
+def test_to_3d_one_mesh_per_layer() -> None:
+    c = gf.grid(
+        [
+            gf.components.grating_coupler_elliptical_trenches(polarization=p)
+            for p in ["te", "tm"] * 10
+        ]
+    )
+    scene = to_3d(c)
+    assert len(scene.geometry) == 2
+    assert all(mesh.is_watertight for mesh in scene.geometry.values())
+    gf.clear_cache()
+
+
 if __name__ == "__main__":
     # test_no_polygons_defined()
     # test_exclude_layers()
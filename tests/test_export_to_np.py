@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import gdstk
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.export.to_np import rasterize_polygons, to_np
+
+
+def test_rasterize_polygons_union() -> None:
+    square = np.array([(0, 0), (4, 0), (4, 4), (0, 4)])
+    # overlapping polygons with opposite orientations and a sliver without
+    # any pixel center inside
+    polygons = [square, square[::-1] + 2, np.array([(6, 6), (8, 6), (8, 6.4)])]
+    raster = rasterize_polygons(polygons, shape=(8, 8))
+    assert raster.shape == (8, 8)
+    assert raster.sum() == 16 + 16 - 4 + 0.0
+    assert raster[0, 0] == raster[5, 5] == 1
+    assert raster[0, 5] == 0
+
+
+def test_to_np_antialias() -> None:
+    c = gf.components.bend_circular()
+    nm_per_pixel = 20
+    img = to_np(c, nm_per_pixel=nm_per_pixel, antialias=8)
+    area = img.sum() * (nm_per_pixel * 1e-3) ** 2
+    polygons = gdstk.boolean(c.get_polygons(by_spec=(1, 0)), [], "or")
+    assert np.isclose(area, sum(p.area() for p in polygons), rtol=1e-3)
+    assert 0 < img[(img > 0) & (img < 1)].size < img[img == 1].size
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_to_np_tiles(processes: int, tmp_path) -> None:
+    c = gf.components.straight_heater_metal()
+    layers = ((47, 0), (1, 0))
+    img = to_np(c, layers=layers, values=(2, 1), tile_size=10000)
+    assert set(np.unique(img)) == {0, 1, 2}
+
+    filepath = tmp_path / "straight_heater_metal.npy"
+    img_tiles = to_np(
+        c,
+        layers=layers,
+        values=(2, 1),
+        tile_size=300,
+        processes=processes,
+        filepath=filepath,
+    )
+    assert np.array_equal(img, img_tiles)
+    assert np.array_equal(img, np.load(filepath))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.read import get_gds_info
+from gdsfactory.write_cells import write_cells
+
+
+@pytest.mark.parametrize("suffix", [".gds", ".oas"])
+def test_get_gds_info(tmp_path, suffix: str) -> None:
+    c = gf.components.mzi_phase_shifter_top_heater_metal()
+    gdspath = tmp_path / f"mzi{suffix}"
+    if suffix == ".gds":
+        c.write_gds(gdspath=gdspath)
+    else:
+        c.write_oas(gdspath)
+
+    info = get_gds_info(gdspath)
+    assert info["top_cells"] == [c.name]
+    assert info["unit"] == 1e-6
+
+    components = {c.name: c} | {d.name: d for d in c.get_dependencies(True)}
+    assert set(info["cells"]) == set(components)
+    for name, component in components.items():
+        cell = info["cells"][name]
+        assert set(cell["dependencies"]) == {
+            d.name for d in component.get_dependencies()
+        }
+        np.testing.assert_allclose(cell["bbox"], component.bbox, atol=1e-3)
+        assert {tuple(layer) for layer in cell["layers"]} == component.get_layers()
+
+    assert get_gds_info(gdspath) == info
+    gf.clear_cache()
+
+
+def test_write_cells(tmp_path) -> None:
+    gdspath = gf.PATH.gdsdir / "alphabet_3top_cells.gds"
+    gdspaths = write_cells(gdspath=gdspath, dirpath=tmp_path, recursively=False)
+    assert len(gdspaths) == 3, len(gdspaths)
+    gf.clear_cache()
@@ -168,6 +168,28 @@ def test_get_netlist_throws_error_bad_rotation() -> None:
         c.get_netlist(tolerance=2)
 
 
+def test_get_netlist_throws_error_bad_rotation_kdtree() -> None:
+    c = gf.Component()
+    i1 = c.add_ref(gf.components.straight(), "i1")
+    i2 = c.add_ref(gf.components.straight(), "i2")
+    i2.move("o2", destination=i1.ports["o1"])
+    i2.rotate(angle=90, center="o2")
+    with pytest.raises(ValueError):
+        c.get_netlist(tolerance=2, engine="kdtree")
+
+
+@pytest.mark.parametrize(
+    "component_name", ["mzi", "ring_single", "mzit", "spiral_inner_io"]
+)
+@pytest.mark.parametrize("tolerance", [0, 1, 5])
+def test_get_netlist_engines(component_name: str, tolerance: int) -> None:
+    c = gf.get_component(component_name)
+    n1 = c.get_netlist(tolerance=tolerance)
+    n2 = c.get_netlist(tolerance=tolerance, engine="kdtree")
+    assert n1["connections"] == n2["connections"]
+    assert n1.get("warnings") == n2.get("warnings")
+
+
 def test_get_netlist_tiny() -> None:
     c = gf.Component()
     cc = gf.components.straight(length=0.002)
@@ -305,6 +327,47 @@ def test_get_netlist_transformed() -> None:
     assert i2_netlist["placements"][None]["rotation"] == rotation_value
 
 
+def test_get_netlist_recursive_memoized() -> None:
+    c = gf.Component("test_get_netlist_recursive_memoized")
+    mzi = c << gf.components.mzi()
+    ring = c << gf.components.ring_single()
+    ring.connect("o1", mzi.ports["o2"])
+    n1 = get_netlist_recursive(c)
+    assert mzi.parent._netlists
+    assert not c._netlists
+
+    n1[mzi.parent.name]["connections"].clear()
+    ring.movex(10)
+    n2 = get_netlist_recursive(c)
+    assert n2[mzi.parent.name] == get_netlist_recursive(mzi.parent)[mzi.parent.name]
+    assert n2[mzi.parent.name]["connections"]
+    assert n2[c.name]["placements"] != n1[c.name]["placements"]
+
+    mzi.parent.unlock()
+    assert not mzi.parent._netlists
+    mzi.parent.lock()
+
+
+def test_get_netlist_recursive_memoized_child_changed() -> None:
+    child = gf.Component("test_get_netlist_recursive_child")
+    s1 = child << gf.components.straight()
+    top = gf.Component("test_get_netlist_recursive_top")
+    top << child
+    child.lock()
+    top.lock()
+    n1 = get_netlist_recursive(top)
+    assert not n1[child.name]["connections"]
+
+    child.unlock()
+    s2 = child << gf.components.straight()
+    s2.connect("o1", s1.ports["o2"])
+    child.lock()
+    n2 = get_netlist_recursive(top)
+    assert n2[child.name] == get_netlist_recursive(child)[child.name]
+    assert n2[child.name]["connections"]
+    gf.clear_cache()
+
+
 if __name__ == "__main__":
     # c = gf.c.array()
     # n = c.get_netlist()
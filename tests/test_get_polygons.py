@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import shapely as sp
+
+import gdsfactory as gf
+from gdsfactory.component_layout import PackedPolygons, union_polygons
+
+
+@pytest.mark.parametrize("depth", [None, 0, 1])
+def test_get_polygons_by_spec(depth: int | None) -> None:
+    c = gf.components.mzi_phase_shifter_top_heater_metal()
+    ref = gf.Component().add_ref(c).rotate(30)
+
+    for instance in [c, ref]:
+        polygons = instance.get_polygons(by_spec=True, depth=depth)
+        packed = instance.get_polygons(by_spec=True, depth=depth, as_packed=True)
+        assert set(polygons) == set(packed)
+
+        for layer, points_list in polygons.items():
+            expected = instance.get_polygons(by_spec=layer, depth=depth)
+            assert len(points_list) == len(expected) == len(packed[layer])
+            for points, points_packed, points_expected in zip(
+                points_list, packed[layer], expected
+            ):
+                np.testing.assert_array_equal(points, points_expected)
+                np.testing.assert_array_equal(points_packed, points_expected)
+
+
+def test_packed_polygons() -> None:
+    c = gf.components.straight()
+    packed = c.get_polygons(by_spec=(1, 0), as_packed=True)
+    assert isinstance(packed, PackedPolygons)
+    assert len(packed) == 1
+    assert packed.offsets.tolist() == [0, 4]
+    assert packed.points.shape == (4, 2)
+
+    empty = c.get_polygons(by_spec=(1000, 0), as_packed=True)
+    assert len(empty) == 0
+    assert empty.points.shape == (0, 2)
+
+
+def _fill(size: float, fill_density: float) -> gf.Component:
+    c = gf.Component()
+    c << gf.components.rectangle(size=(size, size), layer=(1, 0))
+    return gf.fill_rectangle(
+        c,
+        fill_layers=[(2, 0)],
+        fill_size=(2, 2),
+        avoid_layers=[(3, 0)],
+        fill_densities=[fill_density],
+        margin=0,
+    )
+
+
+@pytest.mark.parametrize("fill_density", [0.5, 1.0])
+def test_union_polygons(fill_density: float) -> None:
+    c = gf.Component()
+    c << _fill(size=40, fill_density=fill_density)
+    c.add_polygon([(0, 0), (40, 0), (0, 40)], layer=(2, 0))
+    polygons = c.get_polygons(as_shapely=True)
+    merged = c.get_polygons(as_shapely_merged=True)
+
+    expected = sp.Polygon()
+    for polygon in polygons:
+        expected = expected | polygon
+    assert np.isclose(merged.area, expected.area)
+    assert sp.equals(merged, expected)
+    assert sp.equals(union_polygons(polygons, max_workers=2), expected)
+
+    merged_by_layer = c.get_polygons(by_spec=True, as_shapely_merged=True)
+    assert np.isclose(merged_by_layer[(2, 0)].area, expected.area)
+
+
+def test_union_polygons_large_fill() -> None:
+    polygons = _fill(size=400, fill_density=0.9).get_polygons(as_shapely=True)
+    assert len(polygons) == 40000
+
+    merged = union_polygons(polygons)
+    assert np.isclose(merged.area, 40000 * 2 * 2 * 0.9)
@@ -13,6 +13,57 @@ def test_hash_geometry() -> None:
     assert h1 != h2
 
 
+def _array(columns: int = 3, rotation: float = 0, spacing: float = 20) -> gf.Component:
+    c = gf.Component()
+    c.add_ref(gf.components.mzi()).rotate(rotation)
+    c.add_array(gf.components.straight(), columns=columns, spacing=(spacing, 0))
+    return c
+
+
+def test_hash_geometry_hierarchical() -> None:
+    h = _array().hash_geometry(hierarchical=True)
+    assert h == _array().hash_geometry(hierarchical=True)
+    assert h != _array(columns=4).hash_geometry(hierarchical=True)
+    assert h != _array(rotation=90).hash_geometry(hierarchical=True)
+    assert h != _array(spacing=21).hash_geometry(hierarchical=True)
+
+    # independent of the order of the references
+    c = gf.Component()
+    c.add_array(gf.components.straight(), columns=3, spacing=(20, 0))
+    c.add_ref(gf.components.mzi())
+    assert h == c.hash_geometry(hierarchical=True)
+
+
+def test_hash_geometry_hierarchical_cache() -> None:
+    c = gf.components.mzi(delta_length=12.3)
+    h = c.hash_geometry(hierarchical=True)
+    assert c._geometry_hashes
+    assert c.hash_geometry(hierarchical=True) == h
+
+    c.unlock()
+    assert not c._geometry_hashes
+    c.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(1, 0))
+    assert c.hash_geometry(hierarchical=True) != h
+    assert not c._geometry_hashes
+    gf.clear_cache()
+
+
+def test_hash_geometry_hierarchical_cache_child_changed() -> None:
+    child = gf.Component("test_hash_child")
+    child.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(1, 0))
+    top = gf.Component("test_hash_top")
+    top << child
+    child.lock()
+    top.lock()
+    h = top.hash_geometry(hierarchical=True)
+
+    child.unlock()
+    child.add_polygon([(0, 0), (-1, 0), (-1, -1)], layer=(1, 0))
+    child.lock()
+    assert top.hash_geometry(hierarchical=True) != h
+    assert top.hash_geometry(hierarchical=True) == top.hash_geometry(hierarchical=True)
+
+
 def _test_hash_array_file() -> None:
     """Test hash of a component with an array of references."""
     c = gf.Component("array")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.config import PATH
+from gdsfactory.read.import_gds import (
+    _get_gds_index_path,
+    get_gds_index,
+    import_gds,
+)
+
+
+@pytest.fixture(autouse=True)
+def gds_index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(PATH, "gds_index", tmp_path / "gds_index")
+
+
+def test_import_gds_lazy(tmp_path) -> None:
+    c0 = gf.components.mzi_phase_shifter_top_heater_metal()
+    gdspath = c0.write_gds(gdspath=tmp_path / "mzi.gds")
+    cellname = c0.references[0].parent.name
+
+    index = get_gds_index(gdspath)
+    assert _get_gds_index_path(gdspath).exists()
+    assert list(tmp_path.glob("mzi*")) == [gdspath], "nothing next to the GDS"
+    assert set(index["cells"]) == {c.name for c in c0.get_dependencies(True)} | {
+        c0.name
+    }
+
+    gf.clear_cache()
+    c1 = import_gds(gdspath, cellname=cellname)
+    gf.clear_cache()
+    c2 = import_gds(gdspath, cellname=cellname, lazy=True)
+    assert c2.name == c1.name
+    assert c2.hash_geometry() == c1.hash_geometry()
+    assert {c.name for c in c2.get_dependencies(True)} == {
+        c.name for c in c1.get_dependencies(True)
+    }
+
+    gf.clear_cache()
+    c3 = import_gds(gdspath, lazy=True)
+    assert c3.name == c0.name
+    assert c3.hash_geometry() == gf.import_gds(gdspath).hash_geometry()
+    gf.clear_cache()
+
+
+def test_gds_index_cache(tmp_path) -> None:
+    gdspath = gf.components.straight().write_gds(gdspath=tmp_path / "a.gds")
+    index_path = _get_gds_index_path(gdspath)
+    index = get_gds_index(gdspath)
+    os.utime(index_path, ns=(0, 0))
+    assert get_gds_index(gdspath) == index
+    assert os.stat(index_path).st_mtime_ns == 0
+
+    # a new file invalidates the index
+    gf.components.bend_euler().write_gds(gdspath=gdspath)
+    index = get_gds_index(gdspath)
+    assert "bend_euler" in index["cells"]
+    with pytest.raises(ValueError, match="is not in file"):
+        import_gds(gdspath, cellname="straight", lazy=True)
+    gf.clear_cache()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import types
+
+import pytest
+
+import gdsfactory as gf
+
+IMPORT_TIME_BUDGET = 2.0  # seconds
+
+script = """
+import sys
+import time
+
+t0 = time.perf_counter()
+import gdsfactory
+elapsed = time.perf_counter() - t0
+
+heavy = ["gdsfactory.components", "gdsfactory.routing", "gdsfactory.read"]
+print(elapsed, *[name for name in heavy if name in sys.modules])
+"""
+
+
+def test_import_time() -> None:
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    ).stdout.split()
+    elapsed, loaded = float(output[0]), output[1:]
+    assert not loaded, f"import gdsfactory loads {loaded}"
+    assert elapsed < IMPORT_TIME_BUDGET, f"import gdsfactory took {elapsed:.2f}s"
+
+
+def test_lazy_attributes() -> None:
+    for name in gf.__all__:
+        assert getattr(gf, name) is not None, name
+    assert gf.c is gf.components
+    assert "components" in dir(gf)
+
+
+def test_lazy_attributes_shadowed_by_submodules() -> None:
+    import gdsfactory.grid
+    import gdsfactory.pack
+
+    assert not isinstance(gf.pack, types.ModuleType)
+    assert not isinstance(gf.grid, types.ModuleType)
+    assert gf.pack is sys.modules["gdsfactory.pack"].pack
+
+
+# after importing any submodule first, names imported from the components and
+# routing packages are bound to the functions, not to submodules of the same name
+submodule_first_script = """
+import sys
+import types
+
+import gdsfactory.{module}
+import gdsfactory.components
+import gdsfactory.routing
+
+for package in (gdsfactory.components, gdsfactory.routing):
+    for name in package.__all__:
+        if isinstance(getattr(package, name), types.ModuleType):
+            continue
+        submodule = f"{{package.__name__}}.{{name}}"
+        for module_name, module in list(sys.modules.items()):
+            if not module_name.startswith("gdsfactory"):
+                continue
+            value = vars(module).get(name)
+            is_submodule = isinstance(value, types.ModuleType)
+            assert not (is_submodule and value.__name__ == submodule), (
+                f"{{module_name}}.{{name}} is the module {{submodule}}"
+            )
+"""
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "functions",
+        "grid",
+        "pack",
+        "components",
+        "routing",
+        "routing.manhattan",
+        "read",
+    ],
+)
+def test_import_submodule_first(module: str) -> None:
+    subprocess.run(
+        [sys.executable, "-c", submodule_first_script.format(module=module)],
+        check=True,
+    )
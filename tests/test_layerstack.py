@@ -1,5 +1,8 @@
+import gdstk
+
+import gdsfactory as gf
 from gdsfactory.components import straight_heater_metal
-from gdsfactory.generic_tech import LAYER_STACK
+from gdsfactory.generic_tech import LAYER, LAYER_STACK
 
 
 def test_layerstack() -> None:
@@ -36,5 +39,35 @@ def test_component_with_net_layers():
             assert getattr(old_layer, varname) == getattr(new_layer, varname)
 
 
+def test_component_with_derived_layers_hierarchy() -> None:
+    gc = gf.components.grating_coupler_elliptical_trenches()
+    taper = gf.components.taper_strip_to_ridge_trenches()
+    c = gf.Component("derived_layers_hierarchy")
+    c.add_ref(gc).rotate(90).movex(100)
+    c.add_ref(gc).mirror().movey(100)
+    c.add_ref(gc, columns=3, rows=1, spacing=(60, 0)).movey(-100)
+    # overlapping instances of the same array
+    c.add_ref(taper, columns=2, rows=1, spacing=(5, 0)).movey(200)
+    # etch in the parent cell crossing the straight
+    c.add_ref(gf.components.straight(length=20)).movey(-200)
+    c.add_polygon([(5, -202), (10, -202), (10, -198), (5, -198)], LAYER.SHALLOW_ETCH)
+
+    derived = LAYER_STACK.get_component_with_derived_layers(c)
+    derived_flat = LAYER_STACK.get_component_with_derived_layers(c.flatten())
+    # all the grating couplers reuse the same derived cell
+    assert len({r.parent.name for r in derived.references}) == 1
+    assert derived.references[0].parent.name.startswith(f"{gc.name}_derived")
+
+    polygons = derived.get_polygons(by_spec=True)
+    polygons_flat = derived_flat.get_polygons(by_spec=True)
+    assert set(polygons) == set(polygons_flat)
+    assert LAYER.SLAB150 in polygons
+    for layer, layer_polygons in polygons.items():
+        xor = gdstk.boolean(layer_polygons, polygons_flat[layer], "xor")
+        area = sum(p.area() for p in gdstk.boolean(layer_polygons, [], "or"))
+        assert sum(p.area() for p in xor) < 1e-5 * area, layer
+    gf.clear_cache()
+
+
 if __name__ == "__main__":
     test_component_with_net_layers()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import shapely as sp
+
+import gdsfactory as gf
+from gdsfactory.pack import _pack_skyline
+
+
+def _assert_no_overlaps(c: gf.Component) -> None:
+    boxes = [sp.box(*ref.bbox.ravel()) for ref in c.references]
+    union = sp.union_all(boxes)
+    assert np.isclose(union.area, sum(box.area for box in boxes))
+
+
+@pytest.mark.parametrize("engine", ["rectpack", "skyline"])
+def test_pack_engine(engine: str) -> None:
+    components = [
+        gf.components.rectangle(size=(i, 10 + i % 7), port_type=None)
+        for i in range(1, 30)
+    ]
+    packed = gf.pack(components, spacing=1.0, engine=engine)
+    assert len(packed) == 1
+    c = packed[0]
+    assert len(c.references) == len(components)
+    assert "packing_efficiency" not in c.info
+    area = sum(ref.xsize * ref.ysize for ref in c.references)
+    assert 0.5 < area / (c.xsize * c.ysize) <= 1
+    _assert_no_overlaps(c)
+
+
+def test_pack_skyline_max_size() -> None:
+    components = [
+        gf.components.rectangle(size=(10 + i % 13, 10 + i % 5), port_type=None)
+        for i in range(100)
+    ]
+    with pytest.warns(UserWarning, match="unable to pack in one component"):
+        packed = gf.pack(components, max_size=(60, 60), spacing=1, engine="skyline")
+    assert len(packed) > 1
+    assert sum(len(c.references) for c in packed) == len(components)
+    for c in packed:
+        assert c.xsize <= 61 and c.ysize <= 61
+        _assert_no_overlaps(c)
+
+
+def test_pack_skyline_large() -> None:
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(10, 300, (10000, 2))
+    rect_dict = {i: (w, h) for i, (w, h) in enumerate(sizes)}
+
+    packed_list = _pack_skyline(
+        rect_dict,
+        aspect_ratio=(1, 1),
+        max_size=(np.inf, np.inf),
+        sort_by_area=True,
+        density=1.1,
+    )
+
+    assert len(packed_list) == 1
+    rects = np.array(list(packed_list[0].values()))
+    assert len(rects) == len(rect_dict)
+    xmax, ymax = np.max(rects[:, :2] + rects[:, 2:], axis=0)
+    assert np.sum(rects[:, 2] * rects[:, 3]) / (xmax * ymax) > 0.85
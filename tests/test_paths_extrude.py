@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 import gdsfactory as gf
 from gdsfactory import Section
 from gdsfactory.generic_tech import LAYER
@@ -123,5 +125,86 @@ def test_diagonal_extrude_consistent_naming():
     assert c.name == expected_name
 
 
+def _bundle_paths(n: int = 256) -> list[gf.Path]:
+    return [
+        gf.path.smooth(
+            [
+                (0, 5 * i),
+                (100 + 5 * i, 5 * i),
+                (100 + 5 * i, 3000 + 5 * i),
+                (3000, 3000 + 5 * i),
+            ],
+            radius=10,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize(
+    "cross_section",
+    [
+        "strip",
+        "rib",
+        "pin",
+        "rib_with_trenches",
+        "strip_heater_metal",
+        gf.cross_section.strip(offset=1, mirror=True),
+        gf.path.transition(gf.cross_section.strip(), gf.cross_section.strip(width=2)),
+    ],
+)
+def test_extrude_many(cross_section) -> None:
+    paths = _bundle_paths(n=3) + [[(0, 0), (10, 0), (10, 5.5)]]
+    components = gf.path.extrude_many(paths, cross_section=cross_section)
+    c = gf.path.extrude_many(paths, cross_section=cross_section, as_list=False)
+
+    for i, (p, c1) in enumerate(zip(paths, components)):
+        c2 = gf.path.extrude(gf.Path(p), cross_section=cross_section)
+        assert c1.hash_geometry() == c2.hash_geometry()
+        assert c1.info == c2.info
+        assert list(c1.ports) == list(c2.ports)
+        for port_name, port in c2.ports.items():
+            assert c1.ports[port_name].to_dict() == port.to_dict()
+            assert c.ports[f"{port_name}_{i}"].center.tolist() == port.center.tolist()
+
+
+def test_extrude_many_bundle() -> None:
+    paths = _bundle_paths()
+    components = [gf.path.extrude(p, cross_section="strip") for p in paths]
+    c = gf.path.extrude_many(paths, cross_section="strip", as_list=False)
+
+    assert len(c.ports) == 2 * len(paths)
+    assert c.area() == pytest.approx(sum(c.area() for c in components))
+
+
+def test_extrude_many_names() -> None:
+    paths = _bundle_paths(n=3)
+    components = gf.path.extrude_many(paths, cross_section="strip")
+    assert len({c.name for c in components}) == 3
+    assert not any(c.name.startswith("Unnamed") for c in components)
+    assert gf.path.extrude_many(paths[1:2], cross_section="strip")[0] is components[1]
+
+    c = gf.path.extrude_many(paths, cross_section="strip", as_list=False)
+    assert c is gf.path.extrude_many(paths, cross_section="strip", as_list=False)
+
+    gf.clear_cache()
+    names = [c.name for c in gf.path.extrude_many(paths, cross_section="strip")]
+    assert names == [c.name for c in components]
+    gf.clear_cache()
+
+
+def test_extrude_many_names_vias() -> None:
+    via = gf.cross_section.ComponentAlongPath(component=gf.components.via1(), spacing=5)
+    x = gf.CrossSection(width=0.5, layer=(1, 0), vias=[via])
+    paths = _bundle_paths(n=3)
+    components = gf.path.extrude_many(paths, cross_section=x)
+    assert all(c.name.startswith("extrude_many_") for c in components)
+    assert len({c.name for c in components}) == 3
+    assert gf.path.extrude_many(paths[1:2], cross_section=x)[0] is components[1]
+    for p, c in zip(paths, components):
+        assert c.references
+        assert c.hash_geometry() == gf.path.extrude(p, cross_section=x).hash_geometry()
+    gf.clear_cache()
+
+
 if __name__ == "__main__":
     test_transition_cross_section()
@@ -42,6 +42,36 @@ def test_rotate_port() -> None:
     # assert port_orientation_actual_no_orientation is None, port_orientation_actual_no_orientation
 
 
+def test_reference_ports_transform() -> None:
+    c = gf.Component()
+    ref = c << gf.components.mmi2x2()
+    expected = {
+        name: ref._transform_port(
+            port.center, port.orientation, ref.origin, ref.rotation, ref.x_reflection
+        )
+        for name, port in ref.parent.ports.items()
+    }
+    for name, (center, orientation) in expected.items():
+        npt.assert_almost_equal(ref.ports[name].center, center)
+        assert ref.ports[name].orientation == orientation
+
+    ref.ports["o1"].orientation = 0
+    assert ref.ports["o1"].orientation == 180, "cached ports are restored"
+
+    x = ref.ports["o1"].x
+    ref.ports["o1"].center[0] += 100
+    assert ref.ports["o1"].x == x, "cached centers are not shared"
+    assert ref.get_ports_list()[0].x == x
+
+    ref.mirror().rotate(30).move((3, 4))
+    for name, port in ref.parent.ports.items():
+        center, orientation = ref._transform_port(
+            port.center, port.orientation, ref.origin, ref.rotation, ref.x_reflection
+        )
+        npt.assert_almost_equal(ref.ports[name].center, center)
+        npt.assert_almost_equal(ref.ports[name].orientation, orientation)
+
+
 if __name__ == "__main__":
     # test_rotate()
     test_rotate_port()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.cell import CACHE, set_cache
+from gdsfactory.cell_cache import ComponentCache, DiskCache
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_sweep(processes: int) -> None:
+    gf.clear_cache()
+    settings = dict(length_mmi=[5, 5.5, 10], width_mmi=[2.5, -1])
+    result = gf.sweep("mmi1x2", settings, processes=processes)
+
+    assert len(result.variants) == 6
+    assert [variant.settings for variant in result.variants] == [
+        dict(length_mmi=length_mmi, width_mmi=width_mmi)
+        for length_mmi in settings["length_mmi"]
+        for width_mmi in settings["width_mmi"]
+    ]
+
+    # width_mmi=2.5 is the default, so length_mmi=5.5 is the default mmi1x2
+    failures = result.failures
+    assert [variant.settings["width_mmi"] for variant in failures] == [-1] * 3
+    assert all(variant.component is None for variant in failures)
+    assert all(variant.error for variant in failures)
+
+    components = result.components
+    assert len(components) == 3
+    assert gf.components.mmi1x2() in components
+    assert gf.components.mmi1x2(length_mmi=10) in components
+    assert all(variant.build_time >= 0 for variant in result.variants)
+    assert result.build_time > 0
+
+    c = gf.pack(components)[0]
+    assert len(c.references) == 3
+    gf.clear_cache()
+
+
+def test_sweep_dedup() -> None:
+    result = gf.sweep(
+        "straight",
+        [dict(length=10.0), dict(length=20), dict(npoints=2), dict()],
+        function=gf.add_padding_container,
+        processes=1,
+    )
+    assert len(result.variants) == 4
+    # the default settings build the same straight
+    assert len(result.components) == 2
+    assert result.variants[0].component is result.variants[2].component
+    assert result.variants[0].component is result.variants[3].component
+    gf.clear_cache()
+
+
+def test_sweep_set_cache() -> None:
+    cache = ComponentCache()
+    set_cache(cache)
+    try:
+        result = gf.sweep("straight", dict(length=[5, 6]), processes=2)
+        assert all(c.name in cache for c in result.components)
+        assert gf.components.straight(length=5) is result.components[0]
+    finally:
+        set_cache(CACHE)
+        gf.clear_cache()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_sweep_not_component(processes: int) -> None:
+    def factory(length: float = 10) -> gf.Component | None:
+        return gf.components.straight(length=length) if length > 0 else None
+
+    result = gf.sweep(factory, dict(length=[5, -1, 6]), processes=processes)
+    assert [variant.error is None for variant in result.variants] == [
+        True,
+        False,
+        True,
+    ]
+    assert "not a Component" in result.variants[1].error
+    assert result.variants[1].component is None
+    assert len(result.components) == 2
+    gf.clear_cache()
+
+
+def test_sweep_store_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    set_component = DiskCache.set
+
+    def set_or_fail(self, key: str, component: gf.Component) -> None:
+        if component.settings.full.get("length") == 6:
+            raise ValueError("no space left")
+        set_component(self, key, component)
+
+    monkeypatch.setattr(DiskCache, "set", set_or_fail)
+    result = gf.sweep("straight", dict(length=[5, 6, 7]), processes=2)
+    assert [variant.error is None for variant in result.variants] == [
+        True,
+        False,
+        True,
+    ]
+    assert "no space left" in result.variants[1].error
+    assert result.variants[1].component is None
+    assert result.variants[1].build_time > 0
+    assert len(result.components) == 2
+    gf.clear_cache()
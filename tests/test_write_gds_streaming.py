@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+import tempfile
+
+import gdstk
+import pytest
+
+import gdsfactory as gf
+
+
+def test_write_gds_streaming(tmp_path) -> None:
+    c = gf.components.mzi_lattice()
+    gdspath1 = c.write_gds(tmp_path / "library.gds")
+    gdspath2 = c.write_gds(tmp_path / "streaming.gds", streaming=True)
+
+    lib1 = gdstk.read_gds(gdspath1)
+    lib2 = gdstk.read_gds(gdspath2)
+    cells1 = {cell.name: cell for cell in lib1.cells}
+    cells2 = {cell.name: cell for cell in lib2.cells}
+    assert cells1.keys() == cells2.keys()
+    assert lib2.top_level()[0].name == c.name
+
+    # cells are written after the cells they reference
+    names = [cell.name for cell in lib2.cells]
+    for cell in lib2.cells:
+        for dependency in cell.dependencies(False):
+            assert names.index(dependency.name) < names.index(cell.name)
+
+    assert (
+        gf.import_gds(gdspath1).hash_geometry()
+        == gf.import_gds(gdspath2).hash_geometry()
+    )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_write_gds_file_object(tmp_path, streaming: bool) -> None:
+    c = gf.components.mzi()
+    gdspath = c.write_gds(tmp_path / "mzi.gds", streaming=streaming)
+
+    f = io.BytesIO()
+    assert c.write_gds(f, streaming=streaming) is None
+    assert f.getvalue() == gdspath.read_bytes()
+
+
+def test_write_gds_streaming_duplicated_cells_error(tmp_path) -> None:
+    c1 = gf.Component("demo1")
+    c1.add_polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+    c2 = gf.Component("demo1")
+    c2.add_polygon([(0, 0), (0, 20), (20, 20), (20, 0)])
+
+    c3 = gf.Component()
+    c3 << c1
+    c3 << c2
+
+    gdspath = tmp_path / "rectangles.gds"
+    with pytest.raises(ValueError):
+        c3.write_gds(gdspath, on_duplicate_cell="error", streaming=True)
+    assert not gdspath.exists()
+
+
+def test_write_gds_streaming_raw_references(tmp_path) -> None:
+    raw_cell = gdstk.Cell("raw_cell")
+    raw_cell.add(gdstk.rectangle((0, 0), (1, 1)))
+    c = gf.Component("raw_references")
+    c._cell.add(gdstk.Reference(raw_cell))
+
+    gdspath = c.write_gds(tmp_path / "raw_references.gds", streaming=True)
+    assert {cell.name for cell in gdstk.read_gds(gdspath).cells} == {
+        "raw_references",
+        "raw_cell",
+    }
+
+
+def test_write_gds_file_object_error(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    c1 = gf.Component("demo1")
+    c2 = gf.Component("demo1")
+    c3 = gf.Component()
+    c3 << c1
+    c3 << c2
+
+    with pytest.raises(ValueError):
+        c3.write_gds(io.BytesIO(), on_duplicate_cell="error", streaming=True)
+    assert not list(tmp_path.iterdir())